@@ -0,0 +1,208 @@
+import base64
+import gzip
+import hashlib
+import json
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import List, Optional
+
+from selenium.common.exceptions import WebDriverException
+
+
+class ArtifactPipeline:
+    """
+    Фоновая запись артефактов упавших проверок: скриншот, HTML страницы и лог консоли браузера.
+    На потоке теста данные только снимаются с браузера и кладутся в ограниченную очередь,
+    а декодирование, сжатие, запись на диск и очистку делают рабочие потоки.
+
+    Раскладка в root:
+        <время>_<имя>.json          — описание артефакта (что снято и где лежит)
+        <время>_<имя>.html.gz       — HTML страницы
+        <время>_<имя>.console.json.gz — лог консоли (если браузер его отдаёт)
+        images/<sha256>.png         — скриншоты; одинаковые картинки хранятся один раз
+    Когда файлов или байт больше лимита, удаляются самые старые файлы.
+    """
+
+    def __init__(self, root: str = "artifacts", workers: int = 2, queue_size: int = 32,
+                 max_bytes: int = 200 * 1024 * 1024, max_files: int = 500):
+        """
+        :param root: каталог артефактов
+        :param workers: количество рабочих потоков
+        :param queue_size: размер очереди; если она полна, артефакт отбрасывается, чтобы не задерживать тест
+        :param max_bytes: сколько байт хранить в root
+        :param max_files: сколько файлов хранить в root
+        """
+        self.root = root
+        self.workers = workers
+        self.max_bytes = max_bytes
+        self.max_files = max_files
+        self.stats = {"captured": 0, "dropped": 0, "deduplicated": 0, "written_bytes": 0, "evicted": 0}
+        self._queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+
+    def configure(self, root: Optional[str] = None, max_bytes: Optional[int] = None,
+                  max_files: Optional[int] = None) -> None:
+        """Меняет настройки до первого артефакта (опции командной строки)."""
+        if root is not None:
+            self.root = root
+        if max_bytes is not None:
+            self.max_bytes = max_bytes
+        if max_files is not None:
+            self.max_files = max_files
+
+    def _start(self) -> None:
+        if self._threads:
+            return
+        for number in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"artifacts-{number}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def capture(self, browser, name: str, element=None) -> Optional[str]:
+        """
+        Снимает артефакты с браузера и ставит их в очередь на запись.
+        :param browser: экземпляр WebDriver
+        :param name: имя проверки (попадает в имена файлов)
+        :param element: если указан, скриншот обрезается по этому элементу
+        :return: путь к будущему описанию артефакта или None, если очередь полна
+        """
+        screenshot = html = console = None
+        try:
+            if element is not None:
+                screenshot = element.screenshot_as_base64
+            else:
+                screenshot = browser.get_screenshot_as_base64()
+        except (WebDriverException, AttributeError):
+            pass
+        try:
+            html = browser.page_source
+        except (WebDriverException, AttributeError):
+            pass
+        try:
+            # лог консоли есть только у Chrome
+            console = browser.get_log("browser")
+        except (WebDriverException, AttributeError, ValueError):
+            pass
+        return self.submit(name, screenshot, html, console)
+
+    def submit(self, name: str, screenshot_base64: Optional[str] = None, html: Optional[str] = None,
+               console: Optional[list] = None) -> Optional[str]:
+        """
+        Ставит в очередь уже снятые данные.
+        :return: путь к будущему описанию артефакта или None, если очередь полна
+        """
+        safe_name = "".join(ch if ch.isalnum() or ch in "-_." else "_" for ch in name)[:120]
+        base = os.path.join(self.root, f"{datetime.now().strftime('%Y-%m-%d_%H-%M-%S-%f')}_{safe_name}")
+        self._start()
+        try:
+            self._queue.put_nowait((base, name, screenshot_base64, html, console))
+        except queue.Full:
+            with self._lock:
+                self.stats["dropped"] += 1
+            print(f"⚠️  Artifact queue is full, {name} is not saved")
+            return None
+        with self._lock:
+            self.stats["captured"] += 1
+        return f"{base}.json"
+
+    def close(self, timeout: float = 30) -> None:
+        """Дожидается записи всего, что в очереди, и останавливает рабочие потоки."""
+        if not self._threads:
+            return
+        for _ in self._threads:
+            self._queue.put(None)
+        deadline = time.monotonic() + timeout
+        for thread in self._threads:
+            thread.join(max(deadline - time.monotonic(), 0))
+        self._threads = []
+
+    def _work(self) -> None:
+        while True:
+            task = self._queue.get()
+            try:
+                if task is None:
+                    return
+                self._write(*task)
+                self._enforce_retention()
+            except Exception as error:
+                # любая ошибка одной задачи (битый base64, несериализуемый лог) не должна останавливать поток:
+                # иначе очередь заполнится и все следующие артефакты будут отброшены
+                print(f"⚠️  Artifact not saved: {type(error).__name__}: {error}")
+            finally:
+                self._queue.task_done()
+
+    def _write(self, base: str, name: str, screenshot_base64: Optional[str], html: Optional[str],
+               console: Optional[list]) -> None:
+        images_dir = os.path.join(self.root, "images")
+        os.makedirs(images_dir, exist_ok=True)
+        manifest = {"name": name, "created": time.time(), "screenshot": None, "html": None, "console": None}
+        written = 0
+
+        if screenshot_base64:
+            image = base64.b64decode(screenshot_base64)
+            path = os.path.join(images_dir, f"{hashlib.sha256(image).hexdigest()}.png")
+            try:
+                # картинка уже есть — только обновляем время, чтобы очистка не удалила её первой
+                os.utime(path)
+                with self._lock:
+                    self.stats["deduplicated"] += 1
+            except FileNotFoundError:
+                written += self._write_file(path, image)
+            manifest["screenshot"] = path
+
+        if html is not None:
+            manifest["html"] = f"{base}.html.gz"
+            written += self._write_file(manifest["html"], gzip.compress(html.encode("utf-8")))
+
+        if console:
+            manifest["console"] = f"{base}.console.json.gz"
+            written += self._write_file(manifest["console"],
+                                        gzip.compress(json.dumps(console, ensure_ascii=False).encode("utf-8")))
+
+        written += self._write_file(f"{base}.json", json.dumps(manifest, ensure_ascii=False, indent=2).encode())
+        with self._lock:
+            self.stats["written_bytes"] += written
+
+    @staticmethod
+    def _write_file(path: str, data: bytes) -> int:
+        # запись через временный файл: очистка и другие воркеры не увидят недописанный файл
+        temporary = f"{path}.{threading.get_ident()}.tmp"
+        with open(temporary, "wb") as file:
+            file.write(data)
+        os.replace(temporary, path)
+        return len(data)
+
+    def _enforce_retention(self) -> None:
+        """Удаляет самые старые файлы, пока не выполнены лимиты на количество и размер."""
+        with self._lock:
+            files = []
+            for directory, _, names in os.walk(self.root):
+                for file_name in names:
+                    if file_name.endswith(".tmp"):
+                        continue
+                    path = os.path.join(directory, file_name)
+                    try:
+                        info = os.stat(path)
+                    except FileNotFoundError:
+                        continue  # удалил другой процесс
+                    files.append((info.st_mtime, info.st_size, path))
+            total = sum(size for _, size, _ in files)
+            count = len(files)
+            for _, size, path in sorted(files):
+                if count <= self.max_files and total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                count -= 1
+                total -= size
+                self.stats["evicted"] += 1
+
+
+# общий конвейер артефактов сессии
+artifacts = ArtifactPipeline()
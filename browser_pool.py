@@ -0,0 +1,152 @@
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+from selenium.common.exceptions import NoAlertPresentException, WebDriverException
+from selenium.webdriver.remote.webdriver import WebDriver
+
+# ключ конфигурации браузера: (browser_name, language, headed)
+BrowserKey = Tuple[str, str, bool]
+
+
+# что удаляется для каждого посещённого origin в Chrome (Storage.clearDataForOrigin)
+CHROME_ORIGIN_STORAGE_TYPES = "local_storage,indexeddb,websql,cache_storage,service_workers,file_systems"
+
+
+def _origin(url: str) -> Optional[str]:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}" if parts.scheme in ("http", "https") and parts.netloc else None
+
+
+def reset_browser_state(browser: WebDriver, timeouts=None) -> bool:
+    """
+    Возвращает браузер в "чистое" состояние между тестами.
+    Закрывает alert и лишние окна, очищает cookies и хранилища, восстанавливает таймауты и открывает about:blank.
+    Chrome очищается полностью: cookies всех доменов и хранилища всех origin из истории вкладки (CDP).
+    У Firefox нет таких команд: cookies и localStorage очищаются только у текущего origin,
+    а origin, которые тест посетил раньше, не известны — такой сброс неполный.
+    :param browser: экземпляр WebDriver
+    :param timeouts: таймауты, которые были у браузера сразу после запуска
+    :return: True, если состояние сброшено полностью и браузер можно отдать следующему тесту
+    """
+    # alert блокирует почти все остальные команды, поэтому закрываем его первым
+    try:
+        browser.switch_to.alert.dismiss()
+    except NoAlertPresentException:
+        pass
+
+    # оставляем только первое окно
+    handles = browser.window_handles
+    main_handle = handles[0]
+    for handle in handles[1:]:
+        browser.switch_to.window(handle)
+        browser.close()
+    browser.switch_to.window(main_handle)
+
+    # sessionStorage привязан к вкладке и origin, поэтому чистим его до ухода со страницы
+    browser.execute_script(
+        "try { window.localStorage.clear(); } catch (e) {}"
+        "try { window.sessionStorage.clear(); } catch (e) {}"
+    )
+
+    fully_reset = hasattr(browser, "execute_cdp_cmd")
+    if fully_reset:
+        history = browser.execute_cdp_cmd("Page.getNavigationHistory", {})
+        origins = {_origin(entry["url"]) for entry in history.get("entries", [])} - {None}
+        for origin in sorted(origins):
+            browser.execute_cdp_cmd("Storage.clearDataForOrigin",
+                                    {"origin": origin, "storageTypes": CHROME_ORIGIN_STORAGE_TYPES})
+        browser.execute_cdp_cmd("Network.clearBrowserCookies", {})
+    else:
+        browser.delete_all_cookies()
+
+    if timeouts is not None:
+        browser.timeouts = timeouts
+
+    browser.get("about:blank")
+    if fully_reset:
+        # история вкладки не переходит к следующему тесту (и не копит origin)
+        browser.execute_cdp_cmd("Page.resetNavigationHistory", {})
+    return fully_reset
+
+
+class BrowserPool:
+    """
+    Пул браузеров на время сессии: один браузер на каждую конфигурацию
+    (browser_name, language, headed) в пределах процесса (воркера).
+    Если задан max_browsers, при запуске лишней конфигурации закрывается браузер,
+    который дольше всех не использовался; поэтому тесты выгодно выполнять группами по конфигурации.
+    Браузер, состояние которого нельзя сбросить полностью (Firefox, см. reset_browser_state),
+    после теста закрывается: cookies и хранилища других origin не должны доставаться следующему тесту.
+    """
+
+    def __init__(self, factory: Callable[[str, str, bool], WebDriver], max_browsers: int = 0,
+                 on_quit: Optional[Callable[[WebDriver], None]] = None):
+        """
+        :param factory: функция, создающая новый браузер по (browser_name, language, headed)
+        :param max_browsers: сколько браузеров держать одновременно (0 — без ограничения)
+        :param on_quit: что сделать после закрытия браузера (например, удалить копию профиля)
+        """
+        self._factory = factory
+        self._on_quit = on_quit
+        self.max_browsers = max_browsers
+        self._browsers: "OrderedDict[BrowserKey, WebDriver]" = OrderedDict()
+        self._timeouts: Dict[BrowserKey, object] = {}
+        self.launches = 0
+        self.reuses = 0
+
+    def acquire(self, browser_name: str, language: str, headed: bool) -> WebDriver:
+        """
+        Возвращает браузер нужной конфигурации, запуская его только при первом обращении.
+        :return: экземпляр WebDriver
+        """
+        key = (browser_name, language, headed)
+        browser = self._browsers.get(key)
+        if browser is None:
+            if self.max_browsers and len(self._browsers) >= self.max_browsers:
+                self._discard(next(iter(self._browsers)))
+            browser = self._factory(browser_name, language, headed)
+            self._browsers[key] = browser
+            self._timeouts[key] = browser.timeouts
+            self.launches += 1
+        else:
+            self._browsers.move_to_end(key)
+            self.reuses += 1
+        return browser
+
+    def release(self, browser: WebDriver) -> None:
+        """
+        Сбрасывает состояние браузера после теста.
+        Если сбросить не удалось (браузер упал или завис) или сброс неполный, браузер закрывается
+        и удаляется из пула, следующий тест получит новый экземпляр.
+        """
+        key = self._key_of(browser)
+        if key is None:
+            return
+        try:
+            if not reset_browser_state(browser, self._timeouts[key]):
+                self._discard(key)
+        except WebDriverException as e:
+            print(f"\n⚠️  Не удалось сбросить состояние браузера, перезапускаем: {e.msg}")
+            self._discard(key)
+
+    def close(self) -> None:
+        """Закрывает все браузеры пула."""
+        for key in list(self._browsers):
+            self._discard(key)
+
+    def _key_of(self, browser: WebDriver):
+        for key, pooled in self._browsers.items():
+            if pooled is browser:
+                return key
+        return None
+
+    def _discard(self, key: BrowserKey) -> None:
+        browser = self._browsers.pop(key)
+        self._timeouts.pop(key, None)
+        try:
+            browser.quit()
+        except WebDriverException:
+            pass
+        if self._on_quit is not None:
+            self._on_quit(browser)
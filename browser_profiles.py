@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Быстрый запуск браузеров: прогретые профили и набор флагов, сокращающих старт.
+
+Шаблон профиля создаётся один раз за сессию (воркер): браузер запускается с пустым профилем,
+проходит first-run, создаёт базы и служебные файлы и закрывается. Каждый следующий браузер
+получает копию шаблона — через copy-on-write (reflink), если файловая система это умеет.
+
+Сравнение холодного и быстрого запуска:
+    python -m stepik_autotests_final_task.browser_profiles --browsers chrome firefox --runs 5
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional
+
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+
+# флаги Chrome, которые убирают работу при старте, не влияющую на страницы:
+# first-run, фоновые сетевые запросы, обновление компонентов, синхронизацию, расширения, связку ключей
+FAST_LAUNCH_CHROME_ARGS = (
+    "--no-first-run",
+    "--no-default-browser-check",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--disable-extensions",
+    "--disable-client-side-phishing-detection",
+    "--disable-domain-reliability",
+    "--metrics-recording-only",
+    "--password-store=basic",
+    "--use-mock-keychain",
+    "--disable-features=Translate,OptimizationHints,MediaRouter,InterestFeedContentSuggestions",
+)
+
+# то же для Firefox: настройки, которые отключают телеметрию, проверки обновлений и стартовые страницы
+FAST_LAUNCH_FIREFOX_PREFS = {
+    "browser.shell.checkDefaultBrowser": False,
+    "browser.startup.homepage_override.mstone": "ignore",
+    "browser.aboutwelcome.enabled": False,
+    "browser.newtabpage.enabled": False,
+    "datareporting.policy.dataSubmissionEnabled": False,
+    "toolkit.telemetry.reportingpolicy.firstRun": False,
+    "app.update.auto": False,
+    "extensions.update.enabled": False,
+    "browser.safebrowsing.malware.enabled": False,
+    "browser.safebrowsing.phishing.enabled": False,
+    "network.captive-portal-service.enabled": False,
+    "network.connectivity-service.enabled": False,
+}
+
+# что удаляется из шаблона: кеши не нужны копиям, а lock-файлы помешают запустить браузер на копии
+TEMPLATE_JUNK = {
+    "chrome": ("SingletonLock", "SingletonSocket", "SingletonCookie", "Crashpad", "ShaderCache",
+               "GrShaderCache", "Default/Cache", "Default/Code Cache", "Default/GPUCache"),
+    "firefox": ("lock", ".parentlock", "parent.lock", "cache2", "startupCache", "crashes", "minidumps"),
+}
+
+
+def configure_chrome_fast_launch(options, profile_dir: Optional[str] = None) -> None:
+    """
+    Добавляет в ChromeOptions флаги быстрого старта и, если указан, каталог профиля.
+    :param profile_dir: копия прогретого профиля (WarmProfiles.clone)
+    """
+    for argument in FAST_LAUNCH_CHROME_ARGS:
+        options.add_argument(argument)
+    if profile_dir:
+        options.add_argument(f"--user-data-dir={profile_dir}")
+
+
+def configure_firefox_fast_launch(options, profile_dir: Optional[str] = None) -> None:
+    """
+    Добавляет в FirefoxOptions настройки быстрого старта и, если указан, каталог профиля.
+    Профиль передаётся аргументом -profile: options.profile selenium упаковывает в zip
+    и отправляет geckodriver при каждом запуске, что медленнее, чем запуск с пустым профилем.
+    """
+    for name, value in FAST_LAUNCH_FIREFOX_PREFS.items():
+        options.set_preference(name, value)
+    if profile_dir:
+        options.add_argument("-profile")
+        options.add_argument(profile_dir)
+
+# умеет ли файловая система копировать через reflink (None — ещё не проверяли)
+_reflink_supported: Optional[bool] = None
+
+
+def copy_profile(source: str, destination: str) -> str:
+    """
+    Копирует каталог профиля: через reflink (copy-on-write), если файловая система это умеет, иначе обычной копией.
+    Жёсткие ссылки не используются: браузер меняет базы профиля на месте, и копии испортили бы шаблон.
+    :return: способ копирования — "reflink" или "copy"
+    """
+    global _reflink_supported
+    if _reflink_supported is None:
+        _reflink_supported = bool(shutil.which("cp")) and sys.platform != "win32"
+    if _reflink_supported:
+        reflink = "-c" if sys.platform == "darwin" else "--reflink=always"
+        result = subprocess.run(["cp", "-R", reflink, source, destination], capture_output=True)
+        if result.returncode == 0:
+            return "reflink"
+        # файловая система не умеет copy-on-write — больше не пробуем
+        _reflink_supported = False
+        shutil.rmtree(destination, ignore_errors=True)
+    shutil.copytree(source, destination, symlinks=True)
+    return "copy"
+
+
+def _warm_up_chrome(profile_dir: str) -> None:
+    options = webdriver.ChromeOptions()
+    options.add_argument("headless")
+    configure_chrome_fast_launch(options, profile_dir)
+    browser = webdriver.Chrome(options=options)
+    try:
+        browser.get("about:blank")
+    finally:
+        browser.quit()
+
+
+def _warm_up_firefox(profile_dir: str) -> None:
+    options = webdriver.FirefoxOptions()
+    options.add_argument("--headless")
+    configure_firefox_fast_launch(options, profile_dir)
+    browser = webdriver.Firefox(options=options)
+    try:
+        browser.get("about:blank")
+    finally:
+        browser.quit()
+
+
+# как создать шаблон профиля для каждого браузера
+WARM_UP: Dict[str, Callable[[str], None]] = {"chrome": _warm_up_chrome, "firefox": _warm_up_firefox}
+
+
+class WarmProfiles:
+    """
+    Шаблоны прогретых профилей и их копии для браузеров сессии.
+    Шаблон создаётся при первом запросе копии для браузера; всё лежит во временном каталоге,
+    который удаляется в close().
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        """
+        :param root: каталог для шаблонов и копий (по умолчанию — новый временный каталог)
+        """
+        self._root = root
+        self._templates: Dict[str, str] = {}
+        self._clones: Dict[int, str] = {}
+        self._counter = 0
+        self.stats = {"clones": 0, "reflink": 0, "copy": 0, "template_seconds": 0.0, "clone_seconds": 0.0}
+
+    @property
+    def root(self) -> str:
+        if self._root is None:
+            self._root = tempfile.mkdtemp(prefix="stepik-profiles-")
+        return self._root
+
+    def template(self, browser_name: str) -> str:
+        """Каталог шаблона профиля; при первом вызове браузер запускается один раз, чтобы его прогреть."""
+        if browser_name not in self._templates:
+            path = os.path.join(self.root, f"{browser_name}-template")
+            shutil.rmtree(path, ignore_errors=True)
+            os.makedirs(path)
+            start = time.perf_counter()
+            WARM_UP[browser_name](path)
+            self.stats["template_seconds"] += time.perf_counter() - start
+            for junk in TEMPLATE_JUNK[browser_name]:
+                junk_path = os.path.join(path, junk)
+                if os.path.isdir(junk_path) and not os.path.islink(junk_path):
+                    shutil.rmtree(junk_path, ignore_errors=True)
+                elif os.path.lexists(junk_path):
+                    os.remove(junk_path)
+            self._templates[browser_name] = path
+        return self._templates[browser_name]
+
+    def clone(self, browser_name: str) -> str:
+        """
+        Делает копию шаблона для нового браузера.
+        :return: каталог профиля
+        """
+        template = self.template(browser_name)
+        self._counter += 1
+        path = os.path.join(self.root, f"{browser_name}-{os.getpid()}-{self._counter}")
+        start = time.perf_counter()
+        method = copy_profile(template, path)
+        self.stats["clone_seconds"] += time.perf_counter() - start
+        self.stats["clones"] += 1
+        self.stats[method] += 1
+        return path
+
+    def bind(self, browser, profile_dir: str) -> None:
+        """Запоминает, какой копией профиля пользуется браузер, чтобы удалить её после quit."""
+        self._clones[id(browser)] = profile_dir
+
+    def release(self, browser) -> None:
+        """Удаляет копию профиля закрытого браузера."""
+        path = self._clones.pop(id(browser), None)
+        if path:
+            shutil.rmtree(path, ignore_errors=True)
+
+    def close(self) -> None:
+        """Удаляет шаблоны и все оставшиеся копии."""
+        if self._root is not None:
+            shutil.rmtree(self._root, ignore_errors=True)
+        self._root = None
+        self._templates = {}
+        self._clones = {}
+
+
+# прогретые профили сессии (--fast_launch)
+warm_profiles = WarmProfiles()
+
+
+def _benchmark_options(browser_name: str):
+    """Опции, как у фикстуры browser по умолчанию (headless, размер окна)."""
+    if browser_name == "chrome":
+        options = webdriver.ChromeOptions()
+        options.add_argument("window-size=1920x935")
+        options.add_argument("headless")
+    else:
+        options = webdriver.FirefoxOptions()
+        options.add_argument("--width=1920")
+        options.add_argument("--height=935")
+        options.add_argument("--headless")
+    return options
+
+
+def _timed_launch(browser_name: str, options) -> float:
+    """Время от запуска браузера до открытой about:blank."""
+    start = time.perf_counter()
+    browser = webdriver.Chrome(options=options) if browser_name == "chrome" else webdriver.Firefox(options=options)
+    try:
+        browser.get("about:blank")
+        return time.perf_counter() - start
+    finally:
+        browser.quit()
+
+
+def benchmark(browsers: List[str], runs: int = 5) -> None:
+    """
+    Сравнивает запуск браузеров: с пустым профилем, с копией прогретого профиля
+    и с копией профиля вместе с флагами быстрого старта.
+    """
+    configure = {"chrome": configure_chrome_fast_launch, "firefox": configure_firefox_fast_launch}
+    profiles = WarmProfiles()
+    try:
+        for browser_name in browsers:
+            try:
+                profiles.template(browser_name)
+            except WebDriverException as error:
+                print(f"{browser_name}: cannot launch ({error.msg})")
+                continue
+            print(f"{browser_name}: template built in {profiles.stats['template_seconds']:.2f}s")
+            profiles.stats["template_seconds"] = 0.0
+
+            timings: Dict[str, List[float]] = {"cold": [], "warm profile": [], "warm profile + flags": []}
+            for _ in range(runs):
+                timings["cold"].append(_timed_launch(browser_name, _benchmark_options(browser_name)))
+
+                options = _benchmark_options(browser_name)
+                profile_dir = profiles.clone(browser_name)
+                if browser_name == "chrome":
+                    options.add_argument(f"--user-data-dir={profile_dir}")
+                else:
+                    options.add_argument("-profile")
+                    options.add_argument(profile_dir)
+                timings["warm profile"].append(_timed_launch(browser_name, options))
+                shutil.rmtree(profile_dir, ignore_errors=True)
+
+                options = _benchmark_options(browser_name)
+                profile_dir = profiles.clone(browser_name)
+                configure[browser_name](options, profile_dir)
+                timings["warm profile + flags"].append(_timed_launch(browser_name, options))
+                shutil.rmtree(profile_dir, ignore_errors=True)
+
+            cold = statistics.median(timings["cold"])
+            for mode, values in timings.items():
+                median = statistics.median(values)
+                line = f"  {mode:<22} median {median:.3f}s  min {min(values):.3f}s  max {max(values):.3f}s"
+                if mode != "cold":
+                    line += f"  ({(1 - median / cold) * 100:.0f}% faster than cold)"
+                print(line)
+        clone_count = profiles.stats["clones"]
+        if clone_count:
+            print(f"profile copy: {profiles.stats['clone_seconds'] / clone_count * 1000:.1f} ms per clone, "
+                  f"{profiles.stats['reflink']} reflink, {profiles.stats['copy']} plain copy")
+    finally:
+        profiles.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cold vs warm-profile browser launch benchmark")
+    parser.add_argument("--browsers", nargs="+", default=["chrome", "firefox"], choices=["chrome", "firefox"])
+    parser.add_argument("--runs", type=int, default=5, help="launches per mode and browser")
+    args = parser.parse_args()
+    benchmark(args.browsers, args.runs)
@@ -2,14 +2,51 @@ import pytest
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from .translations import translations, SUPPORTED_LANGUAGES, DEFAULT_LANGUAGE
+import functools
+import shutil
 import time
 from stepik_autotests_final_task.urls import Urls
 from stepik_autotests_final_task.problematic_urls import ProblematicUrls
+from stepik_autotests_final_task.browser_pool import BrowserPool
+from stepik_autotests_final_task.http_driver import HttpDriver
+from stepik_autotests_final_task.lazy_browser import LazyBrowser
+from stepik_autotests_final_task.pages.basket_seeder import BasketSeeder
+from stepik_autotests_final_task.pages.dialog_handler import QuizDialogHandler
+from stepik_autotests_final_task.pages.base_page import BasePage
+from stepik_autotests_final_task.tracing import tracer
+from stepik_autotests_final_task.artifacts import artifacts
+from stepik_autotests_final_task.timing_history import TimingHistory, current_commit, phase_timer
+from stepik_autotests_final_task.local_store import LocalStore
+from stepik_autotests_final_task.parallel_runner import is_worker, run_parallel, shard_groups
+from stepik_autotests_final_task.scheduler import (
+    browser_requirement, count_launches, describe_requirement, group_items
+)
+from stepik_autotests_final_task import resource_blocking
+from stepik_autotests_final_task.impact import (
+    DEFAULT_INDEX_PATH, CallRecorder, ImpactIndex, changed_symbols, git_root, nodeid_to_repo
+)
+from stepik_autotests_final_task.driver_services import DEFAULT_CACHE_PATH, driver_services
+from stepik_autotests_final_task.browser_profiles import (
+    configure_chrome_fast_launch, configure_firefox_fast_launch, warm_profiles
+)
 import sys
 
 # порог для "долго" в секундах
 LONG_TEST_THRESHOLD = 1.0
 
+# опции, которые передаются каждому воркеру при параллельном запуске
+WORKER_OPTIONS = ("--browser_name", "--language", "--headed", "--browser_pool", "--snapshot_cache",
+                  "--fast_negative", "--negative_timeout", "--trace_steps", "--trace_format",
+                  "--timing_history", "--base-url", "--store_latency", "--store_fault_rate",
+                  "--block-resources", "--block-url", "--block-size-estimate",
+                  "--page_load_strategy", "--bidi_dialogs",
+                  "--artifacts_dir", "--artifacts_max_mb", "--artifacts_max_files",
+                  "--schedule", "--pool_max_browsers", "--fast_launch",
+                  "--shared_driver", "--driver_cache", "--record_impact", "--impact_index")
+
+# куда сохраняются трассировки шагов page objects
+TRACE_DIR = "traces"
+
 def pytest_addoption(parser):
     """Добавление опций командной строки для выбора браузера, языка и headless/headed режима."""
 
@@ -22,56 +59,527 @@ def pytest_addoption(parser):
     parser.addoption('--headed', action='store_true', default=False,
                      help="Run browser in headed (non-headless) mode")
 
-@pytest.fixture(scope="function")
-def browser(request):
-    """Фикстура для запуска браузера с заданными параметрами."""
+    parser.addoption('--browser_pool', action='store_true', default=False,
+                     help="Reuse one browser per configuration and worker for the whole session "
+                          "(state is reset between tests, 'headed', 'isolated' and 'bidi' tests get a fresh browser; "
+                          "Firefox state cannot be fully reset, so Firefox browsers are restarted after every test)")
+
+    parser.addoption('--pool_max_browsers', action='store', type=int, default=0,
+                     help="With --browser_pool: how many browsers a worker keeps open at once "
+                          "(0 - no limit, the least recently used one is closed)")
+
+    parser.addoption('--schedule', action='store', default='auto', choices=['auto', 'grouped', 'file'],
+                     help="Test order: grouped by required browser configuration (browser, language, headed) "
+                          "or file order; auto groups only with --browser_pool or --workers, "
+                          "where grouping saves browser launches")
+
+    parser.addoption('--workers', action='store', type=int, default=1,
+                     help="Run tests in N worker processes, each with its own browser")
+
+    parser.addoption('--snapshot_cache', action='store_true', default=False,
+                     help="Answer read-only page checks from a DOM snapshot taken after navigation or actions")
+
+    parser.addoption('--fast_negative', action='store_true', default=False,
+                     help="Negative element checks wait for the page to settle and then use a short timeout")
+
+    parser.addoption('--negative_timeout', action='store', type=float, default=BasePage.negative_check_timeout,
+                     help="Timeout in seconds for a negative element check in --fast_negative mode")
+
+    parser.addoption('--trace_steps', action='store', default='off', choices=['off', 'failed', 'all'],
+                     help="Record page object steps and save them for failed tests or for all tests")
+
+    parser.addoption('--trace_format', action='store', default='json', choices=['json', 'chrome'],
+                     help="Trace file format: json or chrome (trace event format)")
+
+    parser.addoption('--timing_history', action='store', default=None,
+                     help="Path to an SQLite file where per-phase test timings are stored")
+
+    parser.addoption('--base-url', action='store', default=None,
+                     help="Base URL of the shop under test; 'local' starts the bundled local store for the session")
+
+    parser.addoption('--store_latency', action='store', type=float, default=0.0,
+                     help="Local store: delay in seconds before every response")
+
+    parser.addoption('--store_fault_rate', action='store', type=float, default=0.0,
+                     help="Local store: share of requests (0..1) answered with 503")
+
+    parser.addoption('--block-resources', action='store', nargs='?', default=None,
+                     const=resource_blocking.DEFAULT_BLOCKED_TYPES,
+                     help="Block resource types the assertions do not need: "
+                          "images, fonts, media, stylesheets, third-party (comma separated)")
+
+    parser.addoption('--block-url', action='append', default=[],
+                     help="Extra URL pattern to block with --block-resources (Chrome only), can be repeated")
+
+    parser.addoption('--block-size-estimate', action='store_true', default=False,
+                     help="With --block-resources: estimate the size of blocked resources with background "
+                          "HEAD requests and report it per test at the end of the session "
+                          "(Chrome only, needs network access)")
+
+    parser.addoption('--page_load_strategy', action='store', default='normal', choices=['normal', 'eager', 'none'],
+                     help="Page load strategy; with eager/none page objects wait only for their ready locators")
+
+    parser.addoption('--bidi_dialogs', action='store_true', default=False,
+                     help="Start browsers with WebDriver BiDi and solve promo quiz alerts from prompt events")
+
+    parser.addoption('--fast_launch', action='store_true', default=False,
+                     help="Start browsers from a copy of a warmed-up profile built once per session, "
+                          "with startup-reducing flags")
+
+    parser.addoption('--shared_driver', action='store_true', default=False,
+                     help="Start one chromedriver/geckodriver per worker and create all browser sessions on it; "
+                          "driver paths are resolved once and cached in --driver_cache")
+    parser.addoption('--driver_cache', action='store', default=DEFAULT_CACHE_PATH,
+                     help="File where driver and browser paths found by Selenium Manager are cached")
+
+    parser.addoption('--changed-since', action='store', default=None, metavar='REF',
+                     help="Run only tests affected by changes since git REF (uses the --record_impact index)")
+    parser.addoption('--record_impact', action='store_true', default=False,
+                     help="Record which project functions each test runs and update the impact index")
+    parser.addoption('--impact_index', action='store', default=DEFAULT_INDEX_PATH,
+                     help="Impact index file, relative to the repository root")
+
+    parser.addoption('--artifacts_dir', action='store', default='artifacts',
+                     help="Where failure artifacts (screenshot, DOM, console log) are written")
+    parser.addoption('--artifacts_max_mb', action='store', type=float, default=200,
+                     help="Failure artifacts retention: max total size in MB, oldest files are removed first")
+    parser.addoption('--artifacts_max_files', action='store', type=int, default=500,
+                     help="Failure artifacts retention: max number of files")
+
+
+def pytest_configure(config):
+    """Применяет глобальные настройки page objects из опций командной строки."""
+    block_resources = config.getoption("--block-resources")
+    if block_resources:
+        try:
+            resource_blocking.check_browser_support(config.getoption("browser_name"), block_resources,
+                                                    config.getoption("--block-url"))
+        except ValueError as error:
+            raise pytest.UsageError(f"--block-resources: {error}")
+        if config.getoption("--block-size-estimate"):
+            blocked_requests_stats["estimator"] = resource_blocking.SizeEstimator()
+    if config.getoption("--snapshot_cache"):
+        BasePage.snapshot_cache = True
+    if config.getoption("--fast_negative"):
+        BasePage.fast_negative_checks = True
+        BasePage.negative_check_timeout = config.getoption("--negative_timeout")
+    tracer.enabled = config.getoption("--trace_steps") != "off"
+    driver_services.configure(config.getoption("--driver_cache"))
+    if config.getoption("--record_impact") or config.getoption("--changed-since"):
+        repo_root = git_root(str(config.rootpath))
+        config.impact_index = ImpactIndex(repo_root, config.getoption("--impact_index"))
+        if config.getoption("--record_impact"):
+            config.impact_recorder = CallRecorder(repo_root)
+    artifacts.configure(root=config.getoption("--artifacts_dir"),
+                        max_bytes=int(config.getoption("--artifacts_max_mb") * 1024 * 1024),
+                        max_files=config.getoption("--artifacts_max_files"))
+
+    history_path = config.getoption("--timing_history")
+    if history_path:
+        config.timing_history = TimingHistory(history_path)
+        config.timing_commit = current_commit()
+
+    # адрес сайта нужно поменять до импорта тестовых модулей: они строят ссылки при импорте
+    base_url = config.getoption("--base-url")
+    if base_url == "local":
+        config.local_store = LocalStore(latency=config.getoption("--store_latency"),
+                                        fault_rate=config.getoption("--store_fault_rate"))
+        base_url = config.local_store.start()
+        # воркеры параллельного запуска получают адрес уже запущенной витрины,
+        # иначе id тестов с URL в параметрах не совпадут
+        config.option.base_url = base_url
+        print(f"\nlocal store started at {base_url}")
+    if base_url:
+        Urls.set_base_url(base_url)
+
+
+def pytest_unconfigure(config):
+    artifacts.close()
+    warm_profiles.close()
+    driver_services.close()
+
+    if getattr(config, "impact_recorder", None) is not None:
+        config.impact_index.save()
+
+    history = getattr(config, "timing_history", None)
+    if history is not None:
+        history.close()
+
+    store = getattr(config, "local_store", None)
+    if store is not None:
+        store.stop()
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item, nextitem):
+    """С --record_impact записывает функции проекта, выполненные тестом (setup, call и teardown)."""
+    recorder = getattr(item.config, "impact_recorder", None)
+    if recorder is None:
+        yield
+        return
+    recorder.start()
+    try:
+        yield
+    finally:
+        item.config.impact_index.record(impact_nodeid(item, recorder.root), recorder.stop())
 
-    # Получаем параметры командной строки
-    browser_name = request.config.getoption("browser_name")
-    user_language = request.config.getoption("language")
 
-    # Автоматически определяем валидный язык
-    valid_language = get_valid_language(user_language)
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_setup(item):
+    phase_timer.reset()
+    start = time.perf_counter()
+    yield
+    phase_timer.add("setup", time.perf_counter() - start)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    start = time.perf_counter()
+    yield
+    phase_timer.add("call", time.perf_counter() - start)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_teardown(item, nextitem):
+    """Замеряет teardown и сохраняет замеры теста в историю."""
+    start = time.perf_counter()
+    yield
+    phase_timer.add("teardown", time.perf_counter() - start)
+
+    history = getattr(item.config, "timing_history", None)
+    if history is not None:
+        phases = dict(phase_timer.phases)
+        phases["total"] = phases.get("setup", 0) + phases.get("call", 0) + phases["teardown"]
+        outcome = item.stash.get(test_outcome_key, "passed")
+        history.record(item.nodeid, item.config.getoption("browser_name"),
+                       get_valid_language(item.config.getoption("language")),
+                       item.config.timing_commit, outcome, phases)
 
-    if user_language != valid_language:
-        print(f"⚠️  Язык '{user_language}' не поддерживается. Используется '{valid_language}'")
 
-    # Проверяем есть ли маркер headed у теста
-    has_headed_marker = request.node.get_closest_marker('headed') is not None
+# отмечает тесты, у которых упала хотя бы одна фаза (setup, call, teardown)
+test_failed_key = pytest.StashKey[bool]()
 
-    # Если тест помечен headed или явно указан --headed
-    headed = request.config.getoption("--headed") or has_headed_marker # True если указана --headed
+# итог теста по отчётам setup и call для истории замеров: passed, failed, skipped, xfailed, xpassed
+test_outcome_key = pytest.StashKey[str]()
 
+# если фазы дали разные итоги, в историю пишется более важный
+OUTCOME_PRIORITY = ("passed", "xpassed", "skipped", "xfailed", "failed")
+
+
+def report_outcome(report) -> str:
+    """Итог отчёта фазы с учётом xfail."""
+    if hasattr(report, "wasxfail"):
+        return "xfailed" if report.skipped else "xpassed"
+    return report.outcome
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """
+    Запоминает упавшие тесты, ставит в очередь их артефакты
+    и после teardown сохраняет трассировку их шагов.
+    """
+    outcome = yield
+    report = outcome.get_result()
+    if report.when in ("setup", "call"):
+        current = item.stash.get(test_outcome_key, "passed")
+        item.stash[test_outcome_key] = max(current, report_outcome(report), key=OUTCOME_PRIORITY.index)
+    if report.failed:
+        item.stash[test_failed_key] = True
+        browser = item.funcargs.get("browser") if hasattr(item, "funcargs") else None
+        # незапущенный LazyBrowser не запускаем ради скриншота;
+        # если проверку с screenshot_on_error уже сняли, второй раз артефакты не пишутся
+        already_captured = call.excinfo is not None and getattr(call.excinfo.value, "artifacts_captured", False)
+        if (report.when == "call" and browser is not None and getattr(browser, "started", True)
+                and not already_captured):
+            artifacts.capture(browser, item.nodeid)
+
+    if report.when == "teardown" and tracer.enabled:
+        mode = item.config.getoption("--trace_steps")
+        if mode == "all" or item.stash.get(test_failed_key, False):
+            file_name = "".join(ch if ch.isalnum() or ch in "-_." else "_" for ch in item.nodeid)
+            path = tracer.flush(f"{TRACE_DIR}/{file_name}.json", item.config.getoption("--trace_format"))
+            print(f"\n🧾 Trace saved to {path}")
+        tracer.clear()
+
+
+def pytest_terminal_summary(terminalreporter):
+    """Выводит, сколько времени заняли негативные проверки элементов."""
+    stats = BasePage.negative_check_stats
+    if stats["count"]:
+        terminalreporter.write_line(
+            f"negative element checks: {stats['count']} took {stats['seconds']:.3f} seconds "
+            f"(avg {stats['seconds'] / stats['count']:.3f})")
+
+    if artifacts.stats["captured"]:
+        artifacts.close()  # дописываем очередь, чтобы статистика была полной
+        terminalreporter.write_line(
+            f"failure artifacts: {artifacts.stats['captured']} captured, {artifacts.stats['dropped']} dropped, "
+            f"{artifacts.stats['deduplicated']} duplicate screenshots skipped, "
+            f"{artifacts.stats['written_bytes'] / 1024:.1f} KB written to {artifacts.root}")
+
+    if warm_profiles.stats["clones"]:
+        stats = warm_profiles.stats
+        terminalreporter.write_line(
+            f"fast launch: profile template built in {stats['template_seconds']:.2f}s, {stats['clones']} copies "
+            f"({stats['reflink']} copy-on-write), {stats['clone_seconds'] / stats['clones'] * 1000:.1f} ms per copy")
+
+    if driver_services.stats["sessions"]:
+        cache = driver_services.cache.stats
+        terminalreporter.write_line(
+            f"shared driver: {driver_services.stats['sessions']} sessions on "
+            f"{driver_services.stats['processes']} driver processes, driver lookup {cache['seconds']:.2f}s "
+            f"({cache['hits']} cached, {cache['misses']} resolved by Selenium Manager)")
+
+    if blocked_requests_stats["requests"]:
+        summary = (f"blocked requests: {blocked_requests_stats['requests']} "
+                   f"({len(blocked_requests_stats['urls'])} unique URLs)")
+        estimator = blocked_requests_stats["estimator"]
+        if estimator is not None:
+            total = 0
+            for name, urls in blocked_requests_stats["tests"]:
+                size = estimator.total(urls)
+                total += size
+                terminalreporter.write_line(f"🚫 {name}: blocked {len(urls)} requests, ~{size / 1024:.1f} KB avoided")
+            estimator.close()
+            summary += f", ~{total / 1024:.1f} KB avoided (estimated by Content-Length)"
+        terminalreporter.write_line(summary)
+
+
+def worker_args(config) -> list:
+    """Собирает опции командной строки для воркеров параллельного запуска."""
+    args = []
+    for option in WORKER_OPTIONS:
+        value = config.getoption(option)
+        if value is True:
+            args.append(option)
+        elif isinstance(value, list):
+            args.extend(f"{option}={item}" for item in value)
+        elif value not in (False, None):
+            args.append(f"{option}={value}")
+    return args
+
+
+def pytest_runtestloop(session):
+    """При --workers > 1 тесты выполняются в отдельных процессах вместо текущего."""
+    workers = session.config.getoption("--workers")
+    if workers <= 1 or is_worker() or session.config.option.collectonly or not session.items:
+        return None
+
+    terminal = session.config.pluginmanager.get_plugin("terminalreporter")
+    session.testsfailed = run_parallel(session, workers, worker_args(session.config), terminal.write_line,
+                                       getattr(session.config, "browser_groups", None))
+    return True
+
+def launch_settings(config) -> dict:
+    """Дополнительные параметры запуска браузера из опций командной строки."""
+    return {
+        "block_resources": config.getoption("--block-resources"),
+        "block_urls": config.getoption("--block-url"),
+        "page_load_strategy": config.getoption("--page_load_strategy"),
+        "enable_bidi": config.getoption("--bidi_dialogs"),
+        "fast_launch": config.getoption("--fast_launch"),
+        "shared_driver": config.getoption("--shared_driver"),
+    }
+
+
+def create_browser(browser_name: str, user_language: str, headed: bool,
+                   block_resources: str = None, block_urls: list = None, page_load_strategy: str = "normal",
+                   enable_bidi: bool = False, fast_launch: bool = False, shared_driver: bool = False):
+    """
+    Запускает новый браузер с заданными параметрами.
+    :param browser_name: chrome или firefox
+    :param user_language: язык интерфейса браузера
+    :param headed: если True, браузер запускается с окном
+    :param block_resources: типы ресурсов, которые не загружаются (см. resource_blocking)
+    :param block_urls: дополнительные шаблоны URL для блокировки
+    :param page_load_strategy: normal, eager или none
+    :param enable_bidi: если True, открывается WebDriver BiDi (нужен для AsyncBasePage)
+    :param fast_launch: если True, браузер стартует с копии прогретого профиля и с флагами быстрого старта
+    :param shared_driver: если True, сессия создаётся на общем процессе драйвера воркера
+    :return: экземпляр WebDriver
+    """
     print(f"\nstart {browser_name} browser for test..")
 
+    with phase_timer.phase("launch"):
+        profile_dir = None
+        if fast_launch and browser_name in ("chrome", "firefox"):
+            # первый запуск в сессии ещё и строит шаблон профиля
+            profile_dir = warm_profiles.clone(browser_name)
+        try:
+            browser = _launch_browser(browser_name, user_language, headed, block_resources, block_urls,
+                                      page_load_strategy, enable_bidi, profile_dir, shared_driver)
+        except Exception:
+            # браузер не запустился — копия профиля ни к чему не привязана и иначе осталась бы на диске
+            if profile_dir:
+                shutil.rmtree(profile_dir, ignore_errors=True)
+            raise
+    if profile_dir:
+        warm_profiles.bind(browser, profile_dir)
+    return browser
+
+
+def _launch_browser(browser_name: str, user_language: str, headed: bool,
+                    block_resources: str = None, block_urls: list = None, page_load_strategy: str = "normal",
+                    enable_bidi: bool = False, profile_dir: str = None, shared_driver: bool = False):
     # Инициализируем браузер в зависимости от выбранного
     if browser_name == "chrome":
         options = Options()
         options.add_experimental_option('prefs', {'intl.accept_languages': user_language})
         options.add_argument('window-size=1920x935')   # Устанавливаем размер окна
+        options.page_load_strategy = page_load_strategy
+        options.enable_bidi = enable_bidi
 
         if not headed:
             options.add_argument('headless')  # headless по умолчанию
 
-        browser = webdriver.Chrome(options=options)
+        if profile_dir:
+            configure_chrome_fast_launch(options, profile_dir)
+
+        if block_resources:
+            resource_blocking.configure_chrome_options(options)
+
+        service = driver_services.acquire("chrome", options) if shared_driver else None
+        browser = webdriver.Chrome(options=options, service=service)
+
+        if block_resources:
+            patterns = resource_blocking.blocked_patterns(block_resources, block_urls)
+            resource_blocking.enable_chrome_blocking(browser, patterns)
+
+        return browser
 
     elif browser_name == "firefox":
         options = webdriver.FirefoxOptions()
+        # настройки быстрого старта задаются первыми, чтобы язык и блокировка ресурсов их перекрывали
+        if profile_dir:
+            configure_firefox_fast_launch(options, profile_dir)
+
         options.set_preference("intl.accept_languages", user_language)
         options.add_argument('--width=1920')
         options.add_argument('--height=935')
+        options.page_load_strategy = page_load_strategy
+        options.enable_bidi = enable_bidi
 
         if not headed:
             options.add_argument('--headless')  # headless по умолчанию
 
-        browser = webdriver.Firefox(options=options)
+        if block_resources:
+            resource_blocking.configure_firefox_options(options, block_resources)
 
-    else:
-        raise pytest.UsageError("--browser_name should be chrome or firefox")
+        service = driver_services.acquire("firefox", options) if shared_driver else None
+        return webdriver.Firefox(options=options, service=service)
+
+    raise pytest.UsageError("--browser_name should be chrome or firefox")
+
+
+@pytest.fixture(scope="session")
+def browser_pool(request):
+    """Пул браузеров, живущий всю сессию (один браузер на конфигурацию в воркере)."""
+    # вытесненные и упавшие браузеры убираются так же, как в обычном teardown: вместе с копией профиля
+    pool = BrowserPool(functools.partial(create_browser, **launch_settings(request.config)),
+                       max_browsers=request.config.getoption("--pool_max_browsers"),
+                       on_quit=warm_profiles.release)
+    yield pool
+    print("\nquit pooled browsers..")
+    pool.close()
+
+
+@pytest.fixture(scope="function")
+def browser(request):
+    """
+    Фикстура для запуска браузера с заданными параметрами.
+    Тест получает LazyBrowser: браузер запускается (или берётся из пула) при первом обращении к нему,
+    поэтому тест, пропущенный или упавший до работы с браузером, не тратит время на запуск.
+    """
+
+    # Получаем параметры командной строки
+    browser_name = request.config.getoption("browser_name")
+    user_language = request.config.getoption("language")
+
+    # Автоматически определяем валидный язык
+    valid_language = get_valid_language(user_language)
+
+    if user_language != valid_language:
+        print(f"⚠️  Язык '{user_language}' не поддерживается. Используется '{valid_language}'")
+
+    # Тестам с маркером browserless браузер не нужен: страницы загружаются по HTTP и разбираются lxml
+    if request.node.get_closest_marker('browserless') is not None:
+        browser = HttpDriver(valid_language)
+        yield browser
+        browser.quit()
+        return
+
+    # headed — если тест помечен headed или явно указан --headed;
+    # тесты с маркерами headed, isolated и bidi всегда получают отдельный браузер
+    (_, _, headed), fresh = item_requirement(request.config)(request.node)
+
+    # Тестам с маркером bidi нужен браузер с открытым WebDriver BiDi
+    has_bidi_marker = request.node.get_closest_marker('bidi') is not None
+
+    pooled = request.config.getoption("--browser_pool") and not fresh
+
+    block_resources = request.config.getoption("--block-resources")
+    pool = request.getfixturevalue("browser_pool") if pooled else None
+
+    def launch():
+        if pooled:
+            return pool.acquire(browser_name, user_language, headed)
+        settings = launch_settings(request.config)
+        settings["enable_bidi"] = settings["enable_bidi"] or has_bidi_marker
+        return create_browser(browser_name, user_language, headed, **settings)
+
+    def prepare(started_browser):
+        # в браузере с BiDi квиз промо-страниц решается по событиям диалогов
+        dialog_handler = QuizDialogHandler.attach(started_browser)
+        if dialog_handler is not None:
+            dialog_handler.reset()  # квиз прошлого теста в этом браузере не считается
+
+        if block_resources:
+            # сбрасываем лог запросов, оставшийся от прошлого теста в этом браузере
+            resource_blocking.collect_blocked_requests(started_browser)
+
+    lazy_browser = LazyBrowser(launch, on_start=[prepare])
+    yield lazy_browser
+
+    if not lazy_browser.started:
+        print("\nbrowser was not used, not started")
+        return
+    browser = lazy_browser.wrapped_driver
+
+    if block_resources:
+        report_blocked_requests(request, browser)
+
+    if pooled:
+        pool.release(browser)
+        return
 
-    yield browser
     print("\nquit browser..")
     browser.quit()
+    warm_profiles.release(browser)
+
+
+# сколько запросов не загружено за сессию благодаря --block-resources, их адреса
+# и для --block-size-estimate — заблокированные URL каждого теста и оценщик их размера
+blocked_requests_stats = {"requests": 0, "urls": set(), "tests": [], "estimator": None}
+
+
+def report_blocked_requests(request, browser) -> None:
+    """Выводит, сколько запросов тест не загрузил благодаря --block-resources."""
+    if not hasattr(browser, "execute_cdp_cmd"):
+        print(f"\n🚫 {request.node.name}: blocked requests are not tracked in Firefox "
+              f"(resource types are disabled by preferences)")
+        return
+    blocked = resource_blocking.collect_blocked_requests(browser)
+    blocked_requests_stats["requests"] += len(blocked)
+    blocked_requests_stats["urls"].update(blocked)
+    estimator = blocked_requests_stats["estimator"]
+    if estimator is None:
+        print(f"\n🚫 {request.node.name}: blocked {len(blocked)} requests")
+        return
+    # размер оценивается в фоне, байты теста выводятся в конце сессии
+    estimator.submit(blocked)
+    blocked_requests_stats["tests"].append((request.node.name, blocked))
+    print(f"\n🚫 {request.node.name}: blocked {len(blocked)} requests (size: see the session summary)")
 
 def get_system_language():
     """Получает язык системы."""
@@ -110,6 +618,14 @@ def translation_fixture(request):
     return translations.get(valid_language, translations[DEFAULT_LANGUAGE])
 
 
+@pytest.fixture(scope="function")
+def basket_seeder(request):
+    """Фикстура для наполнения корзины гостя HTTP-запросами, без кликов в браузере."""
+    seeder = BasketSeeder(get_valid_language(request.config.getoption("language")))
+    yield seeder
+    seeder.close()
+
+
 @pytest.fixture(autouse=True)
 def timer(request):
     """Фикстура для замера времени выполнения каждого теста с выводом URL страницы."""
@@ -129,18 +645,97 @@ def timer(request):
 
     url_str = f" | URL: {url}" if url else ""
 
+    # разбивка по фазам: запуск браузера, навигация, ожидания, проверки
+    phases = ", ".join(f"{name} {seconds:.3f}" for name, seconds in phase_timer.phases.items()
+                       if name in ("launch", "navigation", "wait", "assertion"))
+    phases_str = f" ({phases})" if phases else ""
+
     if duration > LONG_TEST_THRESHOLD:
-        print(f"\n⏱ [SLOW TEST] {test_name}{url_str} took {duration:.3f} seconds")
+        print(f"\n⏱ [SLOW TEST] {test_name}{url_str} took {duration:.3f} seconds{phases_str}")
     else:
-        print(f"\n⏱ {test_name}{url_str} took {duration:.3f} seconds")
+        print(f"\n⏱ {test_name}{url_str} took {duration:.3f} seconds{phases_str}")
+
 
+def item_requirement(config):
+    """Функция item -> (конфигурация браузера, нужен ли отдельный браузер) для опций этого запуска."""
+    return functools.partial(browser_requirement, browser_name=config.getoption("browser_name"),
+                             language=config.getoption("language"), headed=config.getoption("--headed"))
 
+
+def estimate_launches(config, shards, requirement_of) -> int:
+    """Сколько раз запустится браузер, если выполнить шарды тестов в отдельных процессах."""
+    # Firefox пул закрывает после каждого теста (см. browser_pool.reset_browser_state)
+    pooled = config.getoption("--browser_pool") and config.getoption("browser_name") != "firefox"
+    max_browsers = config.getoption("--pool_max_browsers")
+    return sum(count_launches(shard, requirement_of, pooled, max_browsers) for shard in shards)
+
+
+def schedule_grouped(config) -> bool:
+    """Группировать ли тесты по браузеру: в режиме auto — только там, где это экономит запуски."""
+    schedule = config.getoption("--schedule")
+    if schedule == "auto":
+        return bool(config.getoption("--browser_pool")) or config.getoption("--workers") > 1
+    return schedule == "grouped"
+
+
+@pytest.hookimpl(trylast=True)
 def pytest_collection_modifyitems(config, items):
-    pass
-    #if not config.getoption("--headed"):
-        #for item in items:
-            #if "headed" in item.keywords:
-                #pytest.skip(f"Тест пропущен, так как не выбран режим headed: {item.name}")
+    """
+    Группирует тесты по требуемому браузеру (browser, language, headed), чтобы каждая конфигурация
+    запускалась как можно реже, и считает, сколько запусков браузера это экономит.
+    trylast: тесты, отброшенные -k и -m, к этому моменту уже удалены.
+    """
+    ref = config.getoption("--changed-since")
+    if ref and not is_worker():
+        select_changed(config, items, ref)
+
+    if not schedule_grouped(config) or not items:
+        return
+    requirement_of = item_requirement(config)
+    groups = group_items(items, requirement_of)
+
+    # при параллельном запуске считаем запуски по шардам: по кругу до и группами после
+    workers = 1 if is_worker() else max(config.getoption("--workers"), 1)
+    before = estimate_launches(config, [items[index::workers] for index in range(workers)], requirement_of)
+    after = estimate_launches(config, shard_groups(groups, workers), requirement_of)
+
+    items[:] = [item for group in groups for item in group]
+    config.browser_groups = groups
+    configurations = ", ".join(f"{describe_requirement(requirement_of(group[0]))}: {len(group)}"
+                               for group in groups)
+    config.schedule_summary = (f"browser schedule: {len(groups)} groups ({configurations}); "
+                               f"estimated browser launches {before} in file order, "
+                               f"{after} grouped ({before - after} saved)")
+
+
+def impact_nodeid(item, repo_root: str) -> str:
+    """
+    id теста в индексе влияния: относительно корня репозитория и с адресом исходного сайта,
+    чтобы id тестов с URL в параметрах не зависели от --base-url (порт локальной витрины меняется).
+    """
+    nodeid = item.nodeid.replace(Urls.BASE_URL, Urls.DEFAULT_BASE_URL)
+    return nodeid_to_repo(nodeid, str(item.config.rootpath), repo_root)
+
+
+def select_changed(config, items, ref: str) -> None:
+    """Оставляет в items только тесты, затронутые изменениями с ref (остальные отмечаются как deselected)."""
+    index = config.impact_index
+    changes = changed_symbols(index.root, ref, index.relative_path)
+    repo_ids = {item: impact_nodeid(item, index.root) for item in items}
+    affected = index.affected(repo_ids.values(), changes)
+    selected = [item for item in items if repo_ids[item] in affected]
+    deselected = [item for item in items if repo_ids[item] not in affected]
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = selected
+    config.impact_summary = (f"changed since {ref}: {len(changes)} symbols, "
+                             f"{len(selected)} affected tests selected, {len(deselected)} deselected")
+
+
+def pytest_report_collectionfinish(config, start_path, items):
+    """Выводит после сбора тестов, какие тесты выбраны по изменениям и как они сгруппированы по браузерам."""
+    return [summary for summary in (getattr(config, "impact_summary", None), getattr(config, "schedule_summary", None))
+            if summary]
 
 # ===
 # get links
@@ -202,9 +797,9 @@ def ui_bug_url(request):
     :return: Tuple of (URL, description)
     """
     bug_name, url = request.param
-    return bug_name, url
+    return bug_name, Urls.rebase(url)
 
 @pytest.fixture
 def known_broken_urls():
     """All known problematic URLs."""
-    return ProblematicUrls.ALL_PROBLEMATIC_URLS
+    return {name: Urls.rebase(url) for name, url in ProblematicUrls.ALL_PROBLEMATIC_URLS.items()}
@@ -1,41 +1,45 @@
 import functools
-import os
-from datetime import datetime
+
+from stepik_autotests_final_task.artifacts import artifacts
+from stepik_autotests_final_task.tracing import tracer
+
 
 class Decorators:
     @staticmethod
     def print_function_name(func):
-        @functools.wraps(func)
-        def wrapper(self, *args, **kwargs):
-            result = func(self, *args, **kwargs)
-            print(f"🔧 Calling: {func.__name__}")
-            print(f"Result: {result}")
-            return result
-        return wrapper
+        """
+        Записывает вызов функции как шаг трассировки (см. tracing.Tracer).
+        :param func:
+        :return:
+        """
+        return tracer.trace(func)
 
     @staticmethod
     def screenshot_on_error(func):
+        """
+        Сохраняет артефакты страницы при AssertionError и записывает вызов как шаг трассировки.
+        :param func:
+        :return:
+        """
         @functools.wraps(func)
         def wrapper(self, *args, **kwargs):
             try:
-                result = func(self, *args, **kwargs)
-                print(f"✅ {func.__name__} executed successfully.")
-                print(f"Result: {result}")
-                return result
+                return func(self, *args, **kwargs)
             except AssertionError as e:
-                timestamp = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
-                func_name = func.__name__
-                filename = f"screenshots/{func_name}_{timestamp}.png"
-                os.makedirs("screenshots", exist_ok=True)
-
-                if hasattr(self, "browser"):
-                    self.browser.save_screenshot(filename)
-                    print(f"📸 Screenshot saved to {filename}")
+                if getattr(e, "artifacts_captured", False):
+                    pass  # артефакты уже сняты во вложенной проверке
+                elif hasattr(self, "browser"):
+                    # скриншот, HTML и лог консоли пишутся в фоне (см. artifacts.ArtifactPipeline)
+                    path = artifacts.capture(self.browser, func.__name__)
+                    if path:
+                        print(f"📸 Artifacts queued to {path}")
+                    # хук pytest_runtest_makereport не снимает их ещё раз
+                    e.artifacts_captured = True
                 else:
                     print(f"⚠️ Can't take screenshot: no 'browser' attribute.")
 
                 raise e
-        return wrapper
+        return tracer.trace(wrapper)
 
     @staticmethod
     def no_implicit_wait(func):
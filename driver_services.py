@@ -0,0 +1,191 @@
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+from selenium.webdriver.chrome.service import Service as ChromeService
+from selenium.webdriver.common.selenium_manager import SeleniumManager
+from selenium.webdriver.firefox.service import Service as FirefoxService
+
+# где хранятся найденные пути драйверов между сессиями
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "stepik_autotests", "drivers.json")
+
+
+def browser_signature(browser_path: str) -> Optional[list]:
+    """
+    Признак версии браузера без его запуска: время изменения и размер файла браузера и время изменения его папки.
+    "<браузер> --version" не подходит: chrome.exe в Windows ничего не выводит и открывает окно браузера.
+    Папка нужна, потому что обновление часто меняет не сам файл, а соседние (скрипт-обёртка в Linux,
+    папка новой версии рядом с chrome.exe в Windows).
+    :return: [mtime файла, размер файла, mtime папки] или None, если файла нет
+    """
+    try:
+        real = os.path.realpath(browser_path)
+        stat = os.stat(real)
+        return [stat.st_mtime_ns, stat.st_size, os.stat(os.path.dirname(real)).st_mtime_ns]
+    except OSError:
+        return None
+
+
+class DriverCache:
+    """
+    Пути драйвера и браузера, найденные Selenium Manager, в JSON-файле между сессиями.
+    Запись считается верной, пока оба файла на месте и браузер не обновился (browser_signature);
+    иначе пути ищутся заново. Поиск выполняется один раз на процесс и браузер.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH):
+        """
+        :param path: файл кеша
+        """
+        self.path = path
+        self._resolved: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "seconds": 0.0}
+
+    def _load(self) -> dict:
+        try:
+            with open(self.path, encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self, entries: dict) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        # запись через временный файл: воркеры могут писать кеш одновременно
+        temporary = f"{self.path}.{os.getpid()}.tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            json.dump(entries, file, indent=2)
+        os.replace(temporary, self.path)
+
+    @staticmethod
+    def _is_valid(entry: dict) -> bool:
+        """Файлы на месте, и браузер не обновился с момента записи."""
+        return (os.path.isfile(entry.get("driver_path", "")) and os.path.isfile(entry.get("browser_path", ""))
+                and entry.get("browser_signature") is not None
+                and browser_signature(entry["browser_path"]) == entry["browser_signature"])
+
+    def resolve(self, browser_name: str) -> dict:
+        """
+        Пути для браузера.
+        :param browser_name: chrome или firefox
+        :return: словарь driver_path, browser_path, browser_signature
+        """
+        with self._lock:
+            if browser_name in self._resolved:
+                return self._resolved[browser_name]
+            start = time.perf_counter()
+            entries = self._load()
+            entry = entries.get(browser_name)
+            if entry and self._is_valid(entry):
+                self.stats["hits"] += 1
+            else:
+                paths = SeleniumManager().binary_paths(["--browser", browser_name])
+                entry = {"driver_path": paths["driver_path"], "browser_path": paths["browser_path"],
+                         "browser_signature": browser_signature(paths["browser_path"])}
+                entries[browser_name] = entry
+                try:
+                    self._save(entries)
+                except OSError as error:
+                    print(f"⚠️  Не удалось сохранить кеш драйверов: {error}")
+                self.stats["misses"] += 1
+            self.stats["seconds"] += time.perf_counter() - start
+            self._resolved[browser_name] = entry
+            return entry
+
+
+class _SharedServiceMixin:
+    """
+    Процесс драйвера, который не останавливается при quit() браузера.
+    WebDriver вызывает service.start() при создании и service.stop() при quit();
+    здесь start() запускает процесс только один раз, а stop() лишь отмечает, что сессия закончилась.
+    Процесс останавливается в shutdown().
+    """
+
+    in_use = False
+
+    def is_running(self) -> bool:
+        process = getattr(self, "process", None)
+        return process is not None and process.poll() is None
+
+    def start(self) -> None:
+        if not self.is_running():
+            super().start()
+
+    def stop(self) -> None:
+        self.in_use = False
+
+    def shutdown(self) -> None:
+        """Останавливает процесс драйвера."""
+        self.in_use = False
+        if self.is_running():
+            super().stop()
+
+
+class SharedChromeService(_SharedServiceMixin, ChromeService):
+    """chromedriver, общий для всех сессий Chrome процесса (chromedriver держит несколько сессий)."""
+
+
+class SharedFirefoxService(_SharedServiceMixin, FirefoxService):
+    """geckodriver, который переиспользуется следующими сессиями (geckodriver держит одну сессию за раз)."""
+
+
+class DriverServices:
+    """
+    Долгоживущие процессы драйверов одного воркера.
+    Для Chrome — один chromedriver на все сессии, для Firefox — свободный geckodriver
+    или новый, если все заняты (например, в пуле открыты браузеры нескольких конфигураций).
+    """
+
+    SERVICE_CLASSES = {"chrome": SharedChromeService, "firefox": SharedFirefoxService}
+
+    def __init__(self, cache: Optional[DriverCache] = None):
+        """
+        :param cache: кеш путей драйверов (по умолчанию — файл DEFAULT_CACHE_PATH)
+        """
+        self.cache = cache or DriverCache()
+        self._services: Dict[str, List[_SharedServiceMixin]] = {}
+        self._lock = threading.Lock()
+        self.stats = {"sessions": 0, "processes": 0}
+
+    def configure(self, cache_path: str) -> None:
+        """Меняет файл кеша до первого запуска браузера (опция командной строки)."""
+        self.cache = DriverCache(cache_path)
+
+    def acquire(self, browser_name: str, options) -> _SharedServiceMixin:
+        """
+        Сервис для новой сессии браузера.
+        В options подставляется путь к браузеру из кеша, чтобы WebDriver не запускал Selenium Manager.
+        :param browser_name: chrome или firefox
+        :param options: ChromeOptions или FirefoxOptions новой сессии
+        :return: сервис, который передаётся в webdriver.Chrome(service=...) / webdriver.Firefox(service=...)
+        """
+        paths = self.cache.resolve(browser_name)
+        if paths["browser_path"] and not getattr(options, "binary_location", None):
+            options.binary_location = paths["browser_path"]
+        with self._lock:
+            services = self._services.setdefault(browser_name, [])
+            service = next((service for service in services
+                            if browser_name == "chrome" or not service.in_use), None)
+            if service is None:
+                service = self.SERVICE_CLASSES[browser_name](executable_path=paths["driver_path"])
+                services.append(service)
+            if not service.is_running():
+                # процесс запустит WebDriver; упавший драйвер тоже запустится заново
+                self.stats["processes"] += 1
+            service.in_use = True
+            self.stats["sessions"] += 1
+            return service
+
+    def close(self) -> None:
+        """Останавливает все процессы драйверов."""
+        with self._lock:
+            for services in self._services.values():
+                for service in services:
+                    service.shutdown()
+            self._services = {}
+
+
+# процессы драйверов текущего воркера
+driver_services = DriverServices()
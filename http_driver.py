@@ -0,0 +1,317 @@
+from http.cookies import SimpleCookie
+from typing import Dict, List, Optional
+from urllib.parse import urlencode, urljoin, urlsplit
+
+import urllib3
+from selenium.common.exceptions import (
+    JavascriptException,
+    NoAlertPresentException,
+    NoSuchElementException,
+    WebDriverException,
+)
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.timeouts import Timeouts
+
+from stepik_autotests_final_task.pages.dom_snapshot import find_lxml_elements, lxml
+
+# сколько редиректов подряд проходит get(), прежде чем сдаться
+MAX_REDIRECTS = 10
+
+
+def _element_text(element) -> str:
+    """Текст элемента с нормализованными пробелами, без содержимого script и style."""
+    texts = element.xpath(".//text()[not(ancestor::script or ancestor::style or ancestor::noscript)]")
+    return " ".join(" ".join(texts).split())
+
+
+class HttpElement:
+    """Элемент страницы HttpDriver: подмножество WebElement поверх узла lxml."""
+
+    def __init__(self, driver: "HttpDriver", node):
+        self._driver = driver
+        self._node = node
+
+    @property
+    def tag_name(self) -> str:
+        return self._node.tag
+
+    @property
+    def text(self) -> str:
+        return "" if not self.is_displayed() else _element_text(self._node)
+
+    def get_attribute(self, name: str) -> Optional[str]:
+        if name in ("textContent", "innerText"):
+            return _element_text(self._node)
+        if name == "href" and self._node.get("href") is not None:
+            return urljoin(self._driver.current_url, self._node.get("href"))
+        return self._node.get(name)
+
+    def get_dom_attribute(self, name: str) -> Optional[str]:
+        return self._node.get(name)
+
+    def is_displayed(self) -> bool:
+        """Видимость по разметке: hidden, type=hidden и display:none у элемента или предков."""
+        for node in [self._node, *self._node.iterancestors()]:
+            style = (node.get("style") or "").replace(" ", "").lower()
+            if node.get("hidden") is not None or "display:none" in style:
+                return False
+        return not (self._node.tag == "input" and self._node.get("type") == "hidden")
+
+    def is_enabled(self) -> bool:
+        return self._node.get("disabled") is None
+
+    def find_element(self, by: str = By.ID, value: Optional[str] = None) -> "HttpElement":
+        return self._driver._first(self._node, by, value)
+
+    def find_elements(self, by: str = By.ID, value: Optional[str] = None) -> List["HttpElement"]:
+        return self._driver._wrap(find_lxml_elements(self._node, by, value))
+
+    def click(self) -> None:
+        """
+        Клик без JavaScript: ссылка открывается, кнопка отправляет свою форму.
+        Клик по другим элементам ничего не делает.
+        """
+        node = self._node
+        link = next((n for n in [node, *node.iterancestors()] if n.tag == "a" and n.get("href")), None)
+        if link is not None:
+            self._driver.get(urljoin(self._driver.current_url, link.get("href")))
+            return
+        is_submit = (node.tag == "button" and node.get("type", "submit") == "submit") or \
+                    (node.tag == "input" and node.get("type") in ("submit", "image"))
+        form = next((n for n in node.iterancestors() if n.tag == "form"), None)
+        if is_submit and form is not None:
+            self._driver._submit(form, node)
+
+    def submit(self) -> None:
+        form = next((n for n in [self._node, *self._node.iterancestors()] if n.tag == "form"), None)
+        if form is not None:
+            self._driver._submit(form)
+
+    def send_keys(self, *value: str) -> None:
+        self._node.set("value", (self._node.get("value") or "") + "".join(value))
+
+    def clear(self) -> None:
+        self._node.set("value", "")
+
+
+class _SwitchTo:
+    """switch_to без диалогов: у страницы без JavaScript alert не появляется."""
+
+    @property
+    def alert(self):
+        raise NoAlertPresentException("HttpDriver pages have no alerts")
+
+
+class HttpDriver:
+    """
+    Драйвер без браузера для проверок, которым не нужен JavaScript.
+    Реализует подмножество WebDriver, которым пользуется BasePage: get, find_element(s), .text,
+    current_url, page_source, cookies и таймауты. Страницы загружаются через пул keep-alive
+    соединений urllib3 и разбираются lxml с поиском по CSS и XPath.
+    execute_script выбрасывает JavascriptException — помощники BasePage в этом случае
+    переходят на обычные проверки.
+    """
+
+    def __init__(self, language: str = "en-gb", timeout: float = 10, maxsize: int = 4):
+        """
+        :param language: язык для заголовка Accept-Language
+        :param timeout: таймаут HTTP-запроса в секундах
+        :param maxsize: сколько соединений держать открытыми на один хост
+        """
+        if lxml is None:
+            raise ImportError("HttpDriver requires 'lxml' and 'cssselect' (see requirements.txt)")
+        self._http = urllib3.PoolManager(
+            maxsize=maxsize,
+            timeout=urllib3.Timeout(total=timeout),
+            retries=False,
+            headers={"Accept-Language": language, "User-Agent": "stepik-autotests-http-driver"},
+        )
+        self._cookies: Dict[str, dict] = {}
+        self._timeouts = Timeouts(implicit_wait=0, page_load=timeout, script=timeout)
+        self._url = "about:blank"
+        # HTTP-статус последней загруженной страницы
+        self.status_code = None
+        self._source = "<html><head></head><body></body></html>"
+        self._root = lxml.html.document_fromstring(self._source)
+        self.switch_to = _SwitchTo()
+        self.capabilities = {"browserName": "http", "pageLoadStrategy": "normal"}
+
+    # --- навигация ---
+
+    def get(self, url: str) -> None:
+        self._request("GET", url)
+
+    def refresh(self) -> None:
+        self.get(self._url)
+
+    @property
+    def current_url(self) -> str:
+        return self._url
+
+    @property
+    def page_source(self) -> str:
+        return self._source
+
+    @property
+    def title(self) -> str:
+        title = self._root.find(".//title")
+        return _element_text(title) if title is not None else ""
+
+    def _request(self, method: str, url: str, fields: Optional[Dict[str, str]] = None) -> None:
+        """Выполняет запрос, проходит редиректы и делает ответ текущей страницей."""
+        # заголовки запроса заменяют заголовки пула, поэтому общие копируются явно
+        headers = dict(self._http.headers)
+        if self._url.startswith("http"):
+            headers["Referer"] = self._url
+        for _ in range(MAX_REDIRECTS):
+            cookie_header = self._cookie_header(url)
+            if cookie_header:
+                headers["Cookie"] = cookie_header
+            else:
+                headers.pop("Cookie", None)
+            body = None
+            if fields is not None:
+                body = urlencode(fields)
+                headers["Content-Type"] = "application/x-www-form-urlencoded"
+            try:
+                response = self._http.request(method, url, body=body, headers=headers, redirect=False)
+            except urllib3.exceptions.HTTPError as error:
+                raise WebDriverException(f"HttpDriver failed to load {url}: {error}") from error
+            self._store_cookies(url, response.headers.getlist("Set-Cookie"))
+            location = response.headers.get("Location")
+            if response.status in (301, 302, 303, 307, 308) and location:
+                url = urljoin(url, location)
+                if response.status in (301, 302, 303):
+                    method, fields = "GET", None
+                    headers.pop("Content-Type", None)
+                continue
+            self._url = url
+            self.status_code = response.status
+            self._source = response.data.decode(self._charset(response), errors="replace")
+            self._root = lxml.html.document_fromstring(self._source or "<html></html>")
+            return
+        raise WebDriverException(f"HttpDriver: too many redirects from {url}")
+
+    @staticmethod
+    def _charset(response) -> str:
+        content_type = response.headers.get("Content-Type", "")
+        for part in content_type.split(";"):
+            name, _, value = part.strip().partition("=")
+            if name.lower() == "charset" and value:
+                return value.strip('"')
+        return "utf-8"
+
+    def _submit(self, form, submitter=None) -> None:
+        """Отправляет форму страницы с текущими значениями полей."""
+        fields = {}
+        for field in form.iter("input", "textarea", "select"):
+            name = field.get("name")
+            if not name or field.get("type") in ("submit", "image", "button"):
+                continue
+            if field.get("type") in ("checkbox", "radio") and field.get("checked") is None:
+                continue
+            fields[name] = field.get("value") or (field.text or "")
+        if submitter is not None and submitter.get("name"):
+            fields[submitter.get("name")] = submitter.get("value", "")
+        action = urljoin(self._url, form.get("action") or self._url)
+        if form.get("method", "get").lower() == "post":
+            self._request("POST", action, fields)
+        else:
+            self._request("GET", f"{action.split('?')[0]}?{urlencode(fields)}")
+
+    # --- поиск элементов ---
+
+    def _wrap(self, nodes) -> List[HttpElement]:
+        return [HttpElement(self, node) for node in nodes]
+
+    def _first(self, root, by: str, value: str) -> HttpElement:
+        nodes = find_lxml_elements(root, by, value)
+        if not nodes:
+            raise NoSuchElementException(f"Unable to locate element: {{\"method\":\"{by}\",\"selector\":\"{value}\"}}")
+        return HttpElement(self, nodes[0])
+
+    def find_element(self, by: str = By.ID, value: Optional[str] = None) -> HttpElement:
+        return self._first(self._root, by, value)
+
+    def find_elements(self, by: str = By.ID, value: Optional[str] = None) -> List[HttpElement]:
+        return self._wrap(find_lxml_elements(self._root, by, value))
+
+    # --- cookies ---
+
+    def _store_cookies(self, url: str, headers: List[str]) -> None:
+        host = urlsplit(url).hostname or ""
+        for header in headers:
+            cookie = SimpleCookie()
+            cookie.load(header)
+            for name, morsel in cookie.items():
+                if morsel["max-age"] == "0":
+                    self._cookies.pop(name, None)
+                    continue
+                self._cookies[name] = {"name": name, "value": morsel.value, "path": morsel["path"] or "/",
+                                       "domain": morsel["domain"] or host}
+
+    def _cookie_header(self, url: str) -> str:
+        parts = urlsplit(url)
+        host, path = parts.hostname or "", parts.path or "/"
+        return "; ".join(
+            f"{cookie['name']}={cookie['value']}" for cookie in self._cookies.values()
+            if host.endswith(cookie["domain"].lstrip(".")) and path.startswith(cookie["path"])
+        )
+
+    def get_cookies(self) -> List[dict]:
+        return [dict(cookie) for cookie in self._cookies.values()]
+
+    def get_cookie(self, name: str) -> Optional[dict]:
+        cookie = self._cookies.get(name)
+        return dict(cookie) if cookie else None
+
+    def add_cookie(self, cookie_dict: dict) -> None:
+        cookie = {"path": "/", "domain": urlsplit(self._url).hostname or ""}
+        cookie.update(cookie_dict)
+        self._cookies[cookie["name"]] = cookie
+
+    def delete_cookie(self, name: str) -> None:
+        self._cookies.pop(name, None)
+
+    def delete_all_cookies(self) -> None:
+        self._cookies.clear()
+
+    # --- таймауты ---
+
+    def implicitly_wait(self, time_to_wait: float) -> None:
+        """Значение запоминается, но не ждёт: без JavaScript страница после загрузки не меняется."""
+        self._timeouts = Timeouts(implicit_wait=time_to_wait, page_load=self._timeouts.page_load,
+                                  script=self._timeouts.script)
+
+    def set_script_timeout(self, time_to_wait: float) -> None:
+        self._timeouts = Timeouts(implicit_wait=self._timeouts.implicit_wait, page_load=self._timeouts.page_load,
+                                  script=time_to_wait)
+
+    def set_page_load_timeout(self, time_to_wait: float) -> None:
+        self._timeouts = Timeouts(implicit_wait=self._timeouts.implicit_wait, page_load=time_to_wait,
+                                  script=self._timeouts.script)
+
+    @property
+    def timeouts(self) -> Timeouts:
+        return self._timeouts
+
+    @timeouts.setter
+    def timeouts(self, timeouts: Timeouts) -> None:
+        self._timeouts = timeouts
+
+    # --- то, чего без браузера нет ---
+
+    def execute_script(self, script: str, *args):
+        raise JavascriptException("HttpDriver does not execute JavaScript")
+
+    def execute_async_script(self, script: str, *args):
+        raise JavascriptException("HttpDriver does not execute JavaScript")
+
+    def save_screenshot(self, filename: str) -> bool:
+        """Скриншота без браузера нет — вместо него сохраняется HTML страницы рядом."""
+        with open(f"{filename.rsplit('.', 1)[0]}.html", "w", encoding="utf-8") as file:
+            file.write(self._source)
+        return False
+
+    def quit(self) -> None:
+        self._http.clear()
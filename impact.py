@@ -0,0 +1,458 @@
+#!/usr/bin/env python3
+"""
+Анализ влияния изменений: какие тесты затрагивают изменённые page objects, локаторы, URL и переводы.
+
+Индекс (.impact_index.json) хранит для каждого теста функции проекта, которые выполнялись во время теста
+(запись при --record_impact), а для каждого файла — функции, константы и ключи словарей, на которые
+ссылается код каждой функции (статический разбор ast, пересчитывается только для изменившихся файлов).
+
+По изменениям относительно git-ссылки выбираются тесты, которые:
+- выполняли изменённую функцию (метод page object, фикстуру, сам тест);
+- выполняли функцию, которая ссылается на изменённую константу (локатор, URL, скрипт) или ключ перевода —
+  напрямую, через self./cls. или через другую константу (например, список локаторов);
+- отсутствуют в индексе (новые тесты).
+Если изменилось то, что нельзя привязать к функциям (код модуля, pytest.ini, requirements.txt), выбираются все тесты.
+
+Затронутые тесты без запуска:
+    python -m stepik_autotests_final_task.impact origin/main
+"""
+
+import argparse
+import ast
+import hashlib
+import json
+import os
+import re
+import subprocess
+import sys
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# файл индекса в корне проекта
+DEFAULT_INDEX_PATH = ".impact_index.json"
+
+# изменения в этих файлах не влияют на тесты
+IGNORED_SUFFIXES = (".md", ".rst", ".gitignore", ".jsonl")
+
+# файлы, любое изменение которых затрагивает все тесты: хуки и фикстуры работают вне записи тестов
+EVERYTHING_FILES = ("conftest.py",)
+
+# ключ "выбрать все тесты"
+EVERYTHING = "*"
+
+_HUNK = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+
+def _git(root: str, *args: str) -> Optional[str]:
+    """Вывод git-команды или None, если она не выполнилась."""
+    result = subprocess.run(["git", *args], cwd=root, capture_output=True, text=True)
+    return result.stdout if result.returncode == 0 else None
+
+
+def git_root(path: str) -> str:
+    """Корень git-репозитория, в котором лежит path (или сам path, если это не репозиторий)."""
+    output = _git(path, "rev-parse", "--show-toplevel")
+    return os.path.realpath(output.strip() if output else path)
+
+
+# ====== Статический разбор ======
+
+class _References(ast.NodeVisitor):
+    """Имена, на которые ссылается код: NAME, Class.ATTR и строковые ключи ['key']."""
+
+    def __init__(self, class_name: Optional[str] = None):
+        """
+        :param class_name: класс, в котором находится код: self.ATTR и cls.ATTR записываются как Class.ATTR
+        """
+        self.names: Set[str] = set()
+        self.class_name = class_name
+
+    def visit_Name(self, node: ast.Name) -> None:
+        self.names.add(node.id)
+
+    def visit_Attribute(self, node: ast.Attribute) -> None:
+        if isinstance(node.value, ast.Name):
+            owner = node.value.id
+            if owner in ("self", "cls") and self.class_name:
+                owner = self.class_name
+            self.names.add(f"{owner}.{node.attr}")
+        self.generic_visit(node)
+
+    def visit_Subscript(self, node: ast.Subscript) -> None:
+        if isinstance(node.slice, ast.Constant) and isinstance(node.slice.value, str):
+            self.names.add(f"[{node.slice.value!r}]")
+        self.generic_visit(node)
+
+
+def _start_line(node: ast.AST) -> int:
+    decorators = getattr(node, "decorator_list", [])
+    return min([node.lineno] + [decorator.lineno for decorator in decorators])
+
+
+def _dict_key_ranges(node: ast.AST) -> List[Tuple[int, int, str]]:
+    """Строки значений строковых ключей словаря (вложенные словари — до самого глубокого ключа)."""
+    ranges = []
+    if isinstance(node, ast.Dict):
+        for key, value in zip(node.keys, node.values):
+            if isinstance(key, ast.Constant) and isinstance(key.value, str):
+                nested = _dict_key_ranges(value)
+                if nested:
+                    ranges.extend(nested)
+                else:
+                    ranges.append((key.lineno, value.end_lineno, f"[{key.value!r}]"))
+    return ranges
+
+
+def analyze_source(source: str) -> Dict[str, dict]:
+    """
+    Разбирает модуль.
+    :return: {"functions": {qualname: [первая строка, последняя строка, [ссылки]]},
+              "constants": [[первая строка, последняя строка, имя]],
+              "references": {имя константы: [ссылки её значения]}}
+              Имена констант: NAME (модуль), Class.ATTR (класс), ['key'] (ключ словаря модуля).
+    """
+    functions: Dict[str, list] = {}
+    constants: List[list] = []
+    constant_references: Dict[str, Set[str]] = {}
+
+    def visit(body, prefix: str) -> None:
+        class_name = prefix.rstrip(".").rsplit(".", 1)[-1] or None
+        for node in body:
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                references = _References(class_name)
+                references.visit(node)
+                functions[prefix + node.name] = [_start_line(node), node.end_lineno, sorted(references.names)]
+            elif isinstance(node, ast.ClassDef):
+                visit(node.body, f"{prefix}{node.name}.")
+            elif isinstance(node, (ast.Assign, ast.AnnAssign)):
+                references = _References(class_name)
+                if node.value is not None:
+                    references.visit(node.value)
+                names = references.names
+                if class_name:
+                    # в теле класса голое имя может быть другой константой этого же класса
+                    names = names | {f"{class_name}.{name}" for name in names if "." not in name}
+                targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+                for target in targets:
+                    if isinstance(target, ast.Name):
+                        # константа класса: Class.ATTR — так на неё ссылаются снаружи
+                        name = ".".join(f"{prefix}{target.id}".split(".")[-2:])
+                        constants.append([node.lineno, node.end_lineno, name])
+                        constant_references.setdefault(name, set()).update(names)
+                if not prefix and node.value is not None:
+                    constants.extend([first, last, key] for first, last, key in _dict_key_ranges(node.value))
+
+    try:
+        visit(ast.parse(source).body, "")
+    except SyntaxError:
+        pass
+    return {"functions": functions, "constants": constants,
+            "references": {name: sorted(names) for name, names in constant_references.items()}}
+
+
+def _symbols_for_lines(analysis: Dict[str, dict], path: str, lines: Iterable[int],
+                       source_lines: List[str]) -> Set[str]:
+    """
+    Символы, к которым относятся изменённые строки.
+    :return: path::qualname для функций, имена констант и f"file:{path}" для остального кода модуля
+    """
+    symbols = set()
+    for line in lines:
+        found = False
+        for qualname, (first, last, _) in analysis["functions"].items():
+            if first <= line <= last:
+                symbols.add(f"{path}::{qualname}")
+                found = True
+        # самый узкий диапазон константы: ключ словаря, а не весь словарь
+        matches = [(last - first, name) for first, last, name in analysis["constants"] if first <= line <= last]
+        if matches:
+            symbols.add(min(matches)[1])
+            found = True
+        if not found:
+            text = source_lines[line - 1].strip() if 0 < line <= len(source_lines) else ""
+            if text and not text.startswith("#"):
+                symbols.add(f"file:{path}")
+    return symbols
+
+
+# ====== Изменения относительно git-ссылки ======
+
+def changed_symbols(root: str, ref: str, index_path: str = DEFAULT_INDEX_PATH) -> Set[str]:
+    """
+    Символы, изменённые в рабочем дереве относительно ref (включая неотслеживаемые файлы).
+    :param index_path: файл индекса относительно root — он и его временные файлы не считаются изменениями
+    :return: множество символов; EVERYTHING, если изменение нельзя привязать к функциям
+    """
+    diff = _git(root, "diff", "-U0", "--no-color", "--no-renames", ref, "--")
+    if diff is None:
+        return {EVERYTHING}
+    hunks: Dict[str, List[Tuple[int, int, int, int]]] = {}
+    path = None
+    for line in diff.splitlines():
+        if line.startswith("diff --git"):
+            path = line.split(" b/", 1)[1]
+            hunks.setdefault(path, [])
+        match = _HUNK.match(line)
+        if match and path is not None:
+            old_start, old_count, new_start, new_count = match.groups()
+            hunks[path].append((int(old_start), 1 if old_count is None else int(old_count),
+                                int(new_start), 1 if new_count is None else int(new_count)))
+
+    untracked = _git(root, "ls-files", "--others", "--exclude-standard") or ""
+    for path in untracked.splitlines():
+        hunks.setdefault(path, [])
+
+    symbols: Set[str] = set()
+    for path, file_hunks in hunks.items():
+        if path.endswith(IGNORED_SUFFIXES) or path == index_path or path.startswith(f"{index_path}."):
+            continue
+        if not path.endswith(".py") or os.path.basename(path) in EVERYTHING_FILES:
+            return {EVERYTHING}
+        full_path = os.path.join(root, path)
+        new_source = ""
+        if os.path.exists(full_path):
+            with open(full_path, encoding="utf-8") as file:
+                new_source = file.read()
+        old_source = _git(root, "show", f"{ref}:{path}") or ""
+        if not file_hunks:
+            # новый файл целиком
+            file_hunks = [(0, 0, 1, len(new_source.splitlines()))]
+        for source, side in ((old_source, 0), (new_source, 2)):
+            if not source:
+                continue
+            lines = set()
+            for hunk in file_hunks:
+                start, count = hunk[side], hunk[side + 1]
+                # чистое удаление или вставка: затронута строка рядом с местом изменения
+                lines.update(range(start, start + count) if count else (max(start, 1),))
+            symbols |= _symbols_for_lines(analyze_source(source), path, lines, source.splitlines())
+    return symbols
+
+
+# ====== Запись выполненных функций ======
+
+class CallRecorder:
+    """
+    Записывает функции проекта, которые выполнялись во время теста (sys.setprofile во всех потоках).
+    Профилировщик только складывает code objects в множество; в символы они переводятся в stop().
+    """
+
+    def __init__(self, root: str):
+        """
+        :param root: корень проекта; функции вне него (selenium, pytest) не записываются
+        """
+        self.root = os.path.realpath(root)
+        self._codes: set = set()
+        self._paths: Dict[str, Optional[str]] = {}
+        self._functions: Dict[str, dict] = {}
+
+    def _profile(self, frame, event, arg) -> None:
+        if event == "call":
+            self._codes.add(frame.f_code)
+
+    def start(self) -> None:
+        self._codes = set()
+        threading.setprofile(self._profile)
+        sys.setprofile(self._profile)
+
+    def stop(self) -> Set[str]:
+        """
+        Останавливает запись.
+        :return: символы path::qualname выполненных функций (вложенные функции — как внешняя)
+        """
+        sys.setprofile(None)
+        threading.setprofile(None)
+        symbols = set()
+        for code in self._codes:
+            path = self._relative_path(code.co_filename)
+            if path is None or code.co_name == "<module>":
+                continue
+            qualname = self._qualname(code, path)
+            if qualname is not None:
+                symbols.add(f"{path}::{qualname}")
+        self._codes = set()
+        return symbols
+
+    def _relative_path(self, filename: str) -> Optional[str]:
+        if filename not in self._paths:
+            # "<frozen abc>", "<string>" и т.п. — не файлы, realpath сделал бы из них путь внутри root
+            real = None if filename.startswith("<") else os.path.realpath(filename)
+            inside = (real is not None and real.startswith(self.root + os.sep) and os.path.isfile(real)
+                      and "site-packages" not in real and real != os.path.realpath(__file__))
+            self._paths[filename] = os.path.relpath(real, self.root).replace(os.sep, "/") if inside else None
+        return self._paths[filename]
+
+    def _qualname(self, code, path: str) -> Optional[str]:
+        """qualname функции (вложенные функции — как внешняя) или None, если это не функция из разбора файла."""
+        qualname = getattr(code, "co_qualname", None)  # Python 3.11+
+        if qualname is not None:
+            return qualname.split(".<locals>", 1)[0]
+        # до Python 3.11 qualname берётся из статического разбора: функция, в которую входит строка def
+        if path not in self._functions:
+            try:
+                with open(os.path.join(self.root, path), encoding="utf-8") as file:
+                    self._functions[path] = analyze_source(file.read())["functions"]
+            except (OSError, UnicodeDecodeError):
+                self._functions[path] = {}
+        matches = [(last - first, name) for name, (first, last, _) in self._functions[path].items()
+                   if first <= code.co_firstlineno <= last]
+        return min(matches)[1] if matches else None
+
+
+# ====== Индекс ======
+
+class ImpactIndex:
+    """
+    Индекс влияния на диске. Обновляется по частям: записи тестов заменяются только для выполненных
+    тестов, статический разбор — только для файлов, у которых изменилось содержимое.
+    """
+
+    def __init__(self, root: str, path: str = DEFAULT_INDEX_PATH):
+        """
+        :param root: корень git-репозитория
+        :param path: файл индекса (относительно root)
+        """
+        self.root = root
+        self.relative_path = path
+        self.path = os.path.join(root, path)
+        self.tests: Dict[str, List[str]] = {}
+        self.files: Dict[str, dict] = {}
+        self._recorded: Dict[str, List[str]] = {}
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, encoding="utf-8") as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return
+        self.tests = data.get("tests", {})
+        self.files = data.get("files", {})
+
+    def record(self, nodeid: str, functions: Set[str]) -> None:
+        """Запоминает функции, выполненные тестом."""
+        self._recorded[nodeid] = sorted(functions)
+
+    def _analysis(self, path: str) -> dict:
+        """Статический разбор файла из кеша индекса; пересчитывается, если файл изменился."""
+        full_path = os.path.join(self.root, path)
+        try:
+            with open(full_path, "rb") as file:
+                content = file.read()
+        except OSError:
+            return {"functions": {}, "constants": [], "references": {}}
+        digest = hashlib.sha1(content).hexdigest()
+        cached = self.files.get(path)
+        # записи старых индексов без ссылок констант тоже пересчитываются
+        if cached is None or cached["sha1"] != digest or "references" not in cached:
+            cached = dict(analyze_source(content.decode("utf-8", errors="replace")), sha1=digest)
+            self.files[path] = cached
+        return cached
+
+    def save(self) -> None:
+        """
+        Дописывает записанные тесты в индекс на диске.
+        Файл перечитывается под блокировкой, чтобы воркеры параллельного запуска не затирали записи друг друга.
+        """
+        if not self._recorded:
+            return
+        lock_path = f"{self.path}.lock"
+        with open(lock_path, "w") as lock:
+            try:
+                import fcntl
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            except ImportError:
+                pass  # Windows: без блокировки
+            recorded = self._recorded
+            self._load()
+            self.tests.update(recorded)
+            for functions in recorded.values():
+                for path in {symbol.split("::", 1)[0] for symbol in functions}:
+                    self._analysis(path)
+            # файлы, которых больше нет, и тесты из них
+            self.files = {path: data for path, data in self.files.items()
+                          if os.path.exists(os.path.join(self.root, path))}
+            self.tests = {nodeid: functions for nodeid, functions in self.tests.items()
+                          if os.path.exists(os.path.join(self.root, nodeid.split("::", 1)[0]))}
+            temporary = f"{self.path}.{os.getpid()}.tmp"
+            with open(temporary, "w", encoding="utf-8") as file:
+                json.dump({"tests": self.tests, "files": self.files}, file, indent=1, sort_keys=True)
+            os.replace(temporary, self.path)
+        self._recorded = {}
+
+    def affected(self, nodeids: Iterable[str], changes: Set[str]) -> Set[str]:
+        """
+        Выбирает тесты, затронутые изменениями.
+        :param nodeids: id собранных тестов (относительно корня репозитория)
+        :param changes: результат changed_symbols()
+        :return: id затронутых тестов
+        """
+        nodeids = list(nodeids)
+        if EVERYTHING in changes:
+            return set(nodeids)
+        changed_files = {symbol[len("file:"):] for symbol in changes if symbol.startswith("file:")}
+        touched_files = {symbol.split("::", 1)[0] for functions in self.tests.values() for symbol in functions}
+        if changed_files - touched_files:
+            # изменён код модуля, функции которого ни один тест не выполнял (например, новый модуль)
+            return set(nodeids)
+        changes = self._with_dependent_constants(changes)
+
+        affected = set()
+        for nodeid in nodeids:
+            functions = self.tests.get(nodeid)
+            if functions is None or self._is_affected(functions, changes, changed_files):
+                affected.add(nodeid)
+        return affected
+
+    def _with_dependent_constants(self, changes: Set[str]) -> Set[str]:
+        """
+        Добавляет к изменениям константы, значения которых ссылаются на изменённые константы
+        (например, список локаторов, собранный из изменённого локатора), в том числе через цепочку констант.
+        Константы ищутся во всех .py-файлах репозитория: модуль локаторов может не содержать ни одной функции.
+        """
+        listed = _git(self.root, "ls-files", "--cached", "--others", "--exclude-standard", "--", "*.py")
+        paths = listed.splitlines() if listed is not None else list(self.files)
+        references: Dict[str, Set[str]] = {}
+        for path in paths:
+            for name, names in self._analysis(path)["references"].items():
+                references.setdefault(name, set()).update(names)
+        changes = set(changes)
+        added = True
+        while added:
+            added = False
+            for name, names in references.items():
+                if name not in changes and changes.intersection(names):
+                    changes.add(name)
+                    added = True
+        return changes
+
+    def _is_affected(self, functions: List[str], changes: Set[str], changed_files: Set[str]) -> bool:
+        for symbol in functions:
+            if symbol in changes:
+                return True
+            path, qualname = symbol.split("::", 1)
+            if path in changed_files:
+                return True
+            function = self._analysis(path)["functions"].get(qualname)
+            if function is not None and changes.intersection(function[2]):
+                return True
+        return False
+
+
+def nodeid_to_repo(nodeid: str, rootdir: str, repo_root: str) -> str:
+    """id теста относительно корня репозитория (pytest считает его от rootdir)."""
+    prefix = os.path.relpath(os.path.realpath(rootdir), repo_root).replace(os.sep, "/")
+    return nodeid if prefix == "." else f"{prefix}/{nodeid}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tests affected by changes since a git ref")
+    parser.add_argument("ref", help="git ref to compare the working tree with, e.g. origin/main")
+    parser.add_argument("--index", default=DEFAULT_INDEX_PATH)
+    args = parser.parse_args()
+    repo = git_root(os.getcwd())
+    changes = changed_symbols(repo, args.ref, args.index)
+    print("changed:", ", ".join(sorted(changes)) or "nothing")
+    index = ImpactIndex(repo, args.index)
+    for test in sorted(index.affected(index.tests, changes)):
+        print(test)
@@ -1,52 +1,183 @@
-# data/known_issues.py
+import bisect
+import json
+import os
+import threading
+from collections import defaultdict
 from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+# файл с известными багами
+ISSUES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "known_issues.json")
+
+STATUSES = ("open", "in_progress", "fixed", "wont_fix")
+SEVERITIES = ("critical", "high", "medium", "low")
+
+
+class KnownIssueStore:
+    """
+    Известные баги из JSON-файла с индексами по статусу, серьёзности, категории, URL и тесту.
+    Файл читается при первом обращении; даты разбираются один раз при загрузке,
+    открытые баги хранятся отсортированными по дате, чтобы старые находились бинарным поиском.
+    """
+
+    def __init__(self, path: str = ISSUES_PATH):
+        """
+        :param path: JSON-файл {имя бага: описание}
+        """
+        self.path = path
+        self._issues: Optional[Dict[str, dict]] = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, dict]:
+        if self._issues is not None:
+            return self._issues
+        with self._lock:
+            if self._issues is None:
+                with open(self.path, encoding="utf-8") as file:
+                    issues = json.load(file)
+                self._build_indexes(issues)
+                self._issues = issues
+        return self._issues
+
+    def _build_indexes(self, issues: Dict[str, dict]) -> None:
+        self._by_status: Dict[str, List[str]] = defaultdict(list)
+        self._by_severity: Dict[str, List[str]] = defaultdict(list)
+        self._by_category: Dict[str, List[str]] = defaultdict(list)
+        self._by_url: Dict[str, List[str]] = defaultdict(list)
+        self._by_test_case: Dict[str, List[str]] = defaultdict(list)
+        self._reported: Dict[str, datetime] = {}
+        self._position = {name: position for position, name in enumerate(issues)}
+        open_issues = []
+        for name, issue in issues.items():
+            self._by_status[issue["status"]].append(name)
+            self._by_severity[issue["severity"]].append(name)
+            if issue.get("category"):
+                self._by_category[issue["category"]].append(name)
+            if issue.get("url"):
+                self._by_url[issue["url"]].append(name)
+            if issue.get("test_case"):
+                self._by_test_case[issue["test_case"]].append(name)
+            self._reported[name] = datetime.strptime(issue["reported_date"], "%Y-%m-%d")
+            if issue["status"] == "open":
+                open_issues.append((self._reported[name], name))
+        open_issues.sort()
+        self._open_dates = [reported for reported, _ in open_issues]
+        self._open_names = [name for _, name in open_issues]
+
+    @property
+    def issues(self) -> Dict[str, dict]:
+        """Все баги: {имя: описание}."""
+        return self._load()
+
+    def _select(self, index: str, keys) -> Dict[str, dict]:
+        """Баги из индекса по нескольким ключам, в порядке файла."""
+        issues = self._load()
+        names = [name for key in keys for name in getattr(self, index).get(key, ())]
+        if len(keys) > 1:
+            names.sort(key=self._position.__getitem__)
+        return {name: issues[name] for name in names}
+
+    def by_status(self, *statuses: str) -> Dict[str, dict]:
+        """
+        Баги с любым из статусов.
+        :param statuses: статусы из STATUSES
+        :return: {имя бага: описание} в порядке файла
+        """
+        return self._select("_by_status", statuses)
+
+    def by_severity(self, *severities: str) -> Dict[str, dict]:
+        """
+        Баги с любой из серьёзностей.
+        :param severities: серьёзности из SEVERITIES
+        :return: {имя бага: описание} в порядке файла
+        """
+        return self._select("_by_severity", severities)
+
+    def by_category(self, *categories: str) -> Dict[str, dict]:
+        """
+        Баги из любой из категорий (баги без категории не попадают).
+        :param categories: категории, как в поле category
+        :return: {имя бага: описание} в порядке файла
+        """
+        return self._select("_by_category", categories)
+
+    def by_url(self, url: str) -> Dict[str, dict]:
+        """
+        Баги, воспроизводящиеся на URL.
+        :param url: URL точно как в поле url (без нормализации)
+        :return: {имя бага: описание} в порядке файла
+        """
+        return self._select("_by_url", (url,))
+
+    def by_test_case(self, test_case: str) -> Dict[str, dict]:
+        """
+        Баги, которые проверяет тест.
+        :param test_case: имя теста, как в поле test_case
+        :return: {имя бага: описание} в порядке файла
+        """
+        return self._select("_by_test_case", (test_case,))
+
+    def reported_date(self, name: str) -> datetime:
+        """Дата сообщения о баге (разобрана при загрузке)."""
+        self._load()
+        return self._reported[name]
+
+    def open_reported_before(self, moment: datetime) -> Dict[str, dict]:
+        """Открытые баги, о которых сообщили раньше moment (от старых к новым)."""
+        issues = self._load()
+        count = bisect.bisect_left(self._open_dates, moment)
+        return {name: issues[name] for name in self._open_names[:count]}
+
+    def urls(self, issues: Dict[str, dict]) -> Dict[str, str]:
+        """{имя бага: URL} для багов с URL."""
+        return {name: issue["url"] for name, issue in issues.items() if issue.get("url")}
+
+
+# общее хранилище известных багов
+store = KnownIssueStore()
+
+
+class StoreView:
+    """Атрибут класса, который вычисляется из хранилища при обращении (хранилище загружается лениво)."""
+
+    def __init__(self, getter: Callable[[KnownIssueStore], object]):
+        """
+        :param getter: функция, которая получает значение атрибута из хранилища
+        """
+        self.getter = getter
+
+    def __get__(self, instance, owner):
+        """
+        Вычисляет значение при каждом обращении — и через класс, и через экземпляр.
+        :return: результат getter для общего хранилища store
+        """
+        return self.getter(store)
 
 
 class KnownIssues:
-    ISSUES = {
-        "incorrect_product_name_bug": {
-            "url": "http://selenium1py.pythonanywhere.com/catalogue/coders-at-work_207/?promo=offer7",
-            "test_case": "test_guest_can_add_product_to_basket",
-            "expected_incorrect_value": "Coders at Work book",
-            "expected_correct_value": "Coders at Work",
-            "name": "incorrect_product_name_bug",
-            "description": "After clicking 'add to basket', "
-                           "product name in basket is 'Coders at Work book' but expected to be 'Coders at Work'",
-            "severity": "low",  # critical, high, medium, low
-            "reported_date": "2025-08-17",
-            "expected_fix_date": "2025-09-09",
-            "status": "open",  # open, in_progress, fixed, wont_fix
-            "reason": "Product team decided this is expected behavior",
-            "decision_by": "product_manager@company.com",
-            "decision_date": "2025-08-19",
-            "affected_users": "All users seeing English version",
-            "workaround": "Ignore the extra 'book' in product name"
-                                      }
-
-
-    }
-
-    @ classmethod
+    ISSUES = StoreView(lambda issue_store: issue_store.issues)
+
+    @classmethod
     def get_urgent_issues(cls):
         """Получить срочные issues"""
-        return {k: v for k, v in cls.ISSUES.items() if v['severity'] in ['critical', 'high']}
+        return store.by_severity("critical", "high")
 
     @classmethod
     def get_stale_issues(cls, days=30):
         """Получить старые нерешенные issues"""
-        stale_date = datetime.now() - timedelta(days=days)
-        stale_issues = {}
-
-        for issue_name, issue_data in cls.ISSUES.items():
-            if issue_data['status'] == 'open':
-                reported_date = datetime.strptime(issue_data['reported_date'], '%Y-%m-%d')
-                if reported_date < stale_date:
-                    stale_issues[issue_name] = issue_data
-
-        return stale_issues
+        return store.open_reported_before(datetime.now() - timedelta(days=days))
 
     @classmethod
     def get_active_issues(cls):
         """Получить все активные issues"""
-        return [k for k, v in cls.ISSUES.items() if v['status'] in ['open', 'in_progress']]
+        return list(store.by_status("open", "in_progress"))
 
+    @classmethod
+    def get_issues_for_url(cls, url):
+        """Получить issues, воспроизводящиеся на URL"""
+        return store.by_url(url)
+
+    @classmethod
+    def get_issues_for_test(cls, test_case):
+        """Получить issues, которые проверяет тест"""
+        return store.by_test_case(test_case)
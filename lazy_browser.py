@@ -0,0 +1,63 @@
+import time
+from typing import Callable, Iterable, Optional
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+
+class LazyBrowser:
+    """
+    Прокси WebDriver, который запускает браузер при первом обращении к любому атрибуту или команде.
+    Тест, который пропустился или упал до работы с браузером, не платит за запуск.
+    Прокси не выдаёт себя за WebDriver: isinstance(proxy, WebDriver) ложно и браузер не запускает.
+    Коду, которому нужен настоящий WebDriver (EventFiringWebDriver, обработчики BiDi), он доступен
+    как wrapped_driver, как у EventFiringWebDriver; обращение к нему запускает браузер.
+    """
+
+    def __init__(self, launch: Callable[[], WebDriver], on_start: Iterable[Callable[[WebDriver], None]] = ()):
+        """
+        :param launch: функция, которая запускает браузер (или берёт его из пула)
+        :param on_start: что сделать с браузером сразу после запуска (подключить обработчики и т.п.)
+        """
+        object.__setattr__(self, "_launch", launch)
+        object.__setattr__(self, "_on_start", tuple(on_start))
+        object.__setattr__(self, "_browser", None)
+        # сколько занял запуск; None, если браузер не запускался
+        object.__setattr__(self, "launch_seconds", None)
+
+    def _start(self) -> WebDriver:
+        browser = object.__getattribute__(self, "_browser")
+        if browser is None:
+            start = time.perf_counter()
+            browser = object.__getattribute__(self, "_launch")()
+            object.__setattr__(self, "launch_seconds", time.perf_counter() - start)
+            object.__setattr__(self, "_browser", browser)
+            for callback in object.__getattribute__(self, "_on_start"):
+                callback(browser)
+        return browser
+
+    @property
+    def started(self) -> bool:
+        """Был ли браузер запущен."""
+        return object.__getattribute__(self, "_browser") is not None
+
+    @property
+    def wrapped_driver(self) -> WebDriver:
+        """Настоящий браузер (запускается, если ещё не запущен)."""
+        return self._start()
+
+    def __getattr__(self, name: str):
+        # вызывается только для атрибутов, которых нет у самого прокси
+        return getattr(self._start(), name)
+
+    def __setattr__(self, name: str, value) -> None:
+        setattr(self._start(), name, value)
+
+    def quit(self) -> None:
+        """Закрывает браузер, если он был запущен; незапущенный браузер не запускается ради quit."""
+        browser: Optional[WebDriver] = object.__getattribute__(self, "_browser")
+        if browser is not None:
+            browser.quit()
+
+    def __repr__(self) -> str:
+        browser = object.__getattribute__(self, "_browser")
+        return f"LazyBrowser({browser!r})" if browser is not None else "LazyBrowser(not started)"
@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+"""
+Локальная копия витрины selenium1py.pythonanywhere.com для быстрого запуска тестов без сети.
+Повторяет только то, что используют page objects: главную, каталог, страницы товаров
+с promo-квизом, корзину и страницу логина/регистрации на нескольких языках.
+
+Запуск вручную:
+    python -m stepik_autotests_final_task.local_store --port 8000 --latency 0.05
+"""
+
+import argparse
+import html
+import random
+import re
+import secrets
+import threading
+import time
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from stepik_autotests_final_task.translations import translations
+
+# товары витрины: slug -> (id, название, цена)
+PRODUCTS = {
+    "coders-at-work_207": (207, "Coders at Work", "19.99"),
+    "the-city-and-the-stars_95": (95, "The City and the Stars", "9.99"),
+    "the-shellcoders-handbook_209": (209, "The shellcoder's handbook", "9.99"),
+}
+
+# promo-предложение, на котором воспроизводится известный баг с названием товара (см. data/known_issues.json)
+BUGGED_PROMO = "offer7"
+
+LANGUAGES = ("en-gb", "ru", "fr", "de", "es", "it", "fi")
+
+# тексты, которых нет в translations.py
+TEXTS = {
+    "en": {"login": "Login or register", "view_basket": "View basket", "add_to_basket": "Add to basket",
+           "basket_total_label": "Basket total:", "qualifies": "Your basket now qualifies for the",
+           "offer": "offer.", "all_products": "All products"},
+    "ru": {"login": "Войти или зарегистрироваться", "view_basket": "Посмотреть корзину",
+           "add_to_basket": "Добавить в корзину", "basket_total_label": "Всего в корзине:",
+           "qualifies": "Ваша корзина удовлетворяет условиям предложения", "offer": "",
+           "all_products": "Все товары"},
+}
+
+# товары, открытые по неизвестному slug: slug -> (id, название, цена)
+_generated_products: Dict[str, Tuple[int, str, str]] = {}
+
+CSRF_COOKIE = "csrftoken"
+CSRF_FIELD = "csrfmiddlewaretoken"
+SESSION_COOKIE = "sessionid"
+
+QUIZ_SCRIPT = """
+<script>
+document.getElementById('add_to_basket_form').addEventListener('submit', function () {
+    var x = Math.floor(Math.random() * 1000) + 1;
+    var answer = prompt('x = ' + x + ' ; enter ln(abs(12*sin(x)))');
+    var expected = Math.log(Math.abs(12 * Math.sin(x)));
+    if (answer !== null && Math.abs(parseFloat(answer) - expected) < 1e-6) {
+        alert('Congratulations! Your code: ' + Math.random().toString(36).slice(2, 10));
+    } else {
+        alert('Wrong answer');
+    }
+});
+</script>
+"""
+
+
+def _text(language: str, key: str) -> str:
+    """Текст интерфейса на языке страницы с откатом на английский."""
+    base = language.split("-")[0]
+    for source in (translations.get(base, {}), TEXTS.get(base, {}), translations["en"], TEXTS["en"]):
+        if key in source:
+            return source[key]
+    raise KeyError(key)
+
+
+def _product_by_slug(slug: str) -> Optional[Tuple[int, str, str]]:
+    if slug in PRODUCTS:
+        return PRODUCTS[slug]
+    # неизвестный товар вида some-book_123 — собираем название и цену из slug
+    match = re.fullmatch(r"([a-z0-9-]+)_(\d+)", slug)
+    if not match:
+        return None
+    product_id = int(match.group(2))
+    product = product_id, match.group(1).replace("-", " ").capitalize(), f"{5 + product_id % 20}.99"
+    _generated_products[slug] = product
+    return product
+
+
+def _product_by_id(product_id: int) -> Optional[Tuple[str, Tuple[int, str, str]]]:
+    for slug, product in {**PRODUCTS, **_generated_products}.items():
+        if product[0] == product_id:
+            return slug, product
+    return None
+
+
+class StoreState:
+    """Сессии покупателей: корзина и сообщения для следующей страницы."""
+
+    def __init__(self):
+        self._sessions: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def get(self, session_id: Optional[str]) -> Tuple[str, dict]:
+        with self._lock:
+            if not session_id or session_id not in self._sessions:
+                session_id = secrets.token_hex(16)
+                self._sessions[session_id] = {"basket": [], "messages": []}
+            return session_id, self._sessions[session_id]
+
+
+class StoreHandler(BaseHTTPRequestHandler):
+    """Обработчик запросов витрины."""
+
+    server_version = "LocalStore/1.0"
+
+    def log_message(self, format, *args):
+        # не засоряем вывод тестов логом каждого запроса
+        pass
+
+    # ====== Маршрутизация ======
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def _handle(self, method: str) -> None:
+        store = self.server
+        if store.latency:
+            time.sleep(store.latency)
+        if store.fault_rate and random.random() < store.fault_rate:
+            self._send(503, "<h1>Service Unavailable</h1>")
+            return
+
+        url = urlsplit(self.path)
+        # ссылки вида .../coders-at-work_207//?promo=offer0 сайт тоже открывает
+        language, path = self._split_language(re.sub(r"/{2,}", "/", url.path))
+        self.language = language
+        self.query = parse_qs(url.query)
+        self.cookies = SimpleCookie(self.headers.get("Cookie", ""))
+        session_cookie = self.cookies.get(SESSION_COOKIE)
+        self.session_id, self.session = store.state.get(session_cookie.value if session_cookie else None)
+        self.csrf_token = self.cookies[CSRF_COOKIE].value if CSRF_COOKIE in self.cookies else secrets.token_hex(16)
+
+        routes = [
+            (r"/", self.main_page),
+            (r"/catalogue/", self.catalogue_page),
+            (r"/catalogue/([^/]+)/", self.product_page),
+            (r"/basket/", self.basket_page),
+            (r"/basket/add/(\d+)/", self.add_to_basket),
+            (r"/accounts/login/", self.login_page),
+        ]
+        for pattern, handler in routes:
+            match = re.fullmatch(pattern, path)
+            if match:
+                if handler is self.add_to_basket and method != "POST":
+                    break
+                handler(*match.groups())
+                return
+        self._send(404, self._layout("Not found", "<h1>Not found</h1>"))
+
+    @staticmethod
+    def _split_language(path: str) -> Tuple[str, str]:
+        parts = path.split("/", 2)
+        if len(parts) > 2 and parts[1] in LANGUAGES:
+            return parts[1], "/" + parts[2]
+        if len(parts) > 2 and parts[1] == "en":
+            return "en-gb", "/" + parts[2]
+        return "en-gb", path or "/"
+
+    def _prefix(self) -> str:
+        return f"/{self.language}"
+
+    # ====== Страницы ======
+
+    def main_page(self) -> None:
+        body = (f'<h1>Oscar</h1><p><a href="{self._prefix()}/catalogue/">'
+                f'{_text(self.language, "all_products")}</a></p>')
+        self._send(200, self._layout("Oscar - Sandbox", body))
+
+    def catalogue_page(self) -> None:
+        items = "".join(
+            f'<li><article class="product_pod"><h3><a href="{self._prefix()}/catalogue/{slug}/">'
+            f'{html.escape(name)}</a></h3><p class="price_color">£{price}</p></article></li>'
+            for slug, (_, name, price) in PRODUCTS.items())
+        body = f'<div id="content_inner"><ol class="row">{items}</ol></div>'
+        self._send(200, self._layout(_text(self.language, "all_products"), body))
+
+    def product_page(self, slug: str) -> None:
+        product = _product_by_slug(slug)
+        if product is None:
+            self._send(404, self._layout("Not found", "<h1>Not found</h1>"))
+            return
+        product_id, name, price = product
+        promo = self.query.get("promo", [None])[0]
+        action = f"{self._prefix()}/basket/add/{product_id}/" + (f"?promo={promo}" if promo else "")
+        body = f"""
+<ul class="breadcrumb">
+    <li><a href="{self._prefix()}/">Home</a></li>
+    <li><a href="{self._prefix()}/catalogue/">{_text(self.language, "all_products")}</a></li>
+    <li class="active">{html.escape(name)}</li>
+</ul>
+<div id="content_inner">
+<article class="product_page">
+    <div class="row">
+        <div class="col-sm-6 product_main">
+            <h1>{html.escape(name)}</h1>
+            <p class="price_color">£{price}</p>
+            <form id="add_to_basket_form" action="{action}" method="post" class="add-to-basket">
+                <input type="hidden" name="{CSRF_FIELD}" value="{self.csrf_token}">
+                <input type="hidden" name="quantity" value="1">
+                <button type="submit" class="btn btn-lg btn-primary btn-add-to-basket"
+                        value="{_text(self.language, "add_to_basket")}">{_text(self.language, "add_to_basket")}</button>
+            </form>
+        </div>
+    </div>
+    <table class="table table-striped">
+        <tr><th>UPC</th><td>{product_id:016x}</td></tr>
+        <tr><th>Price (excl. tax)</th><td>£{price}</td></tr>
+        <tr><th>Price (incl. tax)</th><td>£{price}</td></tr>
+        <tr><th>Tax</th><td>£0.00</td></tr>
+    </table>
+</article>
+</div>
+"""
+        if promo:
+            body += QUIZ_SCRIPT
+        self._send(200, self._layout(name, body))
+
+    def basket_page(self) -> None:
+        basket = self.session["basket"]
+        if not basket:
+            body = (f'<div id="content_inner"><p>{_text(self.language, "basket_is_empty")} '
+                    f'<a href="{self._prefix()}/">Continue shopping</a></p></div>')
+        else:
+            rows = "".join(
+                f'<div class="basket-items"><h3>{html.escape(name)}</h3>'
+                f'<p class="price_color">£{price}</p><input name="form-{i}-quantity" value="{quantity}"></div>'
+                for i, (name, price, quantity) in enumerate(basket))
+            body = (f'<div id="content_inner"><form method="post" class="basket_summary" id="basket_formset">'
+                    f'{rows}</form></div>')
+        self._send(200, self._layout("Basket", body))
+
+    def add_to_basket(self, product_id: str) -> None:
+        length = int(self.headers.get("Content-Length", 0))
+        form = parse_qs(self.rfile.read(length).decode("utf-8"))
+        if CSRF_COOKIE not in self.cookies or form.get(CSRF_FIELD, [None])[0] != self.cookies[CSRF_COOKIE].value:
+            self._send(403, "<h1>CSRF verification failed</h1>")
+            return
+        found = _product_by_id(int(product_id))
+        if found is None:
+            self._send(404, "<h1>Not found</h1>")
+            return
+        slug, (_, name, price) = found
+        quantity = int(form.get("quantity", ["1"])[0])
+        self.session["basket"].append((name, price, quantity))
+
+        promo = self.query.get("promo", [None])[0]
+        # воспроизводим известный баг: в одном из promo-предложений название товара искажается
+        message_name = f"{name} book" if promo == BUGGED_PROMO else name
+        total = sum(float(p) * q for _, p, q in self.session["basket"])
+        messages = [f"<strong>{html.escape(message_name)}</strong> {_text(self.language, 'added_to_basket')}"]
+        if promo:
+            messages.append(f"{_text(self.language, 'qualifies')} <strong>Deferred benefit offer</strong> "
+                            f"{_text(self.language, 'offer')}")
+        messages.append(f"<p>{_text(self.language, 'basket_total')}<strong>£{total:.2f}</strong></p>")
+        self.session["messages"] = messages
+
+        location = self.headers.get("Referer") or f"{self._prefix()}/catalogue/{slug}/"
+        self.send_response(302)
+        self.send_header("Location", location)
+        self._send_cookies()
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def login_page(self) -> None:
+        csrf = f'<input type="hidden" name="{CSRF_FIELD}" value="{self.csrf_token}">'
+        body = f"""
+<div id="content_inner"><div class="row">
+    <div class="col-sm-6 login_form">
+        <h2>Log In</h2>
+        <form id="login_form" action="" method="post">{csrf}
+            <input name="login-username" type="email"><input name="login-password" type="password">
+            <button name="login_submit" type="submit" value="Log In">Log In</button>
+        </form>
+    </div>
+    <div class="col-sm-6 register_form">
+        <h2>Register</h2>
+        <form id="register_form" action="" method="post">{csrf}
+            <input name="registration-email" type="email"><input name="registration-password1" type="password">
+            <input name="registration-password2" type="password">
+            <button name="registration_submit" type="submit" value="Register">Register</button>
+        </form>
+    </div>
+</div></div>
+"""
+        self._send(200, self._layout("Login or register", body))
+
+    # ====== Общая разметка и ответ ======
+
+    def _layout(self, title: str, body: str) -> str:
+        messages, self.session["messages"] = self.session["messages"], []
+        messages_html = "".join(
+            f'<div class="alert alert-safe alert-noicon alert-success fade in">'
+            f'<div class="alertinner">{message}</div></div>'
+            for message in messages)
+        total = sum(float(p) * q for _, p, q in self.session["basket"])
+        return f"""<!DOCTYPE html>
+<html lang="{self.language}">
+<head><meta charset="utf-8"><title>{html.escape(title)}</title></head>
+<body>
+<header class="header container-fluid">
+    <div class="page_inner"><div class="row">
+        <div class="basket-mini pull-right hidden-xs">
+            {_text(self.language, "basket_total_label")} £{total:.2f}
+            <span class="btn-group">
+                <a href="{self._prefix()}/basket/" class="btn btn-default">{_text(self.language, "view_basket")}</a>
+            </span>
+        </div>
+    </div></div>
+    <ul class="nav navbar-nav navbar-right">
+        <li><a id="login_link" href="{self._prefix()}/accounts/login/">{_text(self.language, "login")}</a></li>
+    </ul>
+</header>
+<div class="container-fluid page"><div class="page_inner">
+<div id="messages">{messages_html}</div>
+{body}
+</div></div>
+</body>
+</html>"""
+
+    def _send_cookies(self) -> None:
+        if not hasattr(self, "session_id"):
+            # ответ с ошибкой до разбора запроса
+            return
+        self.send_header("Set-Cookie", f"{SESSION_COOKIE}={self.session_id}; Path=/; HttpOnly")
+        self.send_header("Set-Cookie", f"{CSRF_COOKIE}={self.csrf_token}; Path=/")
+
+    def _send(self, status: int, content: str) -> None:
+        data = content.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self._send_cookies()
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class LocalStore(ThreadingHTTPServer):
+    """Многопоточный HTTP-сервер витрины с настраиваемой задержкой и ошибками."""
+
+    daemon_threads = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0, fault_rate: float = 0.0):
+        """
+        :param port: порт; 0 — любой свободный
+        :param latency: задержка перед каждым ответом, секунды
+        :param fault_rate: доля запросов (0..1), на которые отвечаем 503
+        """
+        super().__init__((host, port), StoreHandler)
+        self.latency = latency
+        self.fault_rate = fault_rate
+        self.state = StoreState()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> str:
+        """Запускает сервер в фоновом потоке и возвращает его адрес."""
+        self._thread = threading.Thread(target=self.serve_forever, name="local-store", daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self) -> None:
+        """Останавливает сервер."""
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local stand-in for selenium1py.pythonanywhere.com")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--fault-rate", type=float, default=0.0)
+    args = parser.parse_args()
+    store = LocalStore(args.host, args.port, args.latency, args.fault_rate)
+    print(f"Serving on {store.base_url}")
+    store.serve_forever()
@@ -0,0 +1,323 @@
+import asyncio
+import functools
+import inspect
+import itertools
+import json
+import threading
+from typing import Callable, List, Optional, Tuple, Union
+
+import selenium
+from selenium.common.exceptions import (
+    JavascriptException, NoSuchElementException, TimeoutException, WebDriverException
+)
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from stepik_autotests_final_task.pages.js_scripts import BIDI_CLICK, BIDI_GET_TEXTS, BIDI_WATCH_ELEMENT
+from stepik_autotests_final_task.pages.locators import BasePageLocators, MainPaigeLocators
+
+
+class BidiEvents:
+    """
+    Мост между событиями WebDriver BiDi и asyncio.
+    Selenium вызывает обработчики событий в своих потоках; мост переносит их в цикл событий
+    через call_soon_threadsafe и завершает asyncio.Future, которые ждут страницы.
+    Блокирующие команды BiDi выполняются через asyncio.to_thread, по одной за раз:
+    соединение selenium не рассчитано на одновременные команды из нескольких потоков.
+    """
+
+    # события навигации, на которые подписывается мост (браузер может поддерживать не все)
+    NAVIGATION_EVENTS = ("dom_content_loaded", "load", "fragment_navigated", "history_updated")
+    # сообщения консоли браузера
+    CONSOLE = "console"
+
+    def __init__(self, browser: WebDriver):
+        """
+        :param browser: экземпляр WebDriver, запущенный с enable_bidi (маркер bidi)
+        """
+        self.browser = browser
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._waiters: List[tuple] = []
+        self._handlers: List[Tuple[str, int]] = []
+        self._console_handler: Optional[int] = None
+        self._command_lock = threading.Lock()
+        self._tokens = itertools.count()
+
+    async def __aenter__(self) -> "BidiEvents":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.stop()
+
+    async def start(self) -> None:
+        """Подписывается на события навигации и консоли."""
+        self.loop = asyncio.get_running_loop()
+        for event in self.NAVIGATION_EVENTS:
+            try:
+                callback_id = await self.call(self.browser.browsing_context.add_event_handler, event,
+                                              functools.partial(self._on_event, event))
+            except WebDriverException:
+                continue
+            self._handlers.append((event, callback_id))
+        self._console_handler = await self.call(self.browser.script.add_console_message_handler,
+                                                functools.partial(self._on_event, self.CONSOLE))
+
+    async def stop(self) -> None:
+        """Отписывается от событий и отменяет незавершённые ожидания."""
+        for event, callback_id in self._handlers:
+            await self.call(self.browser.browsing_context.remove_event_handler, event, callback_id)
+        self._handlers = []
+        if self._console_handler is not None:
+            await self.call(self.browser.script.remove_console_message_handler, self._console_handler)
+            self._console_handler = None
+        for _, _, future in self._waiters:
+            future.cancel()
+        self._waiters = []
+
+    async def call(self, func: Callable, *args, **kwargs):
+        """Выполняет блокирующую команду selenium в отдельном потоке."""
+        return await asyncio.to_thread(self._call_locked, func, args, kwargs)
+
+    def _call_locked(self, func: Callable, args: tuple, kwargs: dict):
+        with self._command_lock:
+            return func(*args, **kwargs)
+
+    def expect(self, kinds: Tuple[str, ...], predicate: Optional[Callable] = None) -> asyncio.Future:
+        """
+        Создаёт Future, который завершится первым подходящим событием.
+        Future нужно создать до действия, которое вызывает событие, иначе событие можно пропустить.
+        :param kinds: имена событий (NAVIGATION_EVENTS, CONSOLE)
+        :param predicate: фильтр по параметрам события
+        :return: Future с результатом (имя события, параметры)
+        """
+        future = self.loop.create_future()
+        self._waiters.append((kinds, predicate, future))
+        return future
+
+    async def wait(self, future: asyncio.Future, timeout: float, what: str):
+        """
+        Дожидается Future из expect().
+        :raises TimeoutException: если событие не пришло за timeout секунд
+        """
+        try:
+            return await asyncio.wait_for(future, max(timeout, 0))
+        except asyncio.TimeoutError:
+            raise TimeoutException(f"Timed out waiting for {what}") from None
+
+    def token(self) -> str:
+        """Уникальная метка для сообщений страниц в консоль."""
+        return str(next(self._tokens))
+
+    async def new_tab(self) -> str:
+        """Открывает вкладку и возвращает её browsing context."""
+        return await self.call(self.browser.browsing_context.create, "tab")
+
+    def _on_event(self, kind: str, params) -> None:
+        # вызывается в потоке selenium
+        try:
+            self.loop.call_soon_threadsafe(self._dispatch, kind, params)
+        except RuntimeError:
+            pass  # цикл событий уже закрыт
+
+    def _dispatch(self, kind: str, params) -> None:
+        for waiter in list(self._waiters):
+            kinds, predicate, future = waiter
+            if future.done():
+                self._waiters.remove(waiter)
+            elif kind in kinds and (predicate is None or predicate(params)):
+                future.set_result((kind, params))
+                self._waiters.remove(waiter)
+
+
+def _local_value(value) -> dict:
+    """Аргумент script.callFunction в формате LocalValue."""
+    if value is None:
+        return {"type": "null"}
+    if isinstance(value, bool):
+        return {"type": "boolean", "value": value}
+    if isinstance(value, (int, float)):
+        return {"type": "number", "value": value}
+    return {"type": "string", "value": str(value)}
+
+
+# версия selenium, с которой проверен вызов script.callFunction (см. call_function_in_context)
+TESTED_SELENIUM_VERSION = "4.34"
+
+# параметры Script._call_function, которые использует call_function_in_context
+_CALL_FUNCTION_PARAMETERS = ("function_declaration", "await_promise", "target", "arguments", "user_activation")
+
+
+def call_function_in_context(browser: WebDriver, declaration: str, context: str, arguments: List[dict],
+                             user_activation: bool = False):
+    """
+    script.callFunction в заданной вкладке.
+    Публичный Script.execute из selenium работает только в текущем окне, а команды с явным context
+    selenium даёт только через приватный Script._call_function. Он может измениться в любом выпуске,
+    поэтому его сигнатура проверяется здесь, в единственном месте, где он вызывается.
+    :return: EvaluateResult selenium
+    :raises WebDriverException: если в установленной версии selenium нет подходящего _call_function
+    """
+    call_function = getattr(browser.script, "_call_function", None)
+    parameters = inspect.signature(call_function).parameters if call_function is not None else {}
+    if not all(name in parameters for name in _CALL_FUNCTION_PARAMETERS):
+        raise WebDriverException(
+            f"AsyncBasePage needs Script._call_function({', '.join(_CALL_FUNCTION_PARAMETERS)}) "
+            f"as in selenium {TESTED_SELENIUM_VERSION}, installed selenium {selenium.__version__} does not have it")
+    return call_function(function_declaration=declaration, await_promise=False, target={"context": context},
+                         arguments=arguments, user_activation=user_activation)
+
+
+class AsyncBasePage:
+    """
+    Асинхронный вариант BasePage на WebDriver BiDi.
+    Вместо опроса current_url и DOM страница ждёт событий браузера: навигации, а появление
+    элементов узнаёт от MutationObserver через сообщение в консоль.
+    Каждая страница работает в своём browsing context, поэтому несколько страниц
+    можно ждать одновременно через asyncio.gather.
+    """
+
+    READY_LOCATORS: Tuple[Tuple[By, str], ...] = ()
+
+    def __init__(self, browser: WebDriver, url: str, events: BidiEvents, context: Optional[str] = None,
+                 timeout: float = 10):
+        """
+        :param browser: экземпляр WebDriver с включённым BiDi
+        :param url: адрес страницы
+        :param events: запущенный BidiEvents
+        :param context: browsing context (вкладка); по умолчанию — текущее окно
+        :param timeout: время ожидания событий
+        """
+        self.browser = browser
+        self.url = url
+        self.events = events
+        self.context = context or browser.current_window_handle
+        self.timeout = timeout
+
+    @classmethod
+    async def in_new_tab(cls, browser: WebDriver, url: str, events: BidiEvents, timeout: float = 10):
+        """Создаёт страницу в новой вкладке."""
+        return cls(browser, url, events, await events.new_tab(), timeout)
+
+    def _in_context(self, params) -> bool:
+        return getattr(params, "context", None) == self.context
+
+    async def _call_function(self, declaration: str, *args, user_activation: bool = False):
+        """
+        Выполняет функцию в документе своей вкладки.
+        Script.execute из selenium работает только в текущем окне, поэтому используется script.callFunction
+        с явным context (call_function_in_context).
+        """
+        result = await self.events.call(
+            call_function_in_context, self.browser, declaration, self.context,
+            [_local_value(arg) for arg in args], user_activation=user_activation)
+        if result.type != "success":
+            details = result.exception_details or {}
+            raise JavascriptException(f"Script failed in {self.url}: {details.get('text', details)}")
+        return (result.result or {}).get("value")
+
+    # ====== Навигация ======
+
+    async def open(self) -> None:
+        """Открывает страницу и ждёт DOMContentLoaded и элементов из READY_LOCATORS."""
+        loaded = self.events.expect(("dom_content_loaded",), self._in_context)
+        await self.events.call(self.browser.browsing_context.navigate, self.context, self.url, "none")
+        await self.events.wait(loaded, self.timeout, f"{self.url} to load")
+        await asyncio.gather(*(self.wait_for_element(locator) for locator in self.READY_LOCATORS))
+
+    async def current_url(self) -> str:
+        tree = await self.events.call(self.browser.browsing_context.get_tree, max_depth=0, root=self.context)
+        return tree[0].url
+
+    async def wait_for_url(self, expected: Union[str, Callable[[str], bool]],
+                           timeout: Optional[float] = None) -> str:
+        """
+        Ждёт, пока адрес вкладки не станет подходящим. Адрес перепроверяется только после событий навигации.
+        :param expected: подстрока адреса или функция от адреса
+        :return: адрес вкладки
+        :raises TimeoutException: если адрес не стал подходящим
+        """
+        matches = expected if callable(expected) else (lambda url: expected in url)
+        deadline = self.events.loop.time() + (self.timeout if timeout is None else timeout)
+        while True:
+            navigated = self.events.expect(BidiEvents.NAVIGATION_EVENTS, self._in_context)
+            url = await self.current_url()
+            if matches(url):
+                navigated.cancel()
+                return url
+            try:
+                await self.events.wait(navigated, deadline - self.events.loop.time(), f"url matching {expected}")
+            except TimeoutException:
+                url = await self.current_url()
+                if matches(url):
+                    return url
+                raise TimeoutException(f"Url {url} does not match {expected}") from None
+
+    # ====== Элементы ======
+
+    async def wait_for_element(self, locator: Tuple[By, str], timeout: Optional[float] = None) -> None:
+        """
+        Ждёт появления элемента: MutationObserver на странице сообщает о нём в консоль.
+        Если документ сменился, наблюдатель ставится заново.
+        :raises TimeoutException: если элемент не появился
+        """
+        how, what = locator
+        deadline = self.events.loop.time() + (self.timeout if timeout is None else timeout)
+        while True:
+            token = self.events.token()
+            changed = self.events.expect(
+                (BidiEvents.CONSOLE, "dom_content_loaded"),
+                lambda params, marker=f"stepik:dom:{token}": (getattr(params, "text", None) == marker
+                                                             or self._in_context(params)))
+            try:
+                remaining_ms = max(0, int((deadline - self.events.loop.time()) * 1000))
+                present = await self._call_function(BIDI_WATCH_ELEMENT, how, what, token, remaining_ms)
+            except WebDriverException:
+                # документ выгружается — дождёмся нового
+                present = False
+            if present:
+                changed.cancel()
+                return
+            kind, _ = await self.events.wait(changed, deadline - self.events.loop.time(), f"element {locator}")
+            if kind == BidiEvents.CONSOLE:
+                return
+
+    async def get_texts(self, locator: Tuple[By, str]) -> List[str]:
+        """Тексты всех элементов по локатору (без ожидания)."""
+        return json.loads(await self._call_function(BIDI_GET_TEXTS, *locator) or "[]")
+
+    async def get_text(self, locator: Tuple[By, str]) -> str:
+        """Текст первого элемента по локатору."""
+        await self.wait_for_element(locator)
+        texts = await self.get_texts(locator)
+        if not texts:
+            raise NoSuchElementException(f"Element {locator} not found in {self.url}")
+        return texts[0]
+
+    async def is_element_present(self, how: By, what: str) -> bool:
+        return bool(await self.get_texts((how, what)))
+
+    async def click(self, locator: Tuple[By, str]) -> None:
+        """Дожидается элемента и кликает по нему."""
+        await self.wait_for_element(locator)
+        if not await self._call_function(BIDI_CLICK, *locator, user_activation=True):
+            raise NoSuchElementException(f"Element {locator} not found in {self.url}")
+
+    def expect_console(self, predicate: Callable[[str], bool]) -> asyncio.Future:
+        """Future, который завершится первым сообщением консоли, подходящим под predicate(text)."""
+        return self.events.expect((BidiEvents.CONSOLE,), lambda entry: predicate(entry.text))
+
+    # ====== Общие сценарии страниц ======
+
+    async def should_be_login_link(self) -> None:
+        assert await self.is_element_present(*BasePageLocators.LOGIN_LINK), "Login link is not presented"
+
+    async def go_to_login_page(self) -> None:
+        """Переходит на страницу логина и ждёт смены адреса."""
+        await self.click(BasePageLocators.LOGIN_LINK)
+        await self.wait_for_url("login")
+
+    async def go_to_basket_from_header(self) -> None:
+        """Переходит в корзину по ссылке в шапке сайта и ждёт смены адреса."""
+        await self.click(MainPaigeLocators.BASKET_LINK_IN_HEADER)
+        await self.wait_for_url(lambda url: url.endswith("/basket/"))
@@ -1,31 +1,79 @@
-import math
 import time
-from typing import List, Tuple, Optional, Union
-from selenium.common.exceptions import NoSuchElementException, NoAlertPresentException, TimeoutException
+from typing import List, Tuple, Optional, Sequence, Union
+from selenium.common.exceptions import (
+    NoSuchElementException, NoAlertPresentException, TimeoutException, JavascriptException, WebDriverException
+)
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webdriver import WebDriver
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-
+from selenium.webdriver.support.event_firing_webdriver import EventFiringWebDriver
+
+from stepik_autotests_final_task.artifacts import artifacts
+from stepik_autotests_final_task.lazy_browser import LazyBrowser
+from stepik_autotests_final_task.pages.dialog_handler import (
+    BIDI_QUIZ_TIMEOUT, CLASSIC_QUIZ_TIMEOUT, QuizDialogHandler, quiz_answer, solve_quiz_classic
+)
+from stepik_autotests_final_task.pages.dom_snapshot import DomSnapshot, SnapshotInvalidator
+from stepik_autotests_final_task.pages.dom_wait import DomWait
+from stepik_autotests_final_task.pages.js_scripts import (
+    WAIT_FOR_TEXT_ABSENT, GET_TEXTS_BATCH, WAIT_FOR_PAGE_SETTLED, CAPTURE_SNAPSHOT
+)
 from stepik_autotests_final_task.pages.locators import BasePageLocators, LoginPageLocators
+from stepik_autotests_final_task.timing_history import timed
 from ..decorators import Decorators
 
+# локатор или (вложенный) список локаторов, как в ProductPageLocators.list_of_product_titles
+LocatorTree = List[Union[Tuple[By, str], List[Tuple[By, str]]]]
 
 
 
 class BasePage:
     """Базовый класс страницы. Содержит общие методы для всех страниц."""
 
-    def __init__(self, browser: WebDriver, url: str, timeout: int = 10, implicitly_wait_on: bool = True, poll_frequency=1):
+    # элементы, появление которых означает, что страницей можно пользоваться
+    # (при стратегиях загрузки eager и none open() ждёт только их)
+    READY_LOCATORS: Tuple[Tuple[By, str], ...] = ()
+
+    # если True, read-only проверки отвечают по снимку DOM (включается опцией --snapshot_cache)
+    snapshot_cache = False
+
+    # быстрые негативные проверки: сначала ждём, пока страница "успокоится",
+    # затем проверяем отсутствие элемента с коротким таймаутом (включается опцией --fast_negative)
+    fast_negative_checks = False
+    negative_check_timeout = 1.0
+    # сколько страница должна быть без изменений DOM и сети и сколько максимум этого ждать
+    settle_quiet_period = 0.25
+    settle_timeout = 5.0
+
+    # сколько негативных проверок было за сессию и сколько секунд они заняли
+    negative_check_stats = {"count": 0, "seconds": 0.0}
+
+    def __init__(self, browser: WebDriver, url: str, timeout: int = 10, implicitly_wait_on: bool = True, poll_frequency=1,
+                 snapshot_cache: Optional[bool] = None):
         """
         :param browser: экземпляр WebDriver
         :param url: адрес страницы
         :param timeout: время ожидания элементов
         :param implicitly_wait_on: если True, устанавливает неявное ожидание timeout для браузера
+        :param poll_frequency: частота опроса, если ожидание изменений DOM недоступно
+        :param snapshot_cache: включает кэш снимка DOM; по умолчанию — значение атрибута класса
         """
+        if snapshot_cache is not None:
+            self.snapshot_cache = snapshot_cache
+        self._snapshot: Optional[DomSnapshot] = None
+        self.snapshot_hits = 0
+        self.snapshot_misses = 0
+        self.snapshot_captures = 0
+        if self.snapshot_cache and isinstance(browser, LazyBrowser):
+            # EventFiringWebDriver принимает только настоящий WebDriver
+            browser = browser.wrapped_driver
+        if self.snapshot_cache and isinstance(browser, WebDriver):
+            # клики и навигация через обёртку сбрасывают снимок автоматически
+            browser = EventFiringWebDriver(browser, SnapshotInvalidator(self))
+
         self.browser = browser
         self.url = url
-        self.wait = WebDriverWait(browser, timeout=timeout, poll_frequency=poll_frequency)
+        self.wait = DomWait(browser, timeout=timeout, poll_frequency=poll_frequency)
         if implicitly_wait_on:
             self.browser.implicitly_wait(timeout)
 
@@ -43,22 +91,128 @@ class BasePage:
             print(f"Ошибка при переходе на страницу логина: {e}")
 
 
+    @timed("navigation")
     def open(self) -> None:
-        """Открывает страницу."""
+        """
+        Открывает страницу.
+        При стратегиях загрузки eager и none возвращается, как только на новой странице
+        появились элементы из READY_LOCATORS, не дожидаясь загрузки остальных ресурсов.
+        """
+        waits_for_ready = self.page_load_strategy() != "normal"
+        if waits_for_ready:
+            self._mark_current_document()
         self.browser.get(self.url)
+        self.invalidate_snapshot()
+        if waits_for_ready:
+            self.wait_until_ready()
+
+
+    def page_load_strategy(self) -> str:
+        """Стратегия загрузки страниц браузера: normal, eager или none."""
+        capabilities = getattr(self.browser, "capabilities", None) or {}
+        return capabilities.get("pageLoadStrategy", "normal")
+
+
+    def _mark_current_document(self) -> None:
+        """Помечает текущий документ, чтобы не принять его за уже открытую новую страницу."""
+        try:
+            self.browser.execute_script("window.__stepikPreviousDocument = true;")
+        except WebDriverException:
+            pass
+
 
+    def start_navigation(self) -> None:
+        """
+        Начинает загрузку страницы и сразу возвращается, не дожидаясь её.
+        Готовность затем проверяется через is_ready().
+        """
+        self._mark_current_document()
+        self.browser.execute_script("window.location.href = arguments[0];", self.url)
+        self.invalidate_snapshot()
+
+
+    def is_ready(self) -> bool:
+        """
+        Проверяет без ожидания, что загрузился новый документ и на нём есть все элементы из READY_LOCATORS.
+        Если READY_LOCATORS пуст, достаточно, чтобы документ был разобран (readyState != loading).
+        """
+        try:
+            state = self.browser.execute_script(
+                "return window.__stepikPreviousDocument ? 'previous' : document.readyState;")
+        except WebDriverException:
+            # документ сменился во время вызова
+            return False
+        if state in ("previous", "loading"):
+            return False
+        return all(self.browser.find_elements(*locator) for locator in self.READY_LOCATORS)
 
-    def take_screenshot(self, name: str) -> str:
+
+    def wait_until_ready(self, timeout: Optional[float] = None) -> bool:
         """
-        Делает скриншот страницы.
-        :param name: имя файла скриншота
-        :return: путь к сохраненному файлу
+        Ждёт, пока страница не станет готовой (см. is_ready).
+        :return: True если страница готова; при таймауте выводит предупреждение и возвращает False,
+                 чтобы упала уже конкретная проверка страницы
         """
-        filename = f"{name}.png"
-        self.browser.save_screenshot(filename)
-        return filename
+        try:
+            self._dom_wait(timeout).until(lambda driver: self.is_ready())
+            return True
+        except TimeoutException:
+            print(f"⚠️  Страница {self.url} не готова: не найдены {self.READY_LOCATORS}")
+            return False
 
+    # ====== Снимок DOM для read-only проверок ======
 
+    def capture_snapshot(self) -> None:
+        """Сохраняет снимок DOM текущей страницы с отметками отрисовки (без JavaScript — по page_source)."""
+        try:
+            html = self.browser.execute_script(CAPTURE_SNAPSHOT)
+        except JavascriptException:
+            html = self.browser.page_source
+        self._snapshot = DomSnapshot(html)
+        self.snapshot_captures += 1
+
+
+    def invalidate_snapshot(self) -> None:
+        """Сбрасывает снимок DOM: следующая проверка снимет новый."""
+        self._snapshot = None
+
+
+    def _snapshot_texts(self, how: By, what: str) -> Optional[List[str]]:
+        """
+        Возвращает тексты элементов из снимка DOM.
+        :return: None, если кэш выключен, элементы не найдены или локатор не поддерживается —
+                 тогда нужно обращаться к браузеру
+        """
+        if not self.snapshot_cache:
+            return None
+        if self._snapshot is None:
+            self.capture_snapshot()
+        try:
+            texts = self._snapshot.get_texts(how, what)
+        except ValueError:
+            texts = []
+        if texts:
+            self.snapshot_hits += 1
+            return texts
+        self.snapshot_misses += 1
+        return None
+
+
+    def take_screenshot(self, name: str, locator: Optional[Tuple[By, str]] = None) -> Optional[str]:
+        """
+        Ставит в очередь скриншот, HTML страницы и лог консоли (запись идёт в фоне, см. artifacts).
+        :param name: имя артефакта
+        :param locator: если указан, скриншот обрезается по первому найденному элементу
+        :return: путь к описанию артефакта или None, если очередь переполнена
+        """
+        element = None
+        if locator is not None:
+            elements = self.browser.find_elements(*locator)
+            element = elements[0] if elements else None
+        return artifacts.capture(self.browser, name, element)
+
+
+    @timed("assertion")
     def is_element_present(self, how: By, what: str) -> bool:
         """
         Проверяет наличие элемента на странице.
@@ -66,6 +220,8 @@ class BasePage:
         :param what: значение локатора
         :return: True если элемент найден, иначе False
         """
+        if self._snapshot_texts(how, what) is not None:
+            return True
         try:
             self.browser.find_element(how, what)
             return True
@@ -73,20 +229,70 @@ class BasePage:
             return False
 
 
-    def is_not_element_present(self, how, what):
+    @timed("assertion")
+    def is_not_element_present(self, how, what, fast: Optional[bool] = None, timeout: Optional[float] = None):
         """ Проверяет, что элемент не присутствует на странице.
         :param how: способ поиска (By.ID, By.CSS_SELECTOR и т.д.)
         :param what: значение локатора
+        :param fast: быстрый режим; по умолчанию — атрибут fast_negative_checks
+        :param timeout: таймаут быстрой проверки; по умолчанию — negative_check_timeout
         :return: True если элемент не найден, иначе False
         """
+        if fast is None:
+            fast = self.fast_negative_checks
+        start = time.monotonic()
         try:
-            self.wait.until(EC.presence_of_element_located((how, what)))
+            if fast:
+                return self._is_not_element_present_fast(how, what, timeout)
+            try:
+                self.wait.until(EC.presence_of_element_located((how, what)))
+            except TimeoutException:
+                return True
+
+            return False
+        finally:
+            BasePage.negative_check_stats["count"] += 1
+            BasePage.negative_check_stats["seconds"] += time.monotonic() - start
+
+
+    def _is_not_element_present_fast(self, how, what, timeout: Optional[float] = None) -> bool:
+        """Дожидается, пока страница успокоится, и проверяет отсутствие элемента без неявного ожидания."""
+        if timeout is None:
+            timeout = self.negative_check_timeout
+        self.wait_for_page_settled()
+
+        old_implicit_wait = self.browser.timeouts.implicit_wait
+        self.browser.implicitly_wait(0)
+        try:
+            DomWait(self.browser, timeout=timeout, poll_frequency=self.wait._poll).until(
+                EC.presence_of_element_located((how, what)))
         except TimeoutException:
             return True
+        finally:
+            self.browser.implicitly_wait(old_implicit_wait)
 
         return False
 
 
+    @timed("wait")
+    def wait_for_page_settled(self) -> bool:
+        """
+        Ждёт загрузки документа и паузы в изменениях DOM и сетевых запросах.
+        :return: True если страница успокоилась до settle_timeout
+        """
+        old_script_timeout = self.browser.timeouts.script
+        self.browser.set_script_timeout(self.settle_timeout + 5)
+        try:
+            result = self.browser.execute_async_script(
+                WAIT_FOR_PAGE_SETTLED, int(self.settle_quiet_period * 1000), int(self.settle_timeout * 1000))
+            return result["settled"]
+        except JavascriptException:
+            return False
+        finally:
+            self.browser.set_script_timeout(old_script_timeout)
+
+
+    @timed("assertion")
     def is_element_disappeared(self, how, what):
         """ Проверяет, что элемент исчез с страницы.
         :param how: способ поиска (By.ID, By.CSS_SELECTOR и т.д.)
@@ -102,14 +308,101 @@ class BasePage:
         return True
 
 
+    # ====== Ожидания на изменениях DOM ======
+
+    def _dom_wait(self, timeout: Optional[float] = None) -> DomWait:
+        """Возвращает ожидание страницы или новое — с другим таймаутом."""
+        if timeout is None:
+            return self.wait
+        return DomWait(self.browser, timeout=timeout, poll_frequency=self.wait._poll)
+
+
+    def wait_for_presence(self, locator: Tuple[By, str], timeout: Optional[float] = None):
+        """
+        Ждёт появления элемента в DOM.
+        :param locator: локатор элемента
+        :param timeout: таймаут, по умолчанию — таймаут страницы
+        :return: найденный элемент
+        """
+        return self._dom_wait(timeout).until(EC.presence_of_element_located(locator))
+
+
+    def wait_for_visibility(self, locator: Tuple[By, str], timeout: Optional[float] = None):
+        """
+        Ждёт, пока элемент станет видимым.
+        :return: найденный элемент
+        """
+        return self._dom_wait(timeout).until(EC.visibility_of_element_located(locator))
+
+
+    def wait_for_absence(self, locator: Tuple[By, str], timeout: Optional[float] = None) -> bool:
+        """
+        Ждёт, пока элемента не станет в DOM.
+        :return: True, если элемент исчез до таймаута
+        """
+        return self._dom_wait(timeout).until_not(EC.presence_of_element_located(locator))
+
+
+    def wait_for_text_change(self, locator: Tuple[By, str], old_text: Optional[str] = None,
+                             timeout: Optional[float] = None) -> str:
+        """
+        Ждёт, пока текст элемента станет отличаться от old_text.
+        :param old_text: исходный текст; если не передан, берётся текущий текст элемента
+        :return: новый текст элемента
+        """
+        if old_text is None:
+            old_text = self._get_element_text(locator)
+
+        def text_changed(driver):
+            text = driver.find_element(*locator).text.strip()
+            return text if text != old_text else False
+
+        return self._dom_wait(timeout).until(text_changed)
+
+
+    @timed("wait")
+    def wait_until_text_absent(self, locator: Tuple[By, str], text: str,
+                               timeout: Optional[float] = None) -> Optional[float]:
+        """
+        Ждёт, пока ни один элемент по локатору не будет содержать текст.
+        Ожидание целиком выполняется в браузере одним асинхронным скриптом.
+        :param locator: локатор элементов
+        :param text: текст, который должен исчезнуть
+        :param timeout: таймаут, по умолчанию — таймаут страницы
+        :return: сколько секунд заняло исчезновение текста, или None, если текст не исчез
+        """
+        if timeout is None:
+            timeout = self.wait._timeout
+
+        old_script_timeout = self.browser.timeouts.script
+        # запас, чтобы WebDriver не прервал скрипт раньше его собственного дедлайна
+        self.browser.set_script_timeout(timeout + 5)
+        try:
+            result = self.browser.execute_async_script(
+                WAIT_FOR_TEXT_ABSENT, locator[0], locator[1], text, int(timeout * 1000))
+            return result["elapsed_ms"] / 1000 if result["absent"] else None
+        except JavascriptException:
+            # скрипты заблокированы — проверяем тексты элементов опросом
+            start = time.monotonic()
+            try:
+                self._dom_wait(timeout).until(
+                    lambda driver: all(text not in t for t in self._get_elements_texts(locator)))
+            except TimeoutException:
+                return None
+            return time.monotonic() - start
+        finally:
+            self.browser.set_script_timeout(old_script_timeout)
+
+
     def solve_quiz_and_get_code(self) -> None:
         """
         Решает математический квиз из alert и принимает результат.
         Если есть второй alert, выводит код.
         """
+        # ответ на квиз меняет состояние страницы
+        self.invalidate_snapshot()
         alert = self.browser.switch_to.alert
-        x = alert.text.split(" ")[2]
-        answer = str(math.log(abs(12 * math.sin(float(x)))))
+        answer = quiz_answer(alert.text)
         alert.send_keys(answer)
         alert.accept()
         try:
@@ -119,6 +412,26 @@ class BasePage:
             alert.accept()
         except NoAlertPresentException:
             print("No second alert presented")
+        self.invalidate_snapshot()
+
+
+    def solve_quiz_if_present(self, timeout: Optional[float] = None) -> Optional[str]:
+        """
+        Дожидается "квиз решён или квиза нет" не дольше timeout, без исключений, если квиза нет.
+        В браузере с BiDi квиз уже решает QuizDialogHandler по событиям диалогов, здесь только ждём итог;
+        иначе alert ждётся коротким явным ожиданием.
+        Если квиза нет, метод ждёт весь timeout, поэтому на страницах без промо его лучше не вызывать.
+        :param timeout: сколько ждать квиза; по умолчанию BIDI_QUIZ_TIMEOUT или CLASSIC_QUIZ_TIMEOUT
+        :return: код из второго alert или None
+        """
+        self.invalidate_snapshot()
+        handler = QuizDialogHandler.attached(self.browser)
+        if handler is not None:
+            code = handler.wait(BIDI_QUIZ_TIMEOUT if timeout is None else timeout)
+        else:
+            code = solve_quiz_classic(self.browser, CLASSIC_QUIZ_TIMEOUT if timeout is None else timeout)
+        self.invalidate_snapshot()
+        return code
 
     # ====== Методы для работы с текстом элементов ======
 
@@ -133,16 +446,98 @@ class BasePage:
         return [el.text.strip() for el in self.browser.find_elements(*locator)]
 
 
+    @timed("assertion")
     def get_text_from_element(self, locator: Tuple[By, str]) -> str:
-        """Публичная версия для получения текста одного элемента."""
+        """Публичная версия для получения текста одного элемента (с учётом снимка DOM)."""
+        texts = self._snapshot_texts(*locator)
+        if texts is not None:
+            return texts[0]
         return self._get_element_text(locator)
 
 
+    @timed("assertion")
     def get_texts_from_elements(self, locator: Tuple[By, str]) -> List[str]:
-        """Публичная версия для получения текста всех элементов."""
+        """Публичная версия для получения текста всех элементов (с учётом снимка DOM)."""
+        texts = self._snapshot_texts(*locator)
+        if texts is not None:
+            return texts
         return self._get_elements_texts(locator)
 
 
+    @timed("assertion")
+    def get_texts_batch(self, locators: LocatorTree, required: Sequence[Tuple[By, str]] = (),
+                        wait_for_any: bool = False) -> list:
+        """
+        Возвращает тексты элементов для всех локаторов (CSS, XPath и др.) за один вызов execute_script.
+        Ненайденный локатор даёт пустой список сразу, без неявного ожидания.
+        :param locators: список локаторов и вложенных списков локаторов
+        :param required: локаторы, элементы которых должны быть на странице: если их нет,
+                         они ждутся явно (до timeout страницы) и запрашиваются ещё раз
+        :param wait_for_any: если ни один локатор ничего не нашёл, явно ждать (до timeout страницы),
+                             пока найдётся хотя бы один элемент — страница может ещё отрисовываться
+        :return: список той же формы: для каждого локатора — список текстов найденных элементов
+        """
+        flat: List[Tuple[By, str]] = []
+        self._flatten_locators(locators, flat)
+        texts = self._query_texts(flat)
+
+        if wait_for_any and not any(texts):
+            try:
+                texts = self.wait.until(lambda driver: self._query_texts_if_found(flat))
+            except TimeoutException:
+                pass
+
+        missing = [index for index, locator in enumerate(flat) if not texts[index] and locator in required]
+        if missing:
+            for index in missing:
+                try:
+                    self.wait.until(EC.presence_of_element_located(flat[index]))
+                except TimeoutException:
+                    pass
+            for index, found in zip(missing, self._query_texts([flat[index] for index in missing])):
+                texts[index] = found
+        return self._unflatten_texts(locators, iter(texts))
+
+
+    def _query_texts_if_found(self, flat: List[Tuple[By, str]]) -> Optional[List[List[str]]]:
+        """Тексты по списку локаторов или None, если ни один локатор ничего не нашёл (условие ожидания)."""
+        texts = self._query_texts(flat)
+        return texts if any(texts) else None
+
+
+    def _query_texts(self, flat: List[Tuple[By, str]]) -> List[List[str]]:
+        """Тексты элементов по списку локаторов одним вызовом execute_script."""
+        try:
+            return self.browser.execute_script(GET_TEXTS_BATCH, [list(locator) for locator in flat])
+        except JavascriptException:
+            return [self._get_elements_texts(locator) for locator in flat]
+
+
+    def _flat_texts(self, locators: LocatorTree) -> List[str]:
+        """
+        Тексты всех элементов по всем локаторам одним списком.
+        Ждёт, пока найдётся хотя бы один элемент; пустой список — только если за timeout ничего не нашлось.
+        """
+        flat_texts: List[str] = []
+        self._flatten_locators(self.get_texts_batch(locators, wait_for_any=True), flat_texts)
+        return flat_texts
+
+
+    @staticmethod
+    def _flatten_locators(tree: list, result: list) -> None:
+        for node in tree:
+            if isinstance(node, list):
+                BasePage._flatten_locators(node, result)
+            else:
+                result.append(node)
+
+
+    @staticmethod
+    def _unflatten_texts(tree: list, texts) -> list:
+        return [BasePage._unflatten_texts(node, texts) if isinstance(node, list) else next(texts)
+                for node in tree]
+
+
     @staticmethod
     def wait_certain_seconds_before_action(seconds: int = 10) -> None:
         """Ожидает указанное количество секунд перед выполнением действия."""
@@ -150,45 +545,48 @@ class BasePage:
 
     # ====== Методы проверки ======
 
+    @timed("assertion")
     def assert_exact_match(self, locator_a: Tuple[By, str], locator_b: Tuple[By, str]) -> None:
         """Проверяет, что текст элемента A равен тексту элемента B."""
-        text_a = self._get_element_text(locator_a)
-        text_b = self._get_element_text(locator_b)
+        texts_a, texts_b = self.get_texts_batch([locator_a, locator_b], required=[locator_a, locator_b])
+        if not texts_a or not texts_b:
+            raise NoSuchElementException(f"Не найден элемент {locator_a if not texts_a else locator_b}")
+        text_a, text_b = texts_a[0], texts_b[0]
         assert text_a == text_b, f"'{text_a}' != '{text_b}'"
 
 
 
-    def assert_texts_equal(self, locators: List[Union[Tuple[By, str], List[Tuple[By, str]]]]) -> None:
+    @timed("assertion")
+    def assert_texts_equal(self, locators: LocatorTree) -> None:
         """Проверяет, что все элементы из списка имеют одинаковый текст."""
-        texts = []
-        for locator in locators:
-            if isinstance(locator, tuple):
-                texts.extend(self._get_elements_texts(locator))
-            elif isinstance(locator, list):
-                for sublocator in locator:
-                    texts.extend(self._get_elements_texts(sublocator))
+        texts = self._flat_texts(locators)
+        if not texts:
+            raise NoSuchElementException(f"Не найден ни один элемент {locators}")
         assert len(set(texts)) == 1, f"Тексты не совпадают: {texts}"
 
 
-    def assert_contains_any(self, source_locator: Tuple[By, str], target_locators: List[Union[Tuple[By, str], List[Tuple[By, str]]]]) -> None:
+    @timed("assertion")
+    def assert_contains_any(self, source_locator: Tuple[By, str], target_locators: LocatorTree) -> None:
         """
         Проверяет, что хотя бы один из элементов из target_locators содержится в тексте source_locator.
         """
-        source_text = self._get_element_text(source_locator)
-        for locator in target_locators:
-            if isinstance(locator, tuple):
-                if any(text in source_text for text in self._get_elements_texts(locator)):
-                    return
-            elif isinstance(locator, list):
-                for sublocator in locator:
-                    if any(text in source_text for text in self._get_elements_texts(sublocator)):
-                        return
+        source_texts, *target_texts = self.get_texts_batch([source_locator, *target_locators],
+                                                           required=[source_locator])
+        if not source_texts:
+            raise NoSuchElementException(f"Не найден элемент {source_locator}")
+        source_text = source_texts[0]
+
+        flat_target_texts: List[str] = []
+        self._flatten_locators(target_texts, flat_target_texts)
+        if any(text in source_text for text in flat_target_texts):
+            return
         raise AssertionError(f"Ни один элемент {target_locators} не найден в тексте '{source_text}'")
 
 
+    @timed("assertion")
     def check_same_value_in_different_sections(
         self,
-        list_of_elements: List[Union[Tuple[By, str], List[Tuple[By, str]]]],
+        list_of_elements: LocatorTree,
         expected_value: Optional[str] = None,
         flexible: bool = False
     ) -> Tuple[bool, str]:
@@ -199,16 +597,7 @@ class BasePage:
         :param flexible: если True — сравнение числовых значений после конвертации
         :return: (True, "") если все совпадает, иначе (False, сообщение об ошибке)
         """
-        found_values: List[str] = []
-
-        for element in list_of_elements:
-            if isinstance(element, list):
-                for sub_element in element:
-                    elems = self.browser.find_elements(*sub_element)
-                    found_values.extend([el.text.strip() for el in elems])
-            else:
-                elems = self.browser.find_elements(*element)
-                found_values.extend([el.text.strip() for el in elems])
+        found_values: List[str] = self._flat_texts(list_of_elements)
 
         if not found_values:
             return False, "Не найдено ни одного элемента для проверки."
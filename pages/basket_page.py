@@ -1,4 +1,4 @@
-from selenium.webdriver.support.wait import WebDriverWait
+from stepik_autotests_final_task.pages.dom_wait import DomWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
 from selenium.common.exceptions import (
@@ -12,9 +12,11 @@ from stepik_autotests_final_task.pages.base_page import BasePage
 from stepik_autotests_final_task.pages.locators import BasketPageLocators
 
 class BasketPage(BasePage):
+    READY_LOCATORS = (BasketPageLocators.BASKET_BOX,)
+
     def __init__(self, *args, **kwargs):
         super(BasketPage, self).__init__(*args, **kwargs)
-        self.wait = WebDriverWait(self.browser, timeout=10, poll_frequency=1)
+        self.wait = DomWait(self.browser, timeout=10, poll_frequency=1)
 
     def get_basket_items(self):
         pass
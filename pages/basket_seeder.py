@@ -0,0 +1,83 @@
+from typing import Iterable, List
+from urllib.parse import urlsplit
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.common.by import By
+
+from stepik_autotests_final_task.http_driver import HttpDriver
+from stepik_autotests_final_task.pages.locators import ProductPageLocators
+
+
+class BasketSeeder:
+    """
+    Наполняет корзину гостя без браузера: страница товара загружается по HTTP,
+    форма добавления отправляется POST-запросом вместе с CSRF-токеном.
+    Полученные cookie сессии затем переносятся в браузер, и тест сразу открывает заполненную корзину
+    вместо кликов по ADD_TO_BASKET_BTN и решения задачи в alert.
+    """
+
+    def __init__(self, language: str = "en-gb"):
+        """
+        :param language: язык для заголовка Accept-Language
+        """
+        self.http = HttpDriver(language)
+        self.added: List[str] = []
+
+    def add_product(self, product_url: str, quantity: int = 1) -> None:
+        """
+        Добавляет товар в корзину сессии.
+        :param product_url: URL страницы товара
+        :param quantity: количество
+        :raises AssertionError: если страница товара или добавление вернули ошибку
+        """
+        self.http.get(product_url)
+        assert self.http.status_code == 200, \
+            f"Product page {product_url} returned HTTP {self.http.status_code}"
+
+        button = self.http.find_element(*ProductPageLocators.ADD_TO_BASKET_BTN)
+        quantity_fields = self.http.find_elements(By.CSS_SELECTOR, "form#add_to_basket_form [name=quantity]")
+        if quantity_fields:
+            quantity_fields[0].clear()
+            quantity_fields[0].send_keys(str(quantity))
+        # кнопка отправляет форму с csrfmiddlewaretoken, cookie csrftoken и Referer
+        button.click()
+        assert self.http.status_code == 200, \
+            f"Adding {product_url} to the basket returned HTTP {self.http.status_code}"
+        self.added.append(product_url)
+
+    def add_products(self, product_urls: Iterable[str]) -> None:
+        """Добавляет в корзину несколько товаров по одному."""
+        for url in product_urls:
+            self.add_product(url)
+
+    @property
+    def cookies(self) -> List[dict]:
+        """Cookie сессии, в которой наполнена корзина."""
+        return self.http.get_cookies()
+
+    def inject_into(self, browser, base_url: str) -> None:
+        """
+        Переносит cookie сессии в браузер.
+        В Chrome cookie ставятся через DevTools Protocol без загрузки страницы,
+        в остальных браузерах сначала открывается base_url — cookie можно добавить только на своём домене.
+        :param browser: экземпляр WebDriver
+        :param base_url: адрес сайта, для которого ставятся cookie
+        """
+        if hasattr(browser, "execute_cdp_cmd"):
+            try:
+                for cookie in self.cookies:
+                    browser.execute_cdp_cmd("Network.setCookie", {
+                        "name": cookie["name"], "value": cookie["value"],
+                        "url": base_url, "path": cookie.get("path", "/"),
+                    })
+                return
+            except WebDriverException:
+                pass  # DevTools недоступен — ставим cookie обычным способом
+
+        if urlsplit(browser.current_url).netloc != urlsplit(base_url).netloc:
+            browser.get(base_url)
+        for cookie in self.cookies:
+            browser.add_cookie({"name": cookie["name"], "value": cookie["value"], "path": cookie.get("path", "/")})
+
+    def close(self) -> None:
+        self.http.quit()
@@ -0,0 +1,164 @@
+import math
+import threading
+import weakref
+from typing import List, Optional
+
+from selenium.common.exceptions import NoAlertPresentException, TimeoutException, WebDriverException
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.event_firing_webdriver import EventFiringWebDriver
+from selenium.webdriver.support.ui import WebDriverWait
+
+from stepik_autotests_final_task.lazy_browser import LazyBrowser
+
+# сколько после ответа на квиз ждать второго alert с кодом
+CODE_ALERT_TIMEOUT = 1.0
+
+# сколько ждать квиза после клика, если его нет. Классический alert открывается до возврата из click(),
+# поэтому хватает короткой паузы; событие BiDi приходит отдельно от ответа на click() и может запоздать
+CLASSIC_QUIZ_TIMEOUT = 0.3
+BIDI_QUIZ_TIMEOUT = 1.0
+
+
+def quiz_answer(text: str) -> str:
+    """
+    Ответ на квиз из prompt промо-страницы: "x = <число> ..." -> ln(|12 * sin(x)|).
+    :raises ValueError: если текст не похож на квиз
+    """
+    x = text.split(" ")[2]
+    return str(math.log(abs(12 * math.sin(float(x)))))
+
+
+def _unwrap(browser):
+    """
+    WebDriver под LazyBrowser и EventFiringWebDriver (режим снимков DOM) — обработчики привязаны к нему.
+    Незапущенный LazyBrowser возвращается как есть: к нему ничего не подключено, запускать его незачем.
+    """
+    if isinstance(browser, LazyBrowser):
+        if not browser.started:
+            return browser
+        browser = browser.wrapped_driver
+    if isinstance(browser, EventFiringWebDriver):
+        browser = browser.wrapped_driver
+    return browser
+
+
+class QuizDialogHandler:
+    """
+    Решает квиз промо-страниц по событиям WebDriver BiDi browsingContext.userPromptOpened.
+    Prompt с квизом получает ответ, следующий alert с кодом принимается, а код сохраняется в codes.
+    Всё это происходит в потоке событий selenium, тест только ждёт итог через wait().
+    Обработчик нужен браузеру, запущенному с enable_bidi; подключается один раз через attach().
+    """
+
+    _attached = weakref.WeakKeyDictionary()
+
+    def __init__(self, browser):
+        self.browser = browser
+        self.codes: List[str] = []
+        self._callback_id = None
+        self._quiz_opened = threading.Event()
+        self._quiz_done = threading.Event()
+        self._awaiting_code = False
+        self._last_code: Optional[str] = None
+
+    @classmethod
+    def attach(cls, browser) -> Optional["QuizDialogHandler"]:
+        """
+        Подключает обработчик к браузеру (повторный вызов возвращает тот же обработчик).
+        :return: обработчик или None, если у браузера нет BiDi
+        """
+        browser = _unwrap(browser)
+        if browser in cls._attached:
+            return cls._attached[browser]
+        if not getattr(browser, "caps", {}).get("webSocketUrl"):
+            return None
+        handler = cls(browser)
+        handler._callback_id = browser.browsing_context.add_event_handler("user_prompt_opened", handler._on_prompt)
+        cls._attached[browser] = handler
+        return handler
+
+    @classmethod
+    def attached(cls, browser) -> Optional["QuizDialogHandler"]:
+        """Обработчик, подключённый к браузеру, или None."""
+        return cls._attached.get(_unwrap(browser))
+
+    def detach(self) -> None:
+        if self._callback_id is not None:
+            try:
+                self.browser.browsing_context.remove_event_handler("user_prompt_opened", self._callback_id)
+            except WebDriverException:
+                pass  # браузер уже закрыт
+            self._callback_id = None
+        self._attached.pop(self.browser, None)
+
+    def reset(self) -> None:
+        """Забывает квиз, который никто не дождался."""
+        self._quiz_opened.clear()
+        self._quiz_done.clear()
+        self._awaiting_code = False
+        self._last_code = None
+
+    def _on_prompt(self, params) -> None:
+        # вызывается в потоке событий selenium
+        try:
+            if params.type == "prompt":
+                try:
+                    answer = quiz_answer(params.message)
+                except (IndexError, ValueError):
+                    return  # это не квиз — prompt остаётся тесту
+                self._awaiting_code = True
+                self._quiz_opened.set()
+                self.browser.browsing_context.handle_user_prompt(params.context, accept=True, user_text=answer)
+            elif params.type == "alert" and self._awaiting_code:
+                self._awaiting_code = False
+                self._last_code = params.message
+                self.codes.append(params.message)
+                print(f"Your code: {params.message}")
+                self.browser.browsing_context.handle_user_prompt(params.context, accept=True)
+                self._quiz_done.set()
+        except WebDriverException as error:
+            print(f"⚠️  Не удалось обработать диалог: {error}")
+            self._quiz_done.set()
+
+    def wait(self, timeout: float) -> Optional[str]:
+        """
+        Ждёт "квиз решён или квиза нет".
+        :param timeout: сколько ждать появления квиза
+        :return: код из второго alert или None, если квиза не было или кода не показали
+        """
+        if not self._quiz_opened.wait(timeout):
+            return None
+        if not self._quiz_done.wait(CODE_ALERT_TIMEOUT):
+            print("No second alert presented")
+        code = self._last_code
+        self.reset()
+        return code
+
+
+def solve_quiz_classic(browser, timeout: float) -> Optional[str]:
+    """
+    Решает квиз через классический switch_to.alert, если у браузера нет BiDi.
+    Alert ждётся коротким WebDriverWait, а не неявным ожиданием, и отсутствие квиза не ошибка.
+    DomWait здесь не подходит: его скрипты при открытом alert закрывают диалог.
+    :return: код из второго alert или None
+    """
+    try:
+        alert = WebDriverWait(browser, timeout, poll_frequency=0.1).until(EC.alert_is_present())
+    except TimeoutException:
+        return None
+    try:
+        answer = quiz_answer(alert.text)
+    except (IndexError, ValueError):
+        return None  # это не квиз
+    alert.send_keys(answer)
+    alert.accept()
+    try:
+        alert = WebDriverWait(browser, CODE_ALERT_TIMEOUT, poll_frequency=0.1,
+                              ignored_exceptions=(NoAlertPresentException,)).until(EC.alert_is_present())
+    except TimeoutException:
+        print("No second alert presented")
+        return None
+    code = alert.text
+    print(f"Your code: {code}")
+    alert.accept()
+    return code
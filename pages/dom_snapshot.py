@@ -0,0 +1,152 @@
+import re
+from typing import List
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.abstract_event_listener import AbstractEventListener
+
+try:
+    import lxml.html
+except ImportError:  # lxml и cssselect нужны только для режима снимков DOM
+    lxml = None
+
+# элементы, текст которых не отображается
+NOT_RENDERED_TAGS = {"head", "title", "script", "style", "noscript", "template"}
+
+# блочные элементы для снимков без отметок отрисовки (page_source): с них начинается новая строка текста
+BLOCK_TAGS = {"address", "article", "aside", "blockquote", "dd", "div", "dl", "dt", "fieldset", "figure",
+              "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "li", "main", "nav",
+              "ol", "p", "pre", "section", "table", "tr", "ul"}
+
+# атрибуты, которыми CAPTURE_SNAPSHOT отмечает отрисовку элементов
+RENDER_ATTRIBUTE = "data-stepik-render"
+TRANSFORM_ATTRIBUTE = "data-stepik-transform"
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def find_lxml_elements(root, how: By, what: str) -> list:
+    """
+    Находит элементы внутри lxml-элемента по локатору selenium.
+    :raises ValueError: если способ поиска не поддерживается
+    """
+    if how == By.CSS_SELECTOR:
+        return root.cssselect(what)
+    if how == By.XPATH:
+        return [node for node in root.xpath(what) if isinstance(node, lxml.html.HtmlElement)]
+    if how == By.ID:
+        return root.xpath(".//*[@id=$value]", value=what)
+    if how == By.NAME:
+        return root.xpath(".//*[@name=$value]", value=what)
+    if how == By.CLASS_NAME:
+        return root.find_class(what)
+    if how == By.TAG_NAME:
+        return root.xpath(f".//{what}")
+    if how == By.LINK_TEXT:
+        return [a for a in root.iter("a") if a.text_content().strip() == what]
+    if how == By.PARTIAL_LINK_TEXT:
+        return [a for a in root.iter("a") if what in a.text_content()]
+    raise ValueError(f"Unsupported locator strategy: {how}")
+
+
+class DomSnapshot:
+    """
+    Снимок DOM страницы, разобранный локально через lxml.
+    Отвечает на поиск элементов и чтение текста без обращений к WebDriver.
+    Текст повторяет WebElement.text: у скрытых элементов он пустой, script и style не входят,
+    блочные элементы и <br> начинают новую строку, пробелы внутри строки схлопываются.
+    Видимость и блочность берутся из отметок CAPTURE_SNAPSHOT; в HTML без отметок (page_source) —
+    из разметки (hidden, style="display: none", теги блочных элементов).
+    """
+
+    def __init__(self, html: str):
+        """
+        :param html: HTML страницы (CAPTURE_SNAPSHOT или browser.page_source)
+        """
+        if lxml is None:
+            raise ImportError("DOM snapshots require 'lxml' and 'cssselect' (see requirements.txt)")
+        self._root = lxml.html.document_fromstring(html)
+        self._marked = self._root.get(RENDER_ATTRIBUTE) is not None
+
+    def find_elements(self, how: By, what: str) -> list:
+        """
+        Находит элементы в снимке.
+        :raises ValueError: если способ поиска не поддерживается
+        """
+        return find_lxml_elements(self._root, how, what)
+
+    def get_texts(self, how: By, what: str) -> List[str]:
+        """Тексты всех найденных элементов так, как их вернул бы WebElement.text."""
+        return [self.element_text(element) for element in self.find_elements(how, what)]
+
+    def element_text(self, element) -> str:
+        """Видимый текст элемента снимка."""
+        if any(not self._is_rendered(node) for node in [element, *element.iterancestors()]):
+            return ""
+        parts: List[str] = []
+        self._collect_text(element, parts)
+        lines = (" ".join(line.split()) for line in "".join(parts).split("\n"))
+        return "\n".join(line for line in lines if line)
+
+    def _is_rendered(self, node) -> bool:
+        if node.tag in NOT_RENDERED_TAGS:
+            return False
+        if self._marked:
+            return node.get(RENDER_ATTRIBUTE) != "hidden"
+        style = (node.get("style") or "").replace(" ", "").lower()
+        return (node.get("hidden") is None and "display:none" not in style
+                and not (node.tag == "input" and node.get("type") == "hidden"))
+
+    def _is_block(self, node) -> bool:
+        if self._marked:
+            return node.get(RENDER_ATTRIBUTE) == "block"
+        return node.tag in BLOCK_TAGS
+
+    @staticmethod
+    def _transform(node, text: str) -> str:
+        """Текст узла с пробелами, схлопнутыми как при отрисовке, и text-transform элемента."""
+        text = _WHITESPACE.sub(" ", text)
+        transform = node.get(TRANSFORM_ATTRIBUTE)
+        if transform == "uppercase":
+            return text.upper()
+        if transform == "lowercase":
+            return text.lower()
+        if transform == "capitalize":
+            return " ".join(word[:1].upper() + word[1:] for word in text.split(" "))
+        return text
+
+    def _collect_text(self, node, parts: List[str]) -> None:
+        block = self._is_block(node) or node.tag == "br"
+        if block:
+            parts.append("\n")
+        if node.text:
+            parts.append(self._transform(node, node.text))
+        for child in node:
+            # комментарии и инструкции обработки: tag у них не строка, текст не выводится
+            if isinstance(child.tag, str) and self._is_rendered(child):
+                self._collect_text(child, parts)
+            if child.tail:
+                parts.append(self._transform(node, child.tail))
+        if block:
+            parts.append("\n")
+
+
+class SnapshotInvalidator(AbstractEventListener):
+    """Сбрасывает снимок DOM страницы при кликах, вводе текста и навигации."""
+
+    def __init__(self, page):
+        self._page = page
+
+    def before_click(self, element, driver) -> None:
+        self._page.invalidate_snapshot()
+
+    def before_change_value_of(self, element, driver) -> None:
+        self._page.invalidate_snapshot()
+
+    def before_navigate_to(self, url: str, driver) -> None:
+        self._page.invalidate_snapshot()
+
+    def before_navigate_back(self, driver) -> None:
+        self._page.invalidate_snapshot()
+
+    def before_navigate_forward(self, driver) -> None:
+        self._page.invalidate_snapshot()
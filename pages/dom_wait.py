@@ -0,0 +1,115 @@
+import time
+
+from selenium.common.exceptions import NoAlertPresentException, TimeoutException, WebDriverException
+from selenium.webdriver.support.ui import WebDriverWait
+
+from stepik_autotests_final_task.pages.js_scripts import WAIT_FOR_MUTATION
+from stepik_autotests_final_task.timing_history import timed
+
+
+class DomWait(WebDriverWait):
+    """
+    WebDriverWait, который между проверками не спит poll_frequency, а ждёт изменения DOM
+    через MutationObserver. Условие перепроверяется сразу после мутации.
+    Если скрипты в браузере не выполняются, ожидание откатывается на обычный опрос
+    и через OBSERVER_RETRY_INTERVAL снова пробует MutationObserver.
+    Пока открыт alert или prompt (квиз промо-страниц), скрипт не запускается: драйвер либо упал бы
+    с UnexpectedAlertPresentException, либо закрыл бы prompt, и квиз был бы потерян.
+    """
+
+    # максимальная пауза между проверками, даже если DOM не меняется
+    # (условия на url, alert и т.п. не вызывают мутаций)
+    MAX_SLICE = 0.5
+    # после стольких ошибок подряд считаем, что скрипты заблокированы
+    MAX_SCRIPT_FAILURES = 3
+    # пауза после единичной ошибки скрипта
+    TRANSIENT_FAILURE_PAUSE = 0.05
+    # через сколько секунд опроса снова пробовать MutationObserver
+    OBSERVER_RETRY_INTERVAL = 2.0
+
+    def __init__(self, driver, timeout: float, poll_frequency: float = 0.5, ignored_exceptions=None):
+        """
+        :param driver: экземпляр WebDriver
+        :param timeout: время ожидания
+        :param poll_frequency: частота опроса, если MutationObserver недоступен
+        :param ignored_exceptions: исключения, которые игнорируются во время ожидания
+        """
+        super().__init__(driver, timeout=timeout, poll_frequency=poll_frequency,
+                         ignored_exceptions=ignored_exceptions)
+        self._mutation_seq = None
+        self._script_failures = 0
+        self._retry_observer_at = 0.0
+
+    @timed("wait")
+    def until(self, method, message: str = ""):
+        """Ждёт, пока method(driver) не вернёт истинное значение, и возвращает его."""
+        screen = None
+        stacktrace = None
+        end_time = time.monotonic() + self._timeout
+        while True:
+            try:
+                value = method(self._driver)
+                if value:
+                    return value
+            except self._ignored_exceptions as exc:
+                screen = getattr(exc, "screen", None)
+                stacktrace = getattr(exc, "stacktrace", None)
+            if time.monotonic() > end_time:
+                break
+            self._pause(end_time)
+        raise TimeoutException(message, screen, stacktrace)
+
+    @timed("wait")
+    def until_not(self, method, message: str = ""):
+        """Ждёт, пока method(driver) не вернёт ложное значение."""
+        end_time = time.monotonic() + self._timeout
+        while True:
+            try:
+                value = method(self._driver)
+                if not value:
+                    return value
+            except self._ignored_exceptions:
+                return True
+            if time.monotonic() > end_time:
+                break
+            self._pause(end_time)
+        raise TimeoutException(message)
+
+    @property
+    def observer_available(self) -> bool:
+        """False, если MutationObserver не удалось использовать и ожидание пока работает опросом."""
+        return self._script_failures < self.MAX_SCRIPT_FAILURES or time.monotonic() >= self._retry_observer_at
+
+    def _alert_open(self) -> bool:
+        """Открыт ли alert/prompt (switch_to.alert не использует неявное ожидание)."""
+        try:
+            self._driver.switch_to.alert
+            return True
+        except (NoAlertPresentException, WebDriverException, AttributeError):
+            return False
+
+    def _pause(self, end_time: float) -> None:
+        """Ждёт следующей мутации DOM, но не дольше MAX_SLICE и не позже end_time."""
+        remaining = end_time - time.monotonic()
+        if remaining <= 0:
+            return
+
+        if self.observer_available and not self._alert_open():
+            try:
+                slice_ms = int(min(remaining, self.MAX_SLICE) * 1000)
+                self._mutation_seq = self._driver.execute_async_script(
+                    WAIT_FOR_MUTATION, self._mutation_seq, slice_ms)
+                self._script_failures = 0
+                return
+            except WebDriverException:
+                # документ выгрузился во время ожидания, открыт alert или скрипты запрещены
+                self._script_failures += 1
+                self._mutation_seq = None
+                if self._script_failures >= self.MAX_SCRIPT_FAILURES:
+                    self._retry_observer_at = time.monotonic() + self.OBSERVER_RETRY_INTERVAL
+                if self.observer_available:
+                    # скорее всего, это переход на другую страницу — проверяем снова почти сразу
+                    time.sleep(min(self.TRANSIENT_FAILURE_PAUSE, remaining))
+                    return
+
+        time.sleep(min(self._poll, remaining))
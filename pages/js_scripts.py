@@ -0,0 +1,222 @@
+# JavaScript, который выполняется в браузере через execute_script / execute_async_script.
+# Последний аргумент асинхронного скрипта — callback, который нужно вызвать с результатом.
+
+# Ждёт любого изменения DOM после mutation-счётчика last_seen (или до timeout_ms).
+# Наблюдатель ставится один раз на документ и считает мутации в window.__stepikDomWait.seq,
+# поэтому изменения, случившиеся между двумя вызовами, не теряются.
+# arguments: [last_seen (int | null), timeout_ms (int)] -> текущее значение счётчика
+WAIT_FOR_MUTATION = """
+var lastSeen = arguments[0], timeoutMs = arguments[1], done = arguments[arguments.length - 1];
+var state = window.__stepikDomWait;
+if (!state) {
+    state = window.__stepikDomWait = {seq: 0, listeners: []};
+    new MutationObserver(function () {
+        state.seq += 1;
+        var listeners = state.listeners;
+        state.listeners = [];
+        listeners.forEach(function (fn) { fn(); });
+    }).observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+}
+if (lastSeen !== null && lastSeen !== state.seq) {
+    done(state.seq);
+    return;
+}
+var finished = false;
+function finish() {
+    if (finished) { return; }
+    finished = true;
+    done(state.seq);
+}
+state.listeners.push(finish);
+setTimeout(finish, timeoutMs);
+"""
+
+# Функция поиска элементов по паре (by, value) из selenium By — используется в других скриптах.
+FIND_ELEMENTS_FN = """
+function stepikFindElements(by, value, root) {
+    root = root || document;
+    var doc = root.ownerDocument || root;
+    switch (by) {
+        case 'css selector':
+            return Array.prototype.slice.call(root.querySelectorAll(value));
+        case 'xpath':
+            var snapshot = doc.evaluate(value, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            var nodes = [];
+            for (var i = 0; i < snapshot.snapshotLength; i++) { nodes.push(snapshot.snapshotItem(i)); }
+            return nodes;
+        case 'id':
+            return Array.prototype.slice.call(root.querySelectorAll('[id="' + value + '"]'));
+        case 'name':
+            return Array.prototype.slice.call(root.querySelectorAll('[name="' + value + '"]'));
+        case 'class name':
+            return Array.prototype.slice.call(root.getElementsByClassName(value));
+        case 'tag name':
+            return Array.prototype.slice.call(root.getElementsByTagName(value));
+    }
+    throw new Error('Unsupported locator strategy: ' + by);
+}
+function stepikText(el) {
+    return (el.innerText !== undefined ? el.innerText : el.textContent || '').trim();
+}
+"""
+
+# Ждёт, пока ни один элемент по локатору не будет содержать текст.
+# arguments: [by, value, text, timeout_ms] -> {absent: bool, elapsed_ms: float}
+WAIT_FOR_TEXT_ABSENT = FIND_ELEMENTS_FN + """
+var by = arguments[0], value = arguments[1], text = arguments[2], timeoutMs = arguments[3];
+var done = arguments[arguments.length - 1];
+var started = performance.now();
+function textPresent() {
+    return stepikFindElements(by, value).some(function (el) { return stepikText(el).indexOf(text) !== -1; });
+}
+var finished = false, observer = null, timer = null;
+function finish(absent) {
+    if (finished) { return; }
+    finished = true;
+    if (observer) { observer.disconnect(); }
+    if (timer) { clearTimeout(timer); }
+    done({absent: absent, elapsed_ms: performance.now() - started});
+}
+if (!textPresent()) {
+    finish(true);
+    return;
+}
+observer = new MutationObserver(function () {
+    if (!textPresent()) { finish(true); }
+});
+observer.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+timer = setTimeout(function () { finish(!textPresent()); }, timeoutMs);
+"""
+
+# Тексты всех элементов для списка локаторов за один вызов.
+# arguments: [[[by, value], ...]] -> [[text, ...], ...] в том же порядке
+GET_TEXTS_BATCH = FIND_ELEMENTS_FN + """
+return arguments[0].map(function (locator) {
+    return stepikFindElements(locator[0], locator[1]).map(stepikText);
+});
+"""
+
+# HTML страницы для DomSnapshot: копия документа, в которой у элементов отмечено, как они отрисованы
+# (data-stepik-render: hidden — не отображается, block — начинает новую строку) и text-transform.
+# Отметки ставятся на копию, сама страница не меняется (MutationObserver их не видит).
+# arguments: [] -> html
+CAPTURE_SNAPSHOT = """
+var original = document.documentElement;
+var copy = original.cloneNode(true);
+var sources = original.getElementsByTagName('*'), targets = copy.getElementsByTagName('*');
+function mark(source, target) {
+    var style = window.getComputedStyle(source);
+    var tag = source.tagName.toLowerCase();
+    // option и br не имеют своих прямоугольников, их видимость определяется родителем
+    var rendered = tag === 'option' || tag === 'optgroup' || tag === 'br' || source.getClientRects().length > 0;
+    if (!rendered || style.visibility === 'hidden') {
+        target.setAttribute('data-stepik-render', 'hidden');
+    } else if (style.display.indexOf('inline') !== 0) {
+        target.setAttribute('data-stepik-render', 'block');
+    }
+    if (style.textTransform && style.textTransform !== 'none') {
+        target.setAttribute('data-stepik-transform', style.textTransform);
+    }
+}
+mark(original, copy);
+for (var i = 0; i < sources.length; i++) { mark(sources[i], targets[i]); }
+return copy.outerHTML;
+"""
+
+# Ждёт, пока документ загрузится и страница "успокоится": нет новых мутаций DOM,
+# новых загрузок ресурсов и незавершённых fetch/XHR в течение quiet_ms.
+# arguments: [quiet_ms, timeout_ms] -> {settled: bool, elapsed_ms: float}
+WAIT_FOR_PAGE_SETTLED = """
+var quietMs = arguments[0], timeoutMs = arguments[1], done = arguments[arguments.length - 1];
+var started = performance.now();
+var state = window.__stepikActivity;
+if (!state) {
+    state = window.__stepikActivity = {lastChange: performance.now(), pending: 0};
+    var touch = function () { state.lastChange = performance.now(); };
+    new MutationObserver(touch).observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+    if (window.fetch) {
+        var originalFetch = window.fetch;
+        window.fetch = function () {
+            state.pending += 1;
+            touch();
+            var settle = function (value) { state.pending -= 1; touch(); return value; };
+            return originalFetch.apply(this, arguments).then(settle, function (error) { settle(); throw error; });
+        };
+    }
+    var originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        state.pending += 1;
+        touch();
+        this.addEventListener('loadend', function () { state.pending -= 1; touch(); });
+        return originalSend.apply(this, arguments);
+    };
+}
+var resources = performance.getEntriesByType('resource').length;
+function check() {
+    var now = performance.now();
+    var currentResources = performance.getEntriesByType('resource').length;
+    if (currentResources !== resources) {
+        resources = currentResources;
+        state.lastChange = now;
+    }
+    var quiet = document.readyState === 'complete' && state.pending === 0 && now - state.lastChange >= quietMs;
+    if (quiet || now - started >= timeoutMs) {
+        done({settled: quiet, elapsed_ms: now - started});
+        return;
+    }
+    setTimeout(check, 50);
+}
+check();
+"""
+
+
+# Функции для script.callFunction в WebDriver BiDi (AsyncBasePage): аргументы передаются как у функции.
+
+# Проверяет, есть ли элемент, и если нет — ставит MutationObserver, который сообщит
+# о появлении элемента строкой 'stepik:dom:<token>' в консоль (событие log.entryAdded).
+# Через timeout_ms наблюдатель снимается, даже если элемент так и не появился.
+# arguments: [by, value, token, timeout_ms] -> bool (элемент уже есть)
+BIDI_WATCH_ELEMENT = "function () {" + FIND_ELEMENTS_FN + """
+var by = arguments[0], value = arguments[1], token = arguments[2], timeoutMs = arguments[3];
+if (stepikFindElements(by, value).length) { return true; }
+var finished = false, timer = null;
+function finish(found) {
+    if (finished) { return; }
+    finished = true;
+    observer.disconnect();
+    if (timer) { clearTimeout(timer); }
+    if (found) { console.debug('stepik:dom:' + token); }
+}
+var observer = new MutationObserver(function () {
+    if (stepikFindElements(by, value).length) { finish(true); }
+});
+observer.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+timer = setTimeout(function () { finish(false); }, timeoutMs);
+return false;
+}"""
+
+# Тексты всех элементов по локатору.
+# arguments: [by, value] -> JSON-строка со списком текстов
+BIDI_GET_TEXTS = "function () {" + FIND_ELEMENTS_FN + """
+return JSON.stringify(stepikFindElements(arguments[0], arguments[1]).map(stepikText));
+}"""
+
+# Кликает по первому элементу по локатору.
+# arguments: [by, value] -> bool (элемент найден)
+BIDI_CLICK = "function () {" + FIND_ELEMENTS_FN + """
+var elements = stepikFindElements(arguments[0], arguments[1]);
+if (!elements.length) { return false; }
+elements[0].click();
+return true;
+}"""
+
+
+# Среднее время поиска по локатору (utils/locator_tool.py benchmark).
+# arguments: [by, value, iterations] -> {micros: float, count: int}
+BENCHMARK_LOOKUP = FIND_ELEMENTS_FN + """
+var by = arguments[0], value = arguments[1], iterations = arguments[2];
+var count = stepikFindElements(by, value).length;
+var started = performance.now();
+for (var i = 0; i < iterations; i++) { stepikFindElements(by, value); }
+return {micros: (performance.now() - started) * 1000 / iterations, count: count};
+"""
@@ -6,6 +6,8 @@ import selenium
 
 
 class LoginPage(BasePage):
+    READY_LOCATORS = (LoginPageLocators.LOGIN_FORM, LoginPageLocators.REGISTRATION_FORM)
+
     def should_be_login_page(self):
         self.should_be_login_url()
         self.should_be_login_form()
@@ -1,16 +1,18 @@
-from selenium.webdriver.support.wait import WebDriverWait
+from stepik_autotests_final_task.pages.dom_wait import DomWait
 from selenium.webdriver.support import expected_conditions as EC
 
 from stepik_autotests_final_task.pages.base_page import BasePage
-from .locators import MainPaigeLocators
+from .locators import MainPaigeLocators, BasePageLocators
 import selenium
 from selenium.webdriver.common.by import By
 
 
 class MainPage(BasePage):
+    READY_LOCATORS = (MainPaigeLocators.BASKET_LINK_IN_HEADER, BasePageLocators.LOGIN_LINK)
+
     def __init__(self, *args, **kwargs):
         super(MainPage, self).__init__(*args, **kwargs)
-        self.wait = WebDriverWait(self.browser, timeout=10, poll_frequency=1)
+        self.wait = DomWait(self.browser, timeout=10, poll_frequency=1)
 
     def should_be_basket_link_in_header(self):
         """
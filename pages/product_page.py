@@ -1,4 +1,4 @@
-from selenium.webdriver.support.wait import WebDriverWait
+from .dom_wait import DomWait
 from selenium.webdriver.support import expected_conditions as EC
 
 from .base_page import BasePage
@@ -6,13 +6,13 @@ from .locators import ProductPageLocators
 from ..decorators import Decorators
 
 
-import time
-
-
 
 @Decorators.print_function_name
 @Decorators.screenshot_on_error
 class ProductPage(BasePage):
+    READY_LOCATORS = (ProductPageLocators.PRODUCT_NAME, ProductPageLocators.PRODUCT_PRICE,
+                      ProductPageLocators.ADD_TO_BASKET_BTN)
+
     @Decorators.print_function_name
     @Decorators.screenshot_on_error
     def __init__(self, browser, url: str = None):
@@ -23,7 +23,7 @@ class ProductPage(BasePage):
         super().__init__(browser, url)
         self.product_name = None
         self.product_price = None
-        self.wait = WebDriverWait(self.browser, timeout=10, poll_frequency=1)
+        self.wait = DomWait(self.browser, timeout=10, poll_frequency=1)
 
     @Decorators.print_function_name
     @Decorators.screenshot_on_error
@@ -38,10 +38,9 @@ class ProductPage(BasePage):
         self.should_be_add_to_basket_button()
         self.click_add_to_basket()
 
-        try:
-            self.solve_quiz_and_get_code()
-        except Exception:
-            pass
+        # квиз показывают только промо-страницы; смотрим, где браузер на самом деле (self.url может быть не задан)
+        if "promo=" in (self.browser.current_url or ""):
+            self.solve_quiz_if_present()
         self.should_be_added_to_basket_message(added_to_basket_message)
         self.should_match_product_name_in_basket()
 
@@ -173,16 +172,11 @@ class ProductPage(BasePage):
         :param success_message: ожидаемый текст сообщения
         :return: None
         """
-        timeout = self.wait._timeout  # берём таймаут из WebDriverWait
-        poll_frequency = self.wait._poll  # частота опроса
-
-        end_time = time.time() + timeout
-        while time.time() < end_time:
-            messages = self.get_texts_from_elements(ProductPageLocators.MESSAGE_ELEMENT)
-            if all(success_message not in message for message in messages):
-                # Сообщения с нужным текстом нет — тест прошёл
-                return
-            time.sleep(poll_frequency)
+        elapsed = self.wait_until_text_absent(ProductPageLocators.MESSAGE_ELEMENT, success_message)
+        if elapsed is not None:
+            # Сообщения с нужным текстом нет — тест прошёл
+            print(f"Success message disappeared in {elapsed:.3f} seconds")
+            return
 
         # Если дошли до конца таймаута и сообщение всё ещё есть
         raise AssertionError(f"Success message '{success_message}' did not disappear after adding product to basket")
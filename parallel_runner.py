@@ -0,0 +1,148 @@
+import math
+import os
+import subprocess
+import sys
+import time
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+# переменная окружения, по которой процесс понимает, что он воркер параллельного запуска
+WORKER_ENV = "STEPIK_WORKER_ID"
+
+REPORT_DIR = "reports"
+MERGED_REPORT = "parallel_report.xml"
+
+
+def is_worker() -> bool:
+    """Возвращает True, если текущий процесс запущен как воркер."""
+    return WORKER_ENV in os.environ
+
+
+def shard_items(items: Sequence, workers: int) -> List[List[str]]:
+    """
+    Раскладывает тесты по воркерам по кругу.
+    :param items: собранные pytest items
+    :param workers: количество воркеров
+    :return: список nodeid для каждого воркера (пустые шарды отбрасываются)
+    """
+    shards: List[List[str]] = [[] for _ in range(workers)]
+    for index, item in enumerate(items):
+        shards[index % workers].append(item.nodeid)
+    return [shard for shard in shards if shard]
+
+
+def shard_groups(groups: Sequence[Sequence], workers: int) -> List[list]:
+    """
+    Раскладывает по воркерам группы тестов, которым нужен один и тот же браузер (scheduler.group_items).
+    Группа попадает к одному воркеру целиком, поэтому он запускает её конфигурацию один раз.
+    Группа больше средней доли воркера делится на части: лишний запуск браузера дешевле простоя воркеров.
+    Части раздаются от больших к меньшим самому свободному воркеру.
+    :param groups: группы pytest items
+    :param workers: количество воркеров
+    :return: список items для каждого воркера (пустые шарды отбрасываются)
+    """
+    total = sum(len(group) for group in groups)
+    if not total:
+        return []
+    limit = math.ceil(total / workers)
+    units = [list(group[start:start + limit]) for group in groups for start in range(0, len(group), limit)]
+    shards: List[list] = [[] for _ in range(workers)]
+    for unit in sorted(units, key=len, reverse=True):
+        min(shards, key=len).extend(unit)
+    return [shard for shard in shards if shard]
+
+
+def _worker_command(nodeids: List[str], worker_args: List[str], junit_path: Path, verbosity: int) -> List[str]:
+    command = [sys.executable, "-m", "pytest", *nodeids, *worker_args,
+               "-p", "no:cacheprovider", f"--junitxml={junit_path}"]
+    if verbosity > 0:
+        command.append("-" + "v" * verbosity)
+    return command
+
+
+def _read_junit(path: Path):
+    """Читает junit xml воркера. Возвращает корневой testsuite или None, если отчёта нет."""
+    if not path.exists():
+        return None
+    root = ET.parse(path).getroot()
+    return root if root.tag == "testsuite" else root.find("testsuite")
+
+
+def run_parallel(session, workers: int, worker_args: List[str], write_line,
+                 groups: Optional[List[list]] = None) -> int:
+    """
+    Запускает собранные тесты в нескольких процессах pytest, у каждого свой браузер.
+    Вывод каждого воркера сохраняется в reports/worker-N.log, результаты
+    объединяются в reports/parallel_report.xml.
+    :param session: pytest session с уже собранными items
+    :param workers: количество процессов
+    :param worker_args: опции командной строки, которые передаются каждому воркеру
+    :param write_line: функция вывода в терминал
+    :param groups: тесты, сгруппированные по конфигурации браузера; без них тесты раздаются по кругу
+    :return: количество упавших тестов (failures + errors)
+    """
+    rootdir = Path(session.config.rootpath)
+    report_dir = rootdir / REPORT_DIR
+    report_dir.mkdir(exist_ok=True)
+    verbosity = session.config.getoption("verbose")
+
+    if groups:
+        shards = [[item.nodeid for item in shard] for shard in shard_groups(groups, workers)]
+    else:
+        shards = shard_items(session.items, workers)
+    write_line(f"running {len(session.items)} tests in {len(shards)} workers..")
+
+    processes: Dict[int, tuple] = {}
+    for worker_id, nodeids in enumerate(shards):
+        junit_path = report_dir / f"worker-{worker_id}.xml"
+        log_path = report_dir / f"worker-{worker_id}.log"
+        if junit_path.exists():
+            junit_path.unlink()
+        env = dict(os.environ, **{WORKER_ENV: str(worker_id)})
+        log = open(log_path, "w", encoding="utf-8")
+        process = subprocess.Popen(
+            _worker_command(nodeids, worker_args, junit_path, verbosity),
+            cwd=rootdir, env=env, stdout=log, stderr=subprocess.STDOUT,
+        )
+        processes[worker_id] = (process, log, log_path, junit_path, nodeids, time.time())
+
+    merged = ET.Element("testsuites")
+    totals = {"tests": 0, "failures": 0, "errors": 0, "skipped": 0}
+
+    for worker_id, (process, log, log_path, junit_path, nodeids, started) in processes.items():
+        return_code = process.wait()
+        log.close()
+        duration = time.time() - started
+
+        suite = _read_junit(junit_path)
+        if suite is None:
+            # воркер упал до того, как записал отчёт — считаем все его тесты ошибками
+            suite = ET.Element("testsuite", tests=str(len(nodeids)), failures="0",
+                               errors=str(len(nodeids)), skipped="0")
+            ET.SubElement(suite, "error", message=f"worker {worker_id} exited with code {return_code}")
+
+        suite.set("name", f"pytest-worker-{worker_id}")
+        merged.append(suite)
+        stats = {key: int(suite.get(key, 0)) for key in totals}
+        for key, value in stats.items():
+            totals[key] += value
+
+        failed = stats["failures"] + stats["errors"]
+        status = "FAILED" if failed or return_code not in (0, 5) else "ok"
+        write_line(f"worker {worker_id}: {stats['tests']} tests, {failed} failed, "
+                   f"{stats['skipped']} skipped in {duration:.1f}s [{status}] log: {log_path}")
+
+        # вывод упавших воркеров показываем целиком, остальных — только при -v
+        if status == "FAILED" or verbosity > 0:
+            write_line(f"----- worker {worker_id} output -----")
+            write_line(log_path.read_text(encoding="utf-8"))
+
+    for key, value in totals.items():
+        merged.set(key, str(value))
+    merged_path = report_dir / MERGED_REPORT
+    ET.ElementTree(merged).write(merged_path, encoding="utf-8", xml_declaration=True)
+
+    write_line(f"parallel run: {totals['tests']} tests, {totals['failures']} failures, "
+               f"{totals['errors']} errors, {totals['skipped']} skipped. Report: {merged_path}")
+    return totals["failures"] + totals["errors"]
@@ -1,27 +1,21 @@
+from stepik_autotests_final_task.known_issues import SEVERITIES, StoreView, store
 
 
 class ProblematicUrls:
     """
     Class to store known problematic URLs.
+    URL берутся из хранилища известных багов (data/known_issues.json), ключ — имя бага.
     """
 
-    UI_BUGS = {'product_name_bug': 'http://selenium1py.pythonanywhere.com/catalogue/coders-at-work_207/?promo=offer7'}
+    UI_BUGS = StoreView(lambda issue_store: issue_store.urls(issue_store.by_category("ui")))
 
-    ALL_PROBLEMATIC_URLS = {
-        **UI_BUGS
-    }
+    ALL_PROBLEMATIC_URLS = StoreView(lambda issue_store: issue_store.urls(issue_store.issues))
 
     @staticmethod
     def get_urls_by_severity(severity="all"):
         """Get URLs based on the severity level."""
-        severities = {
-            "critical": [],
-            "high": [],
-            "medium": [],
-            "low": ["product_name_bug"]
-        }
-
         if severity == "all":
             return ProblematicUrls.ALL_PROBLEMATIC_URLS
-        else:
-            return {k: ProblematicUrls.ALL_PROBLEMATIC_URLS[k] for k in severities.get(severity, [])}
\ No newline at end of file
+        if severity not in SEVERITIES:
+            return {}
+        return store.urls(store.by_severity(severity))
@@ -0,0 +1,145 @@
+import json
+import urllib.error
+import urllib.request
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+# типы ресурсов и шаблоны URL, по которым они блокируются
+RESOURCE_PATTERNS = {
+    "images": ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.svg", "*.webp", "*.ico", "*.bmp"],
+    "fonts": ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"],
+    "media": ["*.mp4", "*.webm", "*.ogg", "*.mp3", "*.wav"],
+    "stylesheets": ["*.css"],
+    "third-party": ["*googletagmanager.com*", "*google-analytics.com*", "*fonts.googleapis.com*",
+                    "*fonts.gstatic.com*", "*doubleclick.net*", "*facebook.net*"],
+}
+
+# что блокируется, если указать --block-resources без значения
+DEFAULT_BLOCKED_TYPES = "images,fonts,media,third-party"
+
+# типы, которые Firefox умеет отключать настройками (шаблонов URL в Firefox нет)
+FIREFOX_TYPES = ("images", "fonts", "media")
+
+# сколько HEAD-запросов выполняется одновременно при оценке размера заблокированных ресурсов
+SIZE_ESTIMATE_THREADS = 16
+
+
+def blocked_patterns(types: str, extra_patterns: Optional[List[str]] = None) -> List[str]:
+    """
+    Собирает список шаблонов URL для блокировки.
+    :param types: типы ресурсов через запятую (images, fonts, media, stylesheets, third-party)
+    :param extra_patterns: дополнительные шаблоны URL
+    """
+    patterns = []
+    for resource_type in filter(None, (t.strip() for t in types.split(","))):
+        if resource_type not in RESOURCE_PATTERNS:
+            raise ValueError(f"Unknown resource type '{resource_type}', "
+                             f"expected one of: {', '.join(RESOURCE_PATTERNS)}")
+        patterns.extend(RESOURCE_PATTERNS[resource_type])
+    return patterns + list(extra_patterns or [])
+
+
+def check_browser_support(browser_name: str, types: str, extra_patterns: Optional[List[str]] = None) -> None:
+    """
+    Проверяет, что браузер умеет блокировать всё запрошенное, чтобы опции не игнорировались молча.
+    :raises ValueError: неизвестный тип или то, что браузер не блокирует
+    """
+    blocked_patterns(types)
+    if browser_name != "firefox":
+        return
+    unsupported = [t.strip() for t in types.split(",") if t.strip() and t.strip() not in FIREFOX_TYPES]
+    if unsupported:
+        raise ValueError(f"Firefox can only block {', '.join(FIREFOX_TYPES)}, not {', '.join(unsupported)}")
+    if extra_patterns:
+        raise ValueError("Firefox does not support blocking by URL pattern (--block-url)")
+
+
+def configure_chrome_options(options) -> None:
+    """Включает performance-лог Chrome: по нему считаются заблокированные запросы."""
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
+
+def enable_chrome_blocking(browser, patterns: List[str]) -> None:
+    """Блокирует запросы по шаблонам через Chrome DevTools Protocol."""
+    browser.execute_cdp_cmd("Network.enable", {})
+    browser.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+
+
+def configure_firefox_options(options, types: str) -> None:
+    """
+    В Firefox нет блокировки по шаблонам URL, поэтому типы ресурсов отключаются настройками.
+    Заблокированные запросы в Firefox не считаются.
+    """
+    resource_types = {t.strip() for t in types.split(",")}
+    if "images" in resource_types:
+        options.set_preference("permissions.default.image", 2)
+    if "fonts" in resource_types:
+        options.set_preference("browser.display.use_document_fonts", 0)
+    if "media" in resource_types:
+        options.set_preference("media.autoplay.default", 5)
+        options.set_preference("media.preload.default", 0)
+
+
+def collect_blocked_requests(browser) -> List[str]:
+    """
+    Читает performance-лог Chrome и возвращает URL заблокированных запросов.
+    Лог при чтении очищается, поэтому вызов в начале теста сбрасывает данные прошлых тестов.
+    """
+    if not hasattr(browser, "execute_cdp_cmd"):
+        return []
+    urls: Dict[str, str] = {}
+    blocked: List[str] = []
+    for entry in browser.get_log("performance"):
+        message = json.loads(entry["message"])["message"]
+        params = message.get("params", {})
+        if message.get("method") == "Network.requestWillBeSent":
+            urls[params["requestId"]] = params["request"]["url"]
+        elif message.get("method") == "Network.loadingFailed" and params.get("blockedReason"):
+            blocked.append(urls.get(params["requestId"], ""))
+    return blocked
+
+
+def _content_length(url: str) -> Optional[int]:
+    """Размер ресурса по HEAD-запросу (Content-Length) или None, если сервер его не сообщил."""
+    try:
+        request = urllib.request.Request(url, method="HEAD")
+        with urllib.request.urlopen(request, timeout=2) as response:
+            length = response.headers.get("Content-Length")
+            return int(length) if length else None
+    except (urllib.error.URLError, ValueError, OSError):
+        return None
+
+
+class SizeEstimator:
+    """
+    Оценка, сколько байт заняли бы заблокированные ресурсы: заблокированные запросы не загружаются,
+    поэтому размер берётся из Content-Length по HEAD-запросам. Это сетевые запросы, поэтому они
+    выполняются в фоновых потоках (по одному на URL за сессию), а тест их не ждёт;
+    итоги собираются в конце сессии. Включается опцией.
+    """
+
+    def __init__(self, threads: int = SIZE_ESTIMATE_THREADS):
+        self._executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="block-size")
+        self._sizes: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, blocked_urls: Iterable[str]) -> None:
+        """Ставит в очередь HEAD-запросы для URL, размер которых ещё не запрашивался."""
+        with self._lock:
+            for url in blocked_urls:
+                if url and url not in self._sizes:
+                    self._sizes[url] = self._executor.submit(_content_length, url)
+
+    def total(self, blocked_urls: Iterable[str]) -> int:
+        """
+        Сумма известных размеров (ждёт ответы на HEAD-запросы).
+        :param blocked_urls: URL заблокированных запросов (повторы считаются каждый раз)
+        :return: байты
+        """
+        blocked_urls = [url for url in blocked_urls if url]
+        self.submit(blocked_urls)
+        return sum(self._sizes[url].result() or 0 for url in blocked_urls)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
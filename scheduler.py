@@ -0,0 +1,75 @@
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from stepik_autotests_final_task.browser_pool import BrowserKey
+
+# тестам с этими маркерами всегда нужен отдельный браузер, даже с --browser_pool
+FRESH_BROWSER_MARKERS = ("headed", "isolated", "bidi")
+
+# что нужно тесту от браузера: конфигурация (None — браузер не нужен) и нужен ли отдельный экземпляр
+Requirement = Tuple[Optional[BrowserKey], bool]
+
+
+def browser_requirement(item, browser_name: str, language: str, headed: bool) -> Requirement:
+    """
+    Определяет, какой браузер нужен тесту.
+    :param item: pytest item (или request.node в фикстуре)
+    :param browser_name: значение --browser_name
+    :param language: значение --language
+    :param headed: значение --headed
+    :return: (конфигурация (browser_name, language, headed) или None для browserless, нужен ли отдельный браузер)
+    """
+    if item.get_closest_marker("browserless") is not None:
+        return None, False
+    headed = headed or item.get_closest_marker("headed") is not None
+    fresh = any(item.get_closest_marker(name) is not None for name in FRESH_BROWSER_MARKERS)
+    return (browser_name, language, headed), fresh
+
+
+def group_items(items: Sequence, requirement_of: Callable[[object], Requirement]) -> List[list]:
+    """
+    Группирует тесты по требуемому браузеру.
+    Группы идут в порядке первого теста, внутри группы сохраняется порядок файлов.
+    :return: список групп
+    """
+    groups: Dict[Hashable, list] = OrderedDict()
+    for item in items:
+        groups.setdefault(requirement_of(item), []).append(item)
+    return list(groups.values())
+
+
+def count_launches(items: Sequence, requirement_of: Callable[[object], Requirement], pooled: bool,
+                   max_browsers: int = 0) -> int:
+    """
+    Считает, сколько раз будет запущен браузер, если выполнить тесты в этом порядке в одном процессе.
+    :param pooled: работает ли --browser_pool
+    :param max_browsers: сколько браузеров пул держит одновременно (0 — без ограничения)
+    :return: количество запусков
+    """
+    launches = 0
+    alive: "OrderedDict[BrowserKey, None]" = OrderedDict()
+    for item in items:
+        key, fresh = requirement_of(item)
+        if key is None:
+            continue
+        if not pooled or fresh:
+            launches += 1
+            continue
+        if key in alive:
+            alive.move_to_end(key)
+            continue
+        launches += 1
+        alive[key] = None
+        if max_browsers and len(alive) > max_browsers:
+            alive.popitem(last=False)
+    return launches
+
+
+def describe_requirement(requirement: Requirement) -> str:
+    """Короткое описание конфигурации для отчёта."""
+    key, fresh = requirement
+    if key is None:
+        return "no browser"
+    browser_name, language, headed = key
+    mode = "headed" if headed else "headless"
+    return f"{browser_name}/{language}/{mode}{' (fresh)' if fresh else ''}"
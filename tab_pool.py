@@ -0,0 +1,175 @@
+import inspect
+import time
+from typing import Any, Callable, List, Optional
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.remote.webdriver import WebDriver
+
+
+class TabResult:
+    """Результат проверки одного URL во вкладке."""
+
+    __slots__ = ("url", "passed", "value", "error", "seconds")
+
+    def __init__(self, url: str, passed: bool, value: Any = None, error: Optional[BaseException] = None,
+                 seconds: float = 0.0):
+        self.url = url
+        self.passed = passed
+        self.value = value
+        self.error = error
+        self.seconds = seconds
+
+    def __repr__(self) -> str:
+        status = "passed" if self.passed else f"failed: {type(self.error).__name__}: {self.error}"
+        return f"TabResult({self.url}, {status}, {self.seconds:.2f}s)"
+
+
+class _TabTask:
+    """Состояние проверки во вкладке: страница, генератор сценария и условие, которого он ждёт."""
+
+    def __init__(self, url: str, page, deadline: float):
+        self.url = url
+        self.page = page
+        self.deadline = deadline
+        self.started = time.monotonic()
+        self.flow = None
+        # None — ждём готовности страницы; иначе условие, которое вернул yield сценария
+        self.condition: Optional[Callable] = None
+
+
+class TabPool:
+    """
+    Выполняет независимые проверки страниц в нескольких вкладках одного браузера.
+    Загрузки всех вкладок идут параллельно, а WebDriver по очереди обходит вкладки
+    и продолжает ту, чья страница уже готова.
+
+    Сценарий (flow) получает page object открытой страницы. Обычная функция выполняется целиком.
+    Генератор может отдавать управление: yield условие(driver) — вкладка продолжится, когда оно станет
+    истинным, а пока ждут другие вкладки; значение условия возвращается из yield.
+    """
+
+    def __init__(self, browser: WebDriver, size: int = 4, page_class=None, timeout: float = 30,
+                 poll_frequency: float = 0.1):
+        """
+        :param browser: экземпляр WebDriver
+        :param size: сколько вкладок держать открытыми
+        :param page_class: класс page object (по умолчанию ProductPage)
+        :param timeout: сколько ждать одну проверку, включая загрузку страницы
+        :param poll_frequency: пауза, если ни одна вкладка не продвинулась за обход
+        """
+        if page_class is None:
+            from stepik_autotests_final_task.pages.product_page import ProductPage
+            page_class = ProductPage
+        self.browser = browser
+        self.size = size
+        self.page_class = page_class
+        self.timeout = timeout
+        self.poll_frequency = poll_frequency
+
+    def run(self, urls: List[str], flow: Callable) -> List[TabResult]:
+        """
+        Проверяет все URL сценарием flow.
+        :return: результаты в порядке urls
+        """
+        results = {}
+        pending = list(enumerate(urls))
+        main_handle = self.browser.current_window_handle
+        old_implicit_wait = self.browser.timeouts.implicit_wait
+        handles = [main_handle]
+        tasks = {}
+        try:
+            while len(handles) < min(self.size, len(urls)):
+                self.browser.switch_to.new_window("tab")
+                handles.append(self.browser.current_window_handle)
+
+            while pending or tasks:
+                progressed = False
+                for handle in handles:
+                    if handle not in tasks:
+                        if not pending:
+                            continue
+                        self.browser.switch_to.window(handle)
+                        index, url = pending.pop(0)
+                        tasks[handle] = (index, self._start(url))
+                        progressed = True
+                        continue
+
+                    index, task = tasks[handle]
+                    self.browser.switch_to.window(handle)
+                    result = self._advance(task, flow)
+                    if result is None:
+                        continue
+                    progressed = True
+                    results[index] = result
+                    del tasks[handle]
+
+                if not progressed:
+                    time.sleep(self.poll_frequency)
+        finally:
+            for handle in handles[1:]:
+                try:
+                    self.browser.switch_to.window(handle)
+                    self.browser.close()
+                except WebDriverException:
+                    pass
+            self.browser.switch_to.window(main_handle)
+            self.browser.implicitly_wait(old_implicit_wait)
+
+        return [results[index] for index in range(len(urls))]
+
+    def _start(self, url: str) -> _TabTask:
+        """Создаёт page object и начинает загрузку страницы в текущей вкладке."""
+        page = self.page_class(self.browser, url)
+        task = _TabTask(url, page, time.monotonic() + self.timeout)
+        try:
+            page.start_navigation()
+        except WebDriverException:
+            # about:blank новой вкладки не выполняет скрипты в некоторых браузерах
+            self.browser.get(url)
+        return task
+
+    def _check(self, condition: Callable):
+        """Проверяет условие без неявного ожидания: вкладка не должна задерживать остальные."""
+        self.browser.implicitly_wait(0)
+        try:
+            return condition(self.browser)
+        except WebDriverException:
+            return False
+
+    def _advance(self, task: _TabTask, flow: Callable) -> Optional[TabResult]:
+        """
+        Продвигает проверку во вкладке, если то, чего она ждёт, уже наступило.
+        :return: результат, если проверка закончилась, иначе None
+        """
+        if task.flow is None:
+            waiting_for = lambda driver: task.page.is_ready()
+        else:
+            waiting_for = task.condition
+        value = self._check(waiting_for) if waiting_for is not None else True
+
+        if not value:
+            if time.monotonic() > task.deadline:
+                what = "page to be ready" if task.flow is None else "flow condition"
+                return self._result(task, False, error=TimeoutException(f"Timed out waiting for {what}"))
+            return None
+
+        self.browser.implicitly_wait(task.page.wait._timeout)
+        try:
+            if task.flow is None:
+                outcome = flow(task.page)
+                if not inspect.isgenerator(outcome):
+                    return self._result(task, True, value=outcome)
+                task.flow = outcome
+                task.condition = next(task.flow)
+            else:
+                task.condition = task.flow.send(value)
+        except StopIteration as stop:
+            return self._result(task, True, value=stop.value)
+        except Exception as error:
+            return self._result(task, False, error=error)
+        return None
+
+    @staticmethod
+    def _result(task: _TabTask, passed: bool, value: Any = None,
+                error: Optional[BaseException] = None) -> TabResult:
+        return TabResult(task.url, passed, value, error, time.monotonic() - task.started)
@@ -0,0 +1,25 @@
+import pytest
+
+from stepik_autotests_final_task.pages.basket_page import BasketPage
+from stepik_autotests_final_task.pages.locators import BasketPageLocators
+from stepik_autotests_final_task.urls import Urls
+
+# ================================================
+# Test run commands:
+# pytest -s test_basket_page.py --base-url local
+# ================================================
+
+product_page_link = Urls.product_page_url("the-city-and-the-stars_95", "en-gb")
+basket_page_link = Urls.basket_page_url("en-gb")
+
+
+@pytest.mark.ui
+def test_guest_can_see_seeded_product_in_basket(browser, basket_seeder):
+    # Корзина наполняется HTTP-запросом, cookie сессии переносятся в браузер
+    basket_seeder.add_product(product_page_link)
+    basket_seeder.inject_into(browser, Urls.BASE_URL)
+
+    page = BasketPage(browser, basket_page_link)
+    page.open()
+    page.should_be_basket_page()
+    assert page.is_element_present(*BasketPageLocators.ITEMS_IN_BASKET), "Seeded product is not in the basket"
@@ -6,6 +6,7 @@ from stepik_autotests_final_task.pages.main_page import MainPage
 from stepik_autotests_final_task.pages.base_page import BasePage
 
 from stepik_autotests_final_task.pages.locators import MainPaigeLocators, LoginPageLocators, BasePageLocators
+from stepik_autotests_final_task.urls import Urls
 
 login_link_element = BasePageLocators.LOGIN_LINK
 login_form_element = LoginPageLocators.LOGIN_FORM
@@ -13,8 +14,8 @@ registration_form_element = LoginPageLocators.REGISTRATION_FORM
 
 # pytest -v --tb=line test_login_page.py
 
-login_page_link = "http://selenium1py.pythonanywhere.com/fi/accounts/login/"
-link = "http://selenium1py.pythonanywhere.com"
+login_page_link = f"{Urls.BASE_URL}/fi/accounts/login/"
+link = Urls.BASE_URL
 
 def test_should_be_login_page(browser):
     #
@@ -23,6 +24,7 @@ def test_should_be_login_page(browser):
     page.should_be_login_page()
 
 
+@pytest.mark.browserless
 def test_guest_should_go_to_login_page(browser):
     page = MainPage(browser, link)
     page.open()
@@ -1,3 +1,5 @@
+import asyncio
+
 import pytest
 import selenium
 from selenium.webdriver.common.by import By
@@ -6,12 +8,13 @@ import locale
 from stepik_autotests_final_task.pages.main_page import MainPage
 from stepik_autotests_final_task.pages.login_page import LoginPage
 from stepik_autotests_final_task.pages.basket_page import BasketPage
+from stepik_autotests_final_task.pages.async_base_page import AsyncBasePage, BidiEvents
 
 from stepik_autotests_final_task.pages.locators import MainPaigeLocators, LoginPageLocators
 from stepik_autotests_final_task.conftest import translation_fixture
 from stepik_autotests_final_task.urls import Urls
 
-link = "http://selenium1py.pythonanywhere.com/"
+link = f"{Urls.BASE_URL}/"
 
 main_page_url = Urls.main_page_url("en-gb")
 
@@ -58,6 +61,7 @@ class TestLoginFromMainPage:
         page.open()  # открываем страницу
         page.go_to_login_page()  # выполняем метод страницы — переходим на страницу логина
 
+    @pytest.mark.browserless
     @pytest.mark.parametrize("link", [main_page_url])
     def test_guest_should_see_login_link(self, browser, link):
         """
@@ -70,3 +74,23 @@ class TestLoginFromMainPage:
         # передаем в конструктор экземпляр драйвера и url адрес
         page.open()  # открываем страницу
         page.should_be_login_link()  # выполняем метод страницы — проверяем наличие ссылки на логин
+
+
+@pytest.mark.bidi
+def test_guest_can_go_to_login_and_basket_pages_concurrently(browser):
+    """
+    Two page flows in separate tabs of one browser, awaited together over WebDriver BiDi.
+    :param browser:
+    :return:
+    """
+    async def flows():
+        async with BidiEvents(browser) as events:
+            login_flow = AsyncBasePage(browser, main_page_url, events)
+            basket_flow = await AsyncBasePage.in_new_tab(browser, main_page_url, events)
+            await asyncio.gather(login_flow.open(), basket_flow.open())
+            await asyncio.gather(login_flow.go_to_login_page(), basket_flow.go_to_basket_from_header())
+            return await login_flow.current_url(), await basket_flow.current_url()
+
+    login_url, basket_url = asyncio.run(flows())
+    assert "login" in login_url, "Not on the login page"
+    assert basket_url.endswith("/basket/"), "Not on the basket page"
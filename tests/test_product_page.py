@@ -5,6 +5,11 @@ from stepik_autotests_final_task.pages.product_page import ProductPage
 from stepik_autotests_final_task.decorators import Decorators
 from stepik_autotests_final_task.urls import Urls
 from stepik_autotests_final_task.pages.basket_page import BasketPage
+from stepik_autotests_final_task.pages.locators import BasePageLocators, ProductPageLocators
+from stepik_autotests_final_task.pages.dom_snapshot import DomSnapshot
+from stepik_autotests_final_task.pages.js_scripts import CAPTURE_SNAPSHOT
+from stepik_autotests_final_task.tab_pool import TabPool
+from selenium.webdriver.support import expected_conditions as EC
 
 # ================================================
 # Test run commands:
@@ -15,14 +20,30 @@ from stepik_autotests_final_task.pages.basket_page import BasketPage
 # pytest -s -v -m ui
 # ================================================
 
-product_base_link = "http://selenium1py.pythonanywhere.com/catalogue/coders-at-work_207/"
-product_page_link = "http://selenium1py.pythonanywhere.com/en-gb/catalogue/the-city-and-the-stars_95/"
+product_base_link = f"{Urls.PROMO_BASE_URL}/"
+product_page_link = f"{Urls.BASE_URL}/en-gb/catalogue/the-city-and-the-stars_95/"
 link_list = [f"{product_base_link}/?promo=offer{no}" for no in range(10)]
 bugged_link = f"{product_base_link}/?promo=offer7"
 link_list.remove(bugged_link)  # Remove the buggy link from the main list
 
 product_page_link = Urls.product_page_url("the-city-and-the-stars_95", "en-gb")
 
+
+def add_to_basket_in_tab(added_to_basket_message: str):
+    """Сценарий для TabPool: добавляет товар в корзину и отдаёт вкладку другим, пока грузится ответ."""
+    def flow(page: ProductPage):
+        page.set_product_name()
+        page.set_product_price()
+        button = page.browser.find_element(*ProductPageLocators.ADD_TO_BASKET_BTN)
+        page.click_add_to_basket()
+        page.solve_quiz_if_present()
+        yield EC.staleness_of(button)
+        yield lambda driver: page.is_ready()
+        page.should_be_added_to_basket_message(added_to_basket_message)
+        page.should_match_product_name_in_basket()
+    return flow
+
+
 class TestProductPage:
     """
     A set of tests for the product page on the site.
@@ -76,10 +97,7 @@ class TestProductPage:
         page.click_add_to_basket()
 
         # 3.1️⃣ Handle quiz alert if present
-        try:
-            page.solve_quiz_and_get_code()
-        except Exception:
-            pass  # alert may not appear
+        page.solve_quiz_if_present()
 
         # 4️⃣ Check success message
         page.should_be_added_to_basket_message(added_to_basket_message)
@@ -90,6 +108,23 @@ class TestProductPage:
         # 6️⃣ Check product price in the message
         page.should_match_product_price_in_basket()
 
+    @pytest.mark.ui
+    def test_guest_can_add_promo_products_to_basket_in_tabs(
+        self,
+        browser: WebDriver,
+        translation_fixture: dict[str, str]
+    ) -> None:
+        """
+        Checks all promo links (except the known bugged one) in several tabs of one browser.
+
+        :param browser: WebDriver instance
+        :param translation_fixture: dictionary with message texts in the selected language
+        """
+        results = TabPool(browser, size=4).run(link_list, add_to_basket_in_tab(translation_fixture["added_to_basket"]))
+
+        failed = [result for result in results if not result.passed]
+        assert not failed, f"Promo checks failed: {failed}"
+
     @pytest.mark.ui
     @pytest.mark.parametrize("link", [product_base_link])
     @Decorators.no_implicit_wait
@@ -169,6 +204,34 @@ class TestProductPage:
 
     @pytest.mark.ui
     @pytest.mark.parametrize("link", [product_page_link])
+    def test_snapshot_texts_match_live_texts(self, browser: WebDriver, link: str) -> None:
+        """
+        Checks that the DOM snapshot (--snapshot_cache) returns the same texts as WebElement.text
+        for every page locator after adding a product to the basket.
+        Run on the local store: pytest -s test_product_page.py --base-url local
+
+        :param browser: WebDriver instance
+        :param link: URL of the product page
+        """
+        page = ProductPage(browser, link)
+        page.open()
+        page.click_add_to_basket()
+        page.is_ready()
+
+        browser.implicitly_wait(0)  # ненайденные локаторы не должны ждать
+        snapshot = DomSnapshot(browser.execute_script(CAPTURE_SNAPSHOT))
+        for locators in (BasePageLocators, ProductPageLocators):
+            for name, locator in vars(locators).items():
+                if not (isinstance(locator, tuple) and len(locator) == 2):
+                    continue
+                snapshot_texts = snapshot.get_texts(*locator)
+                live_texts = [element.text for element in browser.find_elements(*locator)]
+                assert snapshot_texts == live_texts, \
+                    f"{locators.__name__}.{name}: snapshot {snapshot_texts} != live {live_texts}"
+
+    @pytest.mark.ui
+    @pytest.mark.browserless
+    @pytest.mark.parametrize("link", [product_page_link])
     def test_guest_should_see_login_link_on_product_page(self, browser, link: str) -> None:
 
         page = ProductPage(browser, link)
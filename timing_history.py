@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Замер времени тестов по фазам и история замеров в SQLite.
+
+Отчёт по истории:
+    python -m stepik_autotests_final_task.timing_history timings.sqlite
+"""
+
+import argparse
+import functools
+import math
+import sqlite3
+import statistics
+import subprocess
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+# фазы, которые хранятся в истории:
+# launch/navigation/wait/assertion — время внутри теста по видам работы,
+# setup/call/teardown/total — время фаз pytest (launch — в фазе, где тест впервые обратился к браузеру, обычно call)
+PHASES = ("launch", "navigation", "wait", "assertion", "setup", "call", "teardown", "total")
+
+
+class PhaseTimer:
+    """
+    Накапливает время текущего теста по фазам.
+    Вложенные фазы не считаются дважды: время вложенной фазы вычитается из внешней.
+    """
+
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+        self._stack: List[list] = []
+
+    def reset(self) -> None:
+        """Очищает замеры перед новым тестом."""
+        self.phases = {}
+        self._stack = []
+
+    def add(self, name: str, seconds: float) -> None:
+        """Добавляет время к фазе."""
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    @contextmanager
+    def phase(self, name: str):
+        """Контекстный менеджер: время внутри блока относится к фазе name."""
+        frame = [name, 0.0]  # имя фазы и время вложенных фаз
+        self._stack.append(frame)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self._stack.pop()
+            self.add(name, elapsed - frame[1])
+            if self._stack:
+                self._stack[-1][1] += elapsed
+
+
+# замеры текущего теста
+phase_timer = PhaseTimer()
+
+
+def timed(phase_name: str):
+    """Декоратор: время вызова функции относится к фазе phase_name."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with phase_timer.phase(phase_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def current_commit() -> str:
+    """Короткий хэш текущего коммита или 'unknown', если git недоступен."""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+class TimingHistory:
+    """История замеров тестов в SQLite."""
+
+    def __init__(self, path: str):
+        """
+        :param path: путь к файлу базы
+        """
+        # timeout — чтобы параллельные воркеры дожидались блокировки записи
+        self._connection = sqlite3.connect(path, timeout=30)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        columns = ", ".join(f"{phase} REAL NOT NULL DEFAULT 0" for phase in PHASES)
+        self._connection.executescript(f"""
+            CREATE TABLE IF NOT EXISTS runs (
+                id INTEGER PRIMARY KEY,
+                test_id TEXT NOT NULL,
+                browser TEXT NOT NULL,
+                language TEXT NOT NULL,
+                commit_sha TEXT NOT NULL,
+                started_at REAL NOT NULL,
+                outcome TEXT NOT NULL,
+                {columns}
+            );
+            CREATE INDEX IF NOT EXISTS runs_by_test
+                ON runs (test_id, browser, language, started_at);
+            CREATE INDEX IF NOT EXISTS runs_by_commit ON runs (commit_sha);
+        """)
+
+    def record(self, test_id: str, browser: str, language: str, commit_sha: str,
+               outcome: str, phases: Dict[str, float], started_at: Optional[float] = None) -> None:
+        """Сохраняет замеры одного теста."""
+        names = [phase for phase in PHASES if phase in phases]
+        placeholders = ", ".join("?" for _ in names)
+        with self._connection:
+            self._connection.execute(
+                f"INSERT INTO runs (test_id, browser, language, commit_sha, started_at, outcome"
+                f"{''.join(', ' + name for name in names)}) VALUES (?, ?, ?, ?, ?, ?"
+                f"{', ' + placeholders if names else ''})",
+                (test_id, browser, language, commit_sha, started_at or time.time(), outcome,
+                 *(phases[name] for name in names)),
+            )
+
+    def durations(self, phase: str = "total", outcome: str = "passed") -> Dict[tuple, List[float]]:
+        """
+        Возвращает замеры фазы по тестам в порядке запуска.
+        :param outcome: итог запусков, которые попадают в замеры; пропущенные и xfail-тесты
+                        почти ничего не выполняют и занизили бы базовую линию и перцентили
+        :return: {(test_id, browser, language): [секунды, ...]}
+        """
+        if phase not in PHASES:
+            raise ValueError(f"Unknown phase: {phase}")
+        result: Dict[tuple, List[float]] = {}
+        rows = self._connection.execute(
+            f"SELECT test_id, browser, language, {phase} FROM runs "
+            f"WHERE outcome = ? ORDER BY test_id, browser, language, started_at", (outcome,))
+        for test_id, browser, language, seconds in rows:
+            result.setdefault((test_id, browser, language), []).append(seconds)
+        return result
+
+    def close(self) -> None:
+        self._connection.close()
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Перцентиль q (0..100) с линейной интерполяцией."""
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q / 100
+    low, high = math.floor(position), math.ceil(position)
+    return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+
+def is_regression(values: List[float], recent: int = 5, min_baseline: int = 5,
+                  t_threshold: float = 2.0, min_slowdown: float = 0.1) -> bool:
+    """
+    Проверяет, что последние recent замеров статистически медленнее предыдущих (t-тест Уэлча).
+    :param values: замеры в порядке запуска
+    :param min_slowdown: минимальное относительное замедление среднего, чтобы не реагировать на шум
+    """
+    recent = max(recent, 2)
+    if len(values) < recent + min_baseline:
+        return False
+    baseline, latest = values[:-recent], values[-recent:]
+    mean_base, mean_latest = statistics.fmean(baseline), statistics.fmean(latest)
+    if mean_latest <= mean_base * (1 + min_slowdown):
+        return False
+    error = math.sqrt(statistics.variance(baseline) / len(baseline) + statistics.variance(latest) / len(latest))
+    if error == 0:
+        return True
+    return (mean_latest - mean_base) / error > t_threshold
+
+
+def report(path: str, phase: str = "total", recent: int = 5) -> None:
+    """Печатает p50/p95/p99 по успешным запускам тестов и отмечает замедлившиеся."""
+    history = TimingHistory(path)
+    try:
+        durations = history.durations(phase, outcome="passed")
+    finally:
+        history.close()
+
+    print(f"{'p50':>8} {'p95':>8} {'p99':>8} {'runs':>5}  test ({phase})")
+    for (test_id, browser, language), values in sorted(durations.items()):
+        flag = "  ⚠️ REGRESSION" if is_regression(values, recent=recent) else ""
+        print(f"{percentile(values, 50):8.3f} {percentile(values, 95):8.3f} {percentile(values, 99):8.3f} "
+              f"{len(values):5d}  {test_id} [{browser}, {language}]{flag}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Test timing history report")
+    parser.add_argument("db", help="path to the SQLite history (--timing_history)")
+    parser.add_argument("--phase", default="total", choices=PHASES)
+    parser.add_argument("--recent", type=int, default=5, help="how many latest runs to compare with the baseline")
+    args = parser.parse_args()
+    report(args.db, args.phase, args.recent)
@@ -0,0 +1,118 @@
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+
+class Span:
+    """Один шаг page object: имя, аргументы, время начала, длительность и результат."""
+
+    __slots__ = ("name", "args", "kwargs", "start", "duration", "outcome", "error", "thread_id")
+
+    def __init__(self, name, args, kwargs, start, duration, outcome, error=None):
+        self.name = name
+        self.args = args
+        self.kwargs = kwargs
+        self.start = start
+        self.duration = duration
+        self.outcome = outcome
+        self.error = error
+        self.thread_id = threading.get_ident()
+
+    def to_dict(self) -> dict:
+        # repr аргументов считаем только при сбросе на диск, а не на каждом вызове
+        return {
+            "name": self.name,
+            "args": [_short_repr(arg) for arg in self.args],
+            "kwargs": {key: _short_repr(value) for key, value in self.kwargs.items()},
+            "start": self.start,
+            "duration": self.duration,
+            "outcome": self.outcome,
+            "error": None if self.error is None else f"{type(self.error).__name__}: {self.error}",
+        }
+
+
+def _short_repr(value, limit: int = 200) -> str:
+    text = repr(value)
+    return text if len(text) <= limit else text[:limit] + "..."
+
+
+class Tracer:
+    """
+    Трассировка шагов page objects в кольцевой буфер в памяти.
+    Когда трассировка выключена, обёртка только проверяет флаг и вызывает функцию.
+    """
+
+    def __init__(self, capacity: int = 2000):
+        """
+        :param capacity: сколько последних шагов хранить
+        """
+        self.enabled = False
+        self._spans = deque(maxlen=capacity)
+
+    def record(self, name: str, args: tuple, kwargs: dict, start: float, duration: float,
+               outcome: str, error: Optional[BaseException] = None) -> None:
+        """Добавляет шаг в буфер."""
+        self._spans.append(Span(name, args, kwargs, start, duration, outcome, error))
+
+    def spans(self) -> list:
+        """Возвращает копию записанных шагов."""
+        return list(self._spans)
+
+    def clear(self) -> None:
+        """Очищает буфер."""
+        self._spans.clear()
+
+    def trace(self, func):
+        """Декоратор: записывает каждый вызов func как шаг."""
+        if getattr(func, "__traced__", False):
+            return func
+        name = func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not self.enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            except BaseException as e:
+                self.record(name, args[1:], kwargs, start, time.perf_counter() - start, "error", e)
+                raise
+            self.record(name, args[1:], kwargs, start, time.perf_counter() - start, "ok")
+            return result
+
+        wrapper.__traced__ = True
+        return wrapper
+
+    def flush(self, path: str, trace_format: str = "json") -> str:
+        """
+        Сохраняет записанные шаги в файл.
+        :param path: путь к файлу
+        :param trace_format: json — список шагов, chrome — формат trace event (chrome://tracing, Perfetto)
+        :return: путь к файлу
+        """
+        spans = self.spans()
+        if trace_format == "chrome":
+            pid = os.getpid()
+            data = {"traceEvents": [
+                {"name": span.name, "ph": "X", "ts": span.start * 1e6, "dur": span.duration * 1e6,
+                 "pid": pid, "tid": span.thread_id, "args": span.to_dict()}
+                for span in spans
+            ]}
+        else:
+            data = [span.to_dict() for span in spans]
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=1)
+        return path
+
+
+# общий трассировщик для всех page objects
+tracer = Tracer()
@@ -3,9 +3,30 @@ class Urls:
 
     """A class to manage a list of URLs."""
 
-    BASE_URL = "http://selenium1py.pythonanywhere.com"
+    DEFAULT_BASE_URL = "http://selenium1py.pythonanywhere.com"
+    BASE_URL = DEFAULT_BASE_URL
     PROMO_BASE_URL = f"{BASE_URL}/catalogue/coders-at-work_207"
 
+    @classmethod
+    def set_base_url(cls, base_url: str) -> None:
+        """
+        Переключает все URL на другой адрес сайта (например, локальную витрину).
+        :param base_url: адрес сайта без завершающего слэша
+        """
+        cls.BASE_URL = base_url.rstrip("/")
+        cls.PROMO_BASE_URL = f"{cls.BASE_URL}/catalogue/coders-at-work_207"
+
+    @classmethod
+    def rebase(cls, url: str) -> str:
+        """
+        Переносит URL исходного сайта на текущий BASE_URL.
+        :param url: URL, записанный для selenium1py.pythonanywhere.com
+        :return: URL на текущем адресе сайта
+        """
+        if url.startswith(cls.DEFAULT_BASE_URL):
+            return cls.BASE_URL + url[len(cls.DEFAULT_BASE_URL):]
+        return url
+
     # Генерация promo URLs лениво (при обращении)
     @classmethod
     def get_promo_urls(cls, count=10):
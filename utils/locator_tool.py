@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Проверка и оптимизация локаторов из pages/locators.py.
+
+    python -m stepik_autotests_final_task.utils.locator_tool fixtures --base-url http://selenium1py.pythonanywhere.com
+                                                                         # снять HTML страниц с сайта
+    python -m stepik_autotests_final_task.utils.locator_tool validate    # проверить локаторы на сохранённом HTML
+    python -m stepik_autotests_final_task.utils.locator_tool benchmark   # замерить поиск в браузере
+
+validate находит локаторы, которые не находят ничего или находят больше одного элемента,
+предлагает CSS вместо XPath и точные селекторы вместо подстрочных ([class*=...]).
+Замена предлагается, только если на всех сохранённых страницах она находит те же самые элементы.
+
+Страницы в page_fixtures сняты с локальной витрины (fixtures без --base-url). Её разметка написана
+под эти же локаторы, поэтому по ней видно только, что локаторы разбираются и согласованы с витриной;
+--apply переписывает pages/locators.py только по страницам, снятым с настоящего сайта.
+"""
+
+import argparse
+import re
+import statistics
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from selenium.webdriver.common.by import By
+
+from stepik_autotests_final_task.pages import locators as locators_module
+from stepik_autotests_final_task.pages.dom_snapshot import find_lxml_elements, lxml
+
+FIXTURES_DIR = Path(__file__).parent / "page_fixtures"
+
+# файл рядом со страницами: откуда они сняты (адрес сайта или LOCAL_STORE_SOURCE)
+SOURCE_FILE = "source.txt"
+LOCAL_STORE_SOURCE = "local_store"
+
+# локаторы, которые намеренно ничего не находят: validate не считает их ошибкой
+EXPECTED_NOT_FOUND = {
+    "BasePageLocators.LOGIN_LINK_INVALID": "negative check: a login link that must not exist",
+    "ProductPageLocators.BASKET_TOTAL_IN_NAVBAR": "the navbar basket total is not a link, checked as a known bug",
+}
+
+# страницы, на которых проверяется каждый класс локаторов (BasePageLocators — на всех)
+PAGES_BY_CLASS = {
+    "BasketPageLocators": ["basket_empty", "basket_full"],
+    "MainPaigeLocators": ["main", "product"],
+    "LoginPageLocators": ["login"],
+    "ProductPageLocators": ["product", "product_added"],
+}
+
+# локатор медленнее медианы во столько раз считается дорогим
+EXPENSIVE_FACTOR = 3.0
+
+Locator = Tuple[str, str]
+
+
+# ====== Локаторы и страницы ======
+
+def collect_locators() -> Dict[str, Dict[str, Locator]]:
+    """Локаторы из pages/locators.py: {класс: {имя: (by, value)}}. Списки локаторов пропускаются."""
+    strategies = {value for name, value in vars(By).items() if name.isupper()}
+    result = {}
+    for class_name, cls in vars(locators_module).items():
+        if not isinstance(cls, type) or not class_name.endswith("Locators"):
+            continue
+        result[class_name] = {
+            name: value for name, value in vars(cls).items()
+            if isinstance(value, tuple) and len(value) == 2 and value[0] in strategies
+        }
+    return result
+
+
+def load_fixtures(directory: Path = FIXTURES_DIR) -> Dict[str, object]:
+    """Сохранённые страницы: {имя: корень lxml}."""
+    if lxml is None:
+        raise ImportError("locator_tool requires 'lxml' and 'cssselect' (see requirements.txt)")
+    return {path.stem: lxml.html.document_fromstring(path.read_text(encoding="utf-8"))
+            for path in sorted(directory.glob("*.html"))}
+
+
+def pages_for(class_name: str, fixtures: Dict[str, object]) -> List[str]:
+    return [name for name in PAGES_BY_CLASS.get(class_name, fixtures) if name in fixtures]
+
+
+def fixtures_source(directory: Path = FIXTURES_DIR) -> str:
+    """Откуда сняты страницы: адрес сайта или LOCAL_STORE_SOURCE (так же для старых страниц без SOURCE_FILE)."""
+    path = directory / SOURCE_FILE
+    return path.read_text(encoding="utf-8").strip() if path.exists() else LOCAL_STORE_SOURCE
+
+
+def generate_fixtures(directory: Path = FIXTURES_DIR, base_url: Optional[str] = None) -> None:
+    """
+    Снимает HTML страниц через HttpDriver.
+    :param base_url: адрес сайта; None — локальная витрина (local_store)
+    """
+    from stepik_autotests_final_task.http_driver import HttpDriver
+    from stepik_autotests_final_task.local_store import LocalStore
+    from stepik_autotests_final_task.pages.locators import ProductPageLocators
+
+    directory.mkdir(parents=True, exist_ok=True)
+    store = LocalStore() if base_url is None else None
+    base_url = store.start() if store else base_url.rstrip("/")
+    driver = HttpDriver()
+    try:
+        def save(name: str, path: str) -> None:
+            if path is not None:
+                driver.get(f"{base_url}{path}")
+            # адрес витрины меняется от запуска к запуску — в сохранённом HTML его не должно быть
+            (directory / f"{name}.html").write_text(driver.page_source.replace(base_url, ""), encoding="utf-8")
+            print(f"saved {directory / name}.html")
+
+        save("main", "/en-gb/")
+        save("login", "/en-gb/accounts/login/")
+        save("basket_empty", "/en-gb/basket/")
+        save("product", "/en-gb/catalogue/coders-at-work_207/?promo=offer0")
+        driver.find_element(*ProductPageLocators.ADD_TO_BASKET_BTN).click()
+        save("product_added", None)
+        save("basket_full", "/en-gb/basket/")
+        (directory / SOURCE_FILE).write_text(f"{LOCAL_STORE_SOURCE if store else base_url}\n", encoding="utf-8")
+    finally:
+        driver.quit()
+        if store:
+            store.stop()
+
+
+# ====== XPath -> CSS ======
+
+_XPATH_STEP = re.compile(r"(//|/)([A-Za-z_*][\w.-]*)((?:\[[^\[\]]*\])*)")
+_XPATH_PREDICATE = re.compile(r"\[([^\[\]]*)\]")
+_QUOTED = r"""(?:"([^"]*)"|'([^']*)')"""
+
+
+def _css_predicate(predicate: str, tag: str) -> Optional[str]:
+    """Условие шага XPath в виде CSS или None, если эквивалента нет."""
+    parts = []
+    for condition in re.split(r"\s+and\s+", predicate.strip()):
+        match = re.fullmatch(rf"@([\w-]+)\s*=\s*{_QUOTED}", condition)
+        if match:
+            parts.append(f'[{match.group(1)}="{match.group(2) or match.group(3)}"]')
+            continue
+        match = re.fullmatch(rf"(contains|starts-with)\(\s*@([\w-]+)\s*,\s*{_QUOTED}\s*\)", condition)
+        if match:
+            operator = "*=" if match.group(1) == "contains" else "^="
+            parts.append(f'[{match.group(2)}{operator}"{match.group(3) or match.group(4)}"]')
+            continue
+        match = re.fullmatch(r"@([\w-]+)", condition)
+        if match:
+            parts.append(f"[{match.group(1)}]")
+            continue
+        # позиция среди соседей с тем же тегом
+        if tag != "*" and condition == "last()":
+            parts.append(":last-of-type")
+            continue
+        if tag != "*" and condition.isdigit():
+            parts.append(f":nth-of-type({condition})")
+            continue
+        return None  # text(), '.', оси и функции в CSS не выражаются
+    return "".join(parts)
+
+
+def xpath_to_css(xpath: str) -> Optional[str]:
+    """
+    Переводит простой XPath (шаги // и / с условиями на атрибуты и позицию) в CSS.
+    :return: CSS или None, если перевести нельзя
+    """
+    xpath = xpath.strip()
+    if not xpath.startswith("//"):
+        return None
+    css = []
+    position = 0
+    for match in _XPATH_STEP.finditer(xpath):
+        if match.start() != position:
+            return None
+        position = match.end()
+        axis, tag, predicates = match.groups()
+        step = "" if tag == "*" and predicates else tag
+        for predicate in _XPATH_PREDICATE.findall(predicates):
+            condition = _css_predicate(predicate, tag)
+            if condition is None:
+                return None
+            step += condition
+        if css:
+            css.append(" > " if axis == "/" else " ")
+        css.append(step or "*")
+    if position != len(xpath) or not css:
+        return None
+    return "".join(css)
+
+
+def substring_to_exact(css: str) -> Optional[str]:
+    """Заменяет [class*=name] на .name и [id*=x] на [id=x] — кандидат, который ещё нужно проверить."""
+    exact = re.sub(r"""\[class\*=["']?([\w-]+)["']?\]""", r".\1", css)
+    exact = re.sub(r"""\[id\*=["']?([\w-]+)["']?\]""", r'[id="\1"]', exact)
+    return exact if exact != css else None
+
+
+def same_elements(first: Locator, second: Locator, roots: List[object]) -> bool:
+    """True, если на каждой странице оба локатора находят одни и те же элементы и хотя бы где-то находят."""
+    found_any = False
+    for root in roots:
+        try:
+            a, b = find_lxml_elements(root, *first), find_lxml_elements(root, *second)
+        except Exception:
+            return False
+        if a != b:
+            return False
+        found_any = found_any or bool(a)
+    return found_any
+
+
+# ====== validate ======
+
+def validate(fixtures: Dict[str, object], apply: bool = False) -> int:
+    """
+    Печатает отчёт по локаторам.
+    :param apply: если True, проверенные замены записываются в pages/locators.py
+    :return: количество ошибок (локатор не разбирается или ничего не находит, кроме EXPECTED_NOT_FOUND)
+    """
+    problems = 0
+    replacements: Dict[str, str] = {}
+    all_roots = list(fixtures.values())
+    for class_name, class_locators in collect_locators().items():
+        page_names = pages_for(class_name, fixtures)
+        print(f"\n{class_name} ({', '.join(page_names)})")
+        for name, locator in class_locators.items():
+            counts = {}
+            for page in page_names:
+                try:
+                    counts[page] = len(find_lxml_elements(fixtures[page], *locator))
+                except Exception as error:
+                    counts[page] = f"error: {error}"
+            notes = []
+            if any(isinstance(count, str) for count in counts.values()):
+                notes.append("INVALID")
+            elif not any(counts.values()):
+                expected = EXPECTED_NOT_FOUND.get(f"{class_name}.{name}")
+                notes.append(f"not found as expected ({expected})" if expected else "NOT FOUND")
+            elif max(counts.values()) > 1:
+                notes.append("AMBIGUOUS")
+            # несколько элементов — не ошибка: такие локаторы используются в списках проверок
+            problems += "INVALID" in notes or "NOT FOUND" in notes
+
+            how, what = locator
+            suggestion = None
+            if how == By.XPATH:
+                css = xpath_to_css(what)
+                if css and same_elements(locator, (By.CSS_SELECTOR, css), all_roots):
+                    suggestion = css
+                elif not css:
+                    notes.append("xpath: no CSS equivalent")
+            elif how == By.CSS_SELECTOR and "*=" in what:
+                exact = substring_to_exact(what)
+                if exact and same_elements(locator, (By.CSS_SELECTOR, exact), all_roots):
+                    suggestion = exact
+                else:
+                    notes.append("substring match")
+
+            count_text = ", ".join(f"{page}={count}" for page, count in counts.items())
+            print(f"  {name:<34} {count_text}  {' '.join(notes)}")
+            if suggestion:
+                print(f"  {'':<34} -> (By.CSS_SELECTOR, '{suggestion}')")
+                replacements[what] = suggestion
+
+    print(f"\n{problems} problems")
+    if apply and replacements:
+        apply_replacements(Path(locators_module.__file__), replacements)
+    return problems
+
+
+def apply_replacements(path: Path, replacements: Dict[str, str]) -> None:
+    """Заменяет в файле локаторов (By.XPATH / By.CSS_SELECTOR, 'старый') на (By.CSS_SELECTOR, 'новый')."""
+    source = path.read_text(encoding="utf-8")
+    for old, new in replacements.items():
+        quote = "'" if "'" not in new else '"'
+        pattern = re.compile(r"\(By\.(?:XPATH|CSS_SELECTOR),\s*(['\"])" + re.escape(old) + r"\1\)")
+        source = pattern.sub(lambda _: f"(By.CSS_SELECTOR, {quote}{new}{quote})", source)
+    path.write_text(source, encoding="utf-8")
+    print(f"\n{len(replacements)} locators rewritten in {path}")
+
+
+# ====== benchmark ======
+
+def benchmark(fixtures_dir: Path, browser_name: str, iterations: int) -> None:
+    """Замеряет время поиска каждого локатора в браузере на сохранённых страницах."""
+    from selenium import webdriver
+    from stepik_autotests_final_task.pages.js_scripts import BENCHMARK_LOOKUP
+
+    if browser_name == "firefox":
+        options = webdriver.FirefoxOptions()
+        options.add_argument("--headless")
+        browser = webdriver.Firefox(options=options)
+    else:
+        options = webdriver.ChromeOptions()
+        options.add_argument("headless")
+        browser = webdriver.Chrome(options=options)
+
+    rows = []
+    try:
+        for class_name, class_locators in collect_locators().items():
+            for page in PAGES_BY_CLASS.get(class_name, [path.stem for path in sorted(fixtures_dir.glob("*.html"))]):
+                path = fixtures_dir / f"{page}.html"
+                if not path.exists():
+                    continue
+                browser.get(path.resolve().as_uri())
+                for name, (how, what) in class_locators.items():
+                    result = browser.execute_script(BENCHMARK_LOOKUP, how, what, iterations)
+                    rows.append((result["micros"], f"{class_name}.{name}", page, result["count"]))
+    finally:
+        browser.quit()
+
+    median = statistics.median(micros for micros, *_ in rows)
+    print(f"{'µs/lookup':>10} {'found':>5}  locator @ page (median {median:.1f} µs)")
+    for micros, name, page, count in sorted(rows, reverse=True):
+        flag = "  ⚠️ EXPENSIVE" if micros > median * EXPENSIVE_FACTOR else ""
+        print(f"{micros:10.1f} {count:5d}  {name} @ {page}{flag}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Validate and optimize locators from pages/locators.py")
+    parser.add_argument("command", choices=["fixtures", "validate", "benchmark"])
+    parser.add_argument("--fixtures", type=Path, default=FIXTURES_DIR, help="directory with saved page HTML")
+    parser.add_argument("--browser", default="chrome", choices=["chrome", "firefox"])
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--base-url", default=None,
+                        help="fixtures: site to capture pages from (default: the bundled local store)")
+    parser.add_argument("--apply", action="store_true",
+                        help="validate: write verified replacements to locators.py (needs pages from a real site)")
+    args = parser.parse_args()
+
+    if args.command == "fixtures":
+        generate_fixtures(args.fixtures, args.base_url)
+    elif args.command == "validate":
+        if args.apply and fixtures_source(args.fixtures) == LOCAL_STORE_SOURCE:
+            parser.error(f"--apply needs pages captured from a real site, {args.fixtures} holds local store pages "
+                         f"(capture them with: fixtures --base-url URL --fixtures DIR)")
+        sys.exit(1 if validate(load_fixtures(args.fixtures), args.apply) else 0)
+    else:
+        benchmark(args.fixtures, args.browser, args.iterations)